@@ -0,0 +1,36 @@
+"""
+Benchmarks for packet decoding.
+"""
+
+
+from dataclasses import fields
+
+from pytest import mark
+
+from irobot.packet import LazyPacket, Packet
+from irobot.simulator import SimulatedRoomba
+
+SIMULATOR = SimulatedRoomba(clock=lambda: 0.0)
+"""The idle simulated Roomba encoding the packet data."""
+
+
+@mark.parametrize("id", sorted(Packet.registry))
+def test_from_bytes(benchmark, id: int):
+    """Benchmarks `from_bytes` for every packet type."""
+    cls = Packet.registry[id]
+    data = SIMULATOR.encode(id)
+    packet = benchmark(cls.from_bytes, data)
+    assert type(packet) == cls
+
+
+@mark.parametrize("id", sorted(LazyPacket.registry))
+def test_lazy_from_bytes(benchmark, id: int):
+    """Benchmarks `from_bytes` of the lazy group packets, followed by accessing their first member."""
+    cls = LazyPacket.registry[id]
+    data = SIMULATOR.encode(id)
+    name = fields(cls.group)[0].name
+
+    def decode():
+        return getattr(cls.from_bytes(data), name)
+
+    benchmark(decode)
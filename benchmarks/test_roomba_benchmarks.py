@@ -0,0 +1,76 @@
+"""
+Benchmarks for command encoding and response decoding.
+"""
+
+
+from irobot.roomba import QueryPlan, Roomba, encode_drive_direct, encode_song
+from irobot.simulator import SimulatedRoomba
+
+QUERY_IDS = [7, 8, 9, 10, 11, 12, 13, 14, 19, 20, 21, 22, 23, 24, 25, 26, 35, 43, 44, 45]
+"""The packets queried by a typical control loop."""
+
+
+class CannedSerial:
+    """A serial connection discarding writes and answering every read with the same canned data."""
+
+    def __init__(self, data: bytes):
+        """Initializes a new `CannedSerial` instance.
+
+        Parameters
+        ----------
+        data : bytes
+            The canned data.
+        """
+        self.baudrate = 115200
+        self.data = data
+
+    def write(self, data: bytes) -> int:
+        """Discards the data."""
+        return len(data)
+
+    def flush(self):
+        """Does nothing."""
+        pass
+
+    def read(self, size: int = 1) -> bytes:
+        """Returns the canned data."""
+        return self.data
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Copies the canned data into the buffer."""
+        buffer[: len(self.data)] = self.data
+        return len(self.data)
+
+
+def create_response(ids) -> bytes:
+    """Creates a valid response to a `QUERY_LIST` of the specified packet ids, as an idle `SimulatedRoomba` sends it."""
+    simulator = SimulatedRoomba(clock=lambda: 0.0)
+    return b"".join(simulator.encode(id) for id in ids)
+
+
+def test_query_plan_decode(benchmark):
+    """Benchmarks decoding a `QUERY_LIST` response with a precompiled plan."""
+    plan = QueryPlan(QUERY_IDS)
+    data = create_response(QUERY_IDS)
+    packets = benchmark(plan.decode, data)
+    assert len(packets) == len(QUERY_IDS)
+
+
+def test_query_list(benchmark):
+    """Benchmarks `Roomba.query_list`, excluding the serial link and pacing."""
+    roomba = Roomba(CannedSerial(create_response(QUERY_IDS)))
+    roomba._pacer.sleeper = lambda duration: None
+    packets = benchmark(roomba.query_list, QUERY_IDS)
+    assert len(packets) == len(QUERY_IDS)
+
+
+def test_encode_song(benchmark):
+    """Benchmarks encoding the longest possible song."""
+    notes = [(60 + i % 12, 16) for i in range(16)]
+    data = benchmark(encode_song, 0, notes)
+    assert len(data) == 3 + 2 * len(notes)
+
+
+def test_encode_drive_direct(benchmark):
+    """Benchmarks encoding a `DRIVE_DIRECT` command."""
+    benchmark(encode_drive_direct, 100, -100)
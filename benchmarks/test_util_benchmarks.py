@@ -0,0 +1,18 @@
+"""
+Benchmarks for utilities.
+"""
+
+
+from io import StringIO
+
+from pytest import mark
+
+from irobot.util import hex_dump
+
+
+@mark.parametrize("size", [2, 26, 80, 172])
+def test_hex_dump(benchmark, size: int):
+    """Benchmarks `hex_dump` on a typical response (2 bytes), group packets (26 and 80 bytes), and the largest stream frame
+    at 115,200 baud (172 bytes)."""
+    data = bytes(range(size))
+    benchmark(lambda: hex_dump(data, StringIO()))
@@ -23,8 +23,18 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+from .async_roomba import AsyncRoomba
+from .cache import SensorCache
+from .fleet import Fleet, FleetQueryResult, FleetRoomba
+from .metrics import Metrics, MetricsSnapshot
+from .odometry import Odometry, Pose
 from .packet import (
     ChargingState,
+    LazyPacket,
+    LazyPacket0,
+    LazyPacket6,
+    LazyPacket100,
+    LazyPacket101,
     Mode,
     Packet,
     Packet0,
@@ -91,11 +101,30 @@ from .packet import (
     Packet106,
     Packet107,
 )
-from .roomba import BaudCode, Button, Command, Motor, Roomba, WeekDay
+from .recording import Recorder, Replay
+from .roomba import BaudCode, Button, Command, Motor, Priority, QueryPlan, Roomba, WeekDay
+from .simulator import PtyBridge, SimulatedRoomba
+from .stream import StreamDecoder, StreamReader, StreamSnapshot, StreamStatistics
+from .telemetry import TelemetryBuffer
+from .transport import LoopbackTransport, SerialTransport, SocketTransport, Transport
 from .util import hex_dump
 
 __all__ = [
+    "AsyncRoomba",
+    "SensorCache",
+    "Fleet",
+    "FleetQueryResult",
+    "FleetRoomba",
+    "Metrics",
+    "MetricsSnapshot",
+    "Odometry",
+    "Pose",
     "ChargingState",
+    "LazyPacket",
+    "LazyPacket0",
+    "LazyPacket6",
+    "LazyPacket100",
+    "LazyPacket101",
     "Mode",
     "Packet",
     "Packet0",
@@ -161,11 +190,26 @@ __all__ = [
     "Packet101",
     "Packet106",
     "Packet107",
+    "Recorder",
+    "Replay",
     "BaudCode",
     "Button",
     "Command",
     "Motor",
+    "Priority",
+    "QueryPlan",
     "Roomba",
     "WeekDay",
+    "PtyBridge",
+    "SimulatedRoomba",
+    "StreamDecoder",
+    "StreamReader",
+    "StreamSnapshot",
+    "StreamStatistics",
+    "TelemetryBuffer",
+    "LoopbackTransport",
+    "SerialTransport",
+    "SocketTransport",
+    "Transport",
     "hex_dump",
 ]
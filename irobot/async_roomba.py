@@ -0,0 +1,360 @@
+"""
+iRobot asyncio Roomba.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from asyncio import Future, Lock, TimeoutError, get_running_loop, sleep, wait_for
+from datetime import datetime
+from io import StringIO
+from logging import DEBUG, Logger
+from typing import List, Optional, Tuple, Union
+
+from .packet import LazyPacket, Packet
+from .roomba import (
+    BaudCode,
+    Button,
+    Motor,
+    QueryPlan,
+    Roomba,
+    WeekDay,
+    encode_baud,
+    encode_baud_rate,
+    encode_buttons,
+    encode_clean,
+    encode_control,
+    encode_day_time,
+    encode_digit_leds_ascii,
+    encode_drive,
+    encode_drive_direct,
+    encode_drive_pwm,
+    encode_full,
+    encode_leds,
+    encode_max,
+    encode_motors,
+    encode_motors_pwm,
+    encode_pause_resume_stream,
+    encode_play,
+    encode_power,
+    encode_safe,
+    encode_seek_dock,
+    encode_sensors,
+    encode_song,
+    encode_spot,
+    encode_start,
+    encode_stream,
+    query_plan,
+)
+from .transport import Transport
+from .util import Pacer, Trace, hex_dump
+
+
+class AsyncRoomba:
+    """asyncio Roomba API for communicating with a physical Roomba vacuum cleaner through a serial connection.
+
+    Offers the same commands as `Roomba`, as coroutines. The serial port is switched to non-blocking mode and read when the
+    event loop reports it readable, and the gaps between commands are awaited rather than slept, so any number of Roombas
+    can be driven from a single thread.
+
+    Note
+    ----
+    The transport must support `fileno()` (e.g. be a POSIX serial port or a socket).
+    """
+
+    def __init__(
+        self, serial: Transport, logger: Logger = None, timeout: Optional[float] = 1.0, trace: Optional[Trace] = None
+    ):
+        """Initializes a new `AsyncRoomba` instance.
+
+        Parameters
+        ----------
+        serial : Transport
+            The connection to the Roomba (e.g. a pyserial `Serial` or a `SocketTransport`).
+            Its read timeout is set to 0 (non-blocking).
+        logger : Logger, optional
+            The logger, by default None
+        timeout : Optional[float], optional
+            The maximum time, in seconds, to wait for a response from the Roomba or `None` to wait forever, by default 1.0
+        trace : Optional[Trace], optional
+            The trace recording all data sent and received, by default None
+        """
+        self.serial = serial
+        self.serial.timeout = 0
+        self.logger = logger
+        self.trace = trace
+        self.timeout = timeout
+        self._lock = Lock()
+        self._pacer = Pacer()
+
+    async def start(self):
+        """Start the Open Interface (OI)."""
+        await self.write(encode_start())
+
+    async def set_baud_rate(self, baud_rate: int):
+        """Sets the baud rate (see `Roomba.set_baud_rate()`)."""
+        await self.write(encode_baud_rate(baud_rate))
+
+    async def set_baud(self, baud_code: BaudCode):
+        """Sets the baud rate (see `Roomba.set_baud()`)."""
+        await self.write(encode_baud(baud_code))
+
+    async def control(self):
+        """Enables control."""
+        await self.write(encode_control())
+
+    async def safe(self):
+        """Puts the OI in safe mode."""
+        await self.write(encode_safe())
+
+    async def full(self):
+        """Puts the OI in full mode (see `Roomba.full()`)."""
+        await self.write(encode_full())
+
+    async def power(self):
+        """Powers down the Roomba."""
+        await self.write(encode_power())
+
+    async def spot(self):
+        """Starts the Spot cleaning mode."""
+        await self.write(encode_spot())
+
+    async def clean(self):
+        """Starts the default cleaning mode."""
+        await self.write(encode_clean())
+
+    async def max(self):
+        """Starts the Max cleaning mode."""
+        await self.write(encode_max())
+
+    async def drive(self, velocity: int, radius: int):
+        """Instructs the Roomba to drive at the specified velocity (mm/s), turning at the specified radius (see `Roomba.drive()`)."""
+        await self.write(encode_drive(velocity, radius))
+
+    async def motors(self, main_brush: Motor, side_brush: Motor, vacuum: Motor):
+        """Instructs the Roomba to turn its motors on and off (see `Roomba.motors()`)."""
+        await self.write(encode_motors(main_brush, side_brush, vacuum))
+
+    async def leds(self, color: int, intensity: int, check_robot: bool, dock: bool, spot: bool, debris: bool):
+        """Instructs the Roomba to turn its LEDs on and off (see `Roomba.leds()`)."""
+        await self.write(encode_leds(color, intensity, check_robot, dock, spot, debris))
+
+    async def song(self, song: int, notes: List[Tuple[int, int]]):
+        """Defines a song the Roomba can play (see `Roomba.song()`)."""
+        await self.write(encode_song(song, notes))
+
+    async def play(self, song: int):
+        """Instructs the Roomba to play the specified song (see `Roomba.play()`)."""
+        await self.write(encode_play(song))
+
+    async def sensors(self, id: int, lazy: bool = False) -> Packet:
+        """Requests the sensors with the specified id to be queried (see `Roomba.sensors()`)."""
+        data = encode_sensors(id)
+        cls = LazyPacket.registry[id] if lazy and id in LazyPacket.registry else Packet.registry[id]
+        data = await self.write_and_read(data, size=cls.size)
+        return cls.from_bytes(data)
+
+    async def seek_dock(self):
+        """Instructs the Roomba to seek its dock."""
+        await self.write(encode_seek_dock())
+
+    async def motors_pwm(self, main_brush_pwm: int, side_brush_pwm: int, vacuum_pwm: int):
+        """Instructs the Roomba to turn its motors on and off, using raw PWM values (see `Roomba.motors_pwm()`)."""
+        await self.write(encode_motors_pwm(main_brush_pwm, side_brush_pwm, vacuum_pwm))
+
+    async def drive_direct(self, left_velocity: int, right_velocity: int):
+        """Instruct the Roomba to drive at the specified left and right velocities (see `Roomba.drive_direct()`)."""
+        await self.write(encode_drive_direct(left_velocity, right_velocity))
+
+    async def drive_pwm(self, left_pwm: int, right_pwm: int):
+        """Instructs the Roomba to drive using raw PWM values (see `Roomba.drive_pwm()`)."""
+        await self.write(encode_drive_pwm(left_pwm, right_pwm))
+
+    async def stream(self, ids: List[int]) -> int:
+        """Instructs the Roomba to stream sensor packets every 15 ms (see `Roomba.stream()`)."""
+        data, size = encode_stream(ids, self.serial.baudrate)
+        await self.write(data)
+        return size
+
+    async def query_list(self, ids: Union[List[int], QueryPlan]) -> List[Packet]:
+        """Instructs the Roomba to send a list of sensor packets (see `Roomba.query_list()`)."""
+        plan = ids if isinstance(ids, QueryPlan) else query_plan(tuple(ids))
+        data = await self.write_and_read(plan.request, size=plan.size)
+        return plan.decode(data)
+
+    async def pause_resume_stream(self, start: bool):
+        """Instructs the Roomba to pause or resume the stream of packets (see `Roomba.pause_resume_stream()`)."""
+        await self.write(encode_pause_resume_stream(start))
+
+    async def digit_leds_ascii(self, digits: str):
+        """Instructs the Roomba to turn on the LEDs to display ASCII characters (see `Roomba.digit_leds_ascii()`)."""
+        await self.write(encode_digit_leds_ascii(digits))
+
+    async def buttons(self, buttons: List[Button]):
+        """Instructs the Roomba to "press" one or more of its buttons."""
+        await self.write(encode_buttons(buttons))
+
+    async def button(self, button: Button):
+        """Instructs the Roomba to "press" the specified button."""
+        await self.buttons([button])
+
+    async def set_date_time(self, date_time: datetime):
+        """Sets the Roomba's day/time (see `Roomba.set_date_time()`)."""
+        iso_week_day = date_time.isoweekday()
+        if iso_week_day == 7:
+            iso_week_day = 0
+        week_day = WeekDay(iso_week_day)
+        await self.set_day_time(week_day, date_time.hour, date_time.minute)
+
+    async def set_day_time(self, week_day: WeekDay, hour: int, minute: int):
+        """Sets the Roomba's day/time (see `Roomba.set_day_time()`)."""
+        await self.write(encode_day_time(week_day, hour, minute))
+
+    async def write(self, data: bytes):
+        """Writes the specified data to the Roomba via the serial port.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        """
+        async with self._lock:
+            await self._write(data)
+
+    async def read(self, size: int = 1) -> bytes:
+        """Reads data of the specified size from the Roomba via the serial port.
+
+        Parameters
+        ----------
+        size : int
+            The size of the data to read (in number of bytes).
+
+        Returns
+        -------
+        bytes
+            The requested data. Shorter than `size` if the Roomba does not send all of it before the timeout.
+        """
+        async with self._lock:
+            return await self._read(size)
+
+    async def write_and_read(self, data: bytes, size: int = 1) -> bytes:
+        """Writes the specified data to the Roomba and reads data of the specified size from the Roomba via the serial port.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        size : int
+            The size of the data to read (in number of bytes).
+
+        Returns
+        -------
+        bytes
+            The requested data. Shorter than `size` if the Roomba does not send all of it before the timeout.
+        """
+        async with self._lock:
+            await self._write(data)
+            return await self._read(size)
+
+    async def _write(self, data: bytes):
+        """Writes the specified data, once the previous command has been processed by the Roomba.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        """
+        self._dump_data("Writing data:", data)
+        delay = self._pacer.delay()
+        if delay > 0:
+            await sleep(delay)
+        self.serial.write(data)
+        self._pacer.mark(Roomba.duration(data))
+
+    async def _read(self, size: int) -> bytes:
+        """Reads data of the specified size, waiting for the serial port to become readable whenever it runs dry.
+
+        Parameters
+        ----------
+        size : int
+            The size of the data to read (in number of bytes).
+
+        Returns
+        -------
+        bytes
+            The data.
+        """
+        loop = get_running_loop()
+        deadline = None if self.timeout is None else loop.time() + self.timeout
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.serial.read(size - len(data))
+            if len(chunk) > 0:
+                data += chunk
+                continue
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            readable = loop.create_future()
+            fd = self.serial.fileno()
+            loop.add_reader(fd, _set_readable, readable)
+            try:
+                await wait_for(readable, remaining)
+            except TimeoutError:
+                break
+            finally:
+                loop.remove_reader(fd)
+        self._dump_data("Read data:", data)
+        return bytes(data)
+
+    def _dump_data(self, message: str, data: bytes) -> None:
+        """Dumps data being sent or received to the trace and, if debugging, the logger.
+
+        Parameters
+        ----------
+        message : str
+            The message to output before the hex dump (or to record in the trace).
+        data : bytes
+            The data.
+        """
+        if self.trace is not None:
+            self.trace.record(message, data)
+        if self.logger is None or not self.logger.isEnabledFor(DEBUG):
+            return
+        io = StringIO()
+        io.write(message)
+        io.write("\n")
+        hex_dump(data, io)
+        self.logger.debug(io.getvalue().rstrip("\n"))
+
+
+def _set_readable(future: Future):
+    """Marks the specified future as done, unless it already is.
+
+    Parameters
+    ----------
+    future : Future
+        The future.
+    """
+    if not future.done():
+        future.set_result(None)
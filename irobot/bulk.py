@@ -0,0 +1,157 @@
+"""
+iRobot bulk decoding (requires NumPy).
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from dataclasses import fields
+from typing import Dict, Type, Union
+
+import numpy
+
+from .packet import Packet
+from .telemetry import columns
+
+_dtypes: Dict[str, str] = {
+    "B": "u1",
+    "b": "i1",
+    "H": ">u2",
+    "h": ">i2",
+}
+"""The big-endian NumPy types for the packet `struct` formats."""
+
+
+def raw_dtype(id: int) -> numpy.dtype:
+    """Returns the NumPy type matching the raw layout of the specified packet.
+
+    The type has one field, named `packet_<id>`, per non-group packet, holding its raw value.
+
+    Parameters
+    ----------
+    id : int
+        The packet id.
+
+    Returns
+    -------
+    numpy.dtype
+        The NumPy type. Its `itemsize` is the packet size.
+
+    Raises
+    ------
+    ValueError
+        If `id` is unknown.
+    """
+    if id not in Packet.registry:
+        raise ValueError(f"Packet id {id} is unknown")
+    cls = Packet.registry[id]
+    packets = cls.members if len(cls.members) > 0 else (cls,)
+    return numpy.dtype([(f"packet_{packet.id}", _dtypes[packet.format]) for packet in packets])
+
+
+def decode_array(id: int, data: Union[bytes, bytearray, memoryview]) -> numpy.ndarray:
+    """Decodes any number of concatenated packets of the same type into a NumPy structured array in one go.
+
+    The array has one field per sensor field, named as the columns of a `TelemetryBuffer`. Flags are decoded to booleans
+    and all other values keep their big-endian raw type.
+
+    Parameters
+    ----------
+    id : int
+        The packet id.
+    data : Union[bytes, bytearray, memoryview]
+        The raw data of the packets, e.g. thousands of `Packet100` payloads from a recorded capture.
+
+    Returns
+    -------
+    numpy.ndarray
+        The structured array, with one element per packet.
+
+    Raises
+    ------
+    ValueError
+        If `id` is unknown or the length of `data` is not a multiple of the packet size.
+    """
+    dtype = raw_dtype(id)
+    if len(data) % dtype.itemsize != 0:
+        raise ValueError(f"Data length {len(data)} is not a multiple of the packet {id} size {dtype.itemsize}")
+    raw = numpy.frombuffer(data, dtype=dtype)
+    result_columns = columns([id])
+    flags = {
+        column.name: _mask(column.packet, column.field)
+        for column in result_columns
+        if _is_flag(column.packet, column.field)
+    }
+    result = numpy.empty(
+        len(raw),
+        dtype=[(column.name, "?" if column.name in flags else _dtypes[column.packet.format]) for column in result_columns],
+    )
+    for column in result_columns:
+        values = raw[f"packet_{column.packet.id}"]
+        if column.name in flags:
+            result[column.name] = values & flags[column.name] != 0
+        else:
+            result[column.name] = values
+    return result
+
+
+def _is_flag(cls: Type[Packet], name: str) -> bool:
+    """Returns `True` if the specified field of the specified packet is a flag.
+
+    Parameters
+    ----------
+    cls : Type[Packet]
+        The non-group packet type.
+    name : str
+        The field name.
+
+    Returns
+    -------
+    bool
+        `True` if the field is a flag; `False` otherwise.
+    """
+    return next(field for field in fields(cls) if field.name == name).type is bool
+
+
+def _mask(cls: Type[Packet], name: str) -> int:
+    """Returns the bit mask of the specified flag of the specified packet.
+
+    The mask is found by decoding each single bit value, so it cannot get out of step with the packet's own decoding.
+
+    Parameters
+    ----------
+    cls : Type[Packet]
+        The non-group packet type.
+    name : str
+        The flag field name.
+
+    Returns
+    -------
+    int
+        The bit mask.
+    """
+    mask = 0
+    for bit in range(8 * cls.size):
+        if getattr(cls.from_value(1 << bit), name):
+            mask |= 1 << bit
+    return mask
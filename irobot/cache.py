@@ -0,0 +1,210 @@
+"""
+iRobot Roomba sensor cache.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .packet import Packet
+from .roomba import Roomba, query_plan
+
+
+class SensorCache:
+    """A cache in front of `Roomba.sensors()` and `Roomba.query_list()`, serving packets that are still fresh.
+
+    Each packet id has a time to live (TTL): a cached packet younger than the TTL of its id is returned without querying
+    the Roomba. Only the stale ids of a query are fetched, in a single `QUERY_LIST`. A group packet that is fetched also
+    refreshes its member packets, so e.g. fetching packet 3 refreshes the battery packets 21-26.
+
+    For example, to read the battery packets at most every 5 s, but the bumps (and everything else) on every read::
+
+        cache = SensorCache(roomba, ttls={id: 5.0 for id in range(21, 27)})
+        bumps, charge = cache.query_list([7, 25])
+    """
+
+    def __init__(
+        self,
+        roomba: Roomba,
+        ttl: float = 0.0,
+        ttls: Optional[Dict[int, float]] = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """Initializes a new `SensorCache` instance.
+
+        Parameters
+        ----------
+        roomba : Roomba
+            The Roomba.
+        ttl : float, optional
+            The TTL, in seconds, of the packet ids without one of their own, by default 0.0 (always fetched)
+        ttls : Optional[Dict[int, float]], optional
+            The TTL, in seconds, of each packet id, by default None
+        clock : Callable[[], float], optional
+            The clock timestamping the packets, by default `time.monotonic`
+
+        Raises
+        ------
+        ValueError
+            If `ttls` contains an unknown packet id.
+        """
+        self.roomba = roomba
+        self.ttl = ttl
+        self.ttls: Dict[int, float] = {}
+        self.clock = clock
+        self._entries: Dict[int, Tuple[float, Packet]] = {}
+        self._lock = Lock()
+        for id, id_ttl in (ttls or {}).items():
+            self.set_ttl(id, id_ttl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._entries
+
+    def set_ttl(self, id: int, ttl: Optional[float]):
+        """Sets the TTL of a packet id.
+
+        Parameters
+        ----------
+        id : int
+            The packet id.
+        ttl : Optional[float]
+            The TTL, in seconds, or `None` to use the default TTL.
+
+        Raises
+        ------
+        ValueError
+            If `id` is unknown.
+        """
+        if id not in Packet.registry:
+            raise ValueError(f"Packet id {id} is unknown")
+        if ttl is None:
+            self.ttls.pop(id, None)
+        else:
+            self.ttls[id] = ttl
+
+    def timestamp(self, id: int) -> Optional[float]:
+        """Returns the time the cached packet with the specified id was fetched.
+
+        Parameters
+        ----------
+        id : int
+            The packet id.
+
+        Returns
+        -------
+        Optional[float]
+            The time, according to the clock of the cache, or `None` if the packet is not cached.
+        """
+        entry = self._entries.get(id)
+        return None if entry is None else entry[0]
+
+    def sensors(self, id: int) -> Packet:
+        """Returns the packet with the specified id, querying the Roomba only if the cached packet is stale.
+
+        Parameters
+        ----------
+        id : int
+            The packet id.
+
+        Returns
+        -------
+        Packet
+            The packet.
+
+        Raises
+        ------
+        ValueError
+            If `id` is unknown.
+        """
+        return self.query_list([id])[0]
+
+    def query_list(self, ids: Iterable[int]) -> List[Packet]:
+        """Returns the packets with the specified ids, querying the Roomba for the stale ones with a single command.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            The packet ids.
+
+        Returns
+        -------
+        List[Packet]
+            The packets, in the order of the ids.
+
+        Raises
+        ------
+        ValueError
+            If `ids` is invalid.
+        """
+        ids = list(ids)
+        now = self.clock()
+        packets: Dict[int, Packet] = {}
+        stale: List[int] = []
+        with self._lock:
+            for id in ids:
+                entry = self._entries.get(id)
+                if entry is not None and now - entry[0] < self.ttls.get(id, self.ttl):
+                    packets[id] = entry[1]
+                elif id not in stale:
+                    stale.append(id)
+        fetched = self.roomba.query_list(query_plan(tuple(stale))) if len(stale) > 0 else []
+        with self._lock:
+            for packet in fetched:
+                self._store(packet, now)
+                packets[packet.id] = packet
+        return [packets[id] for id in ids]
+
+    def invalidate(self, ids: Optional[Iterable[int]] = None):
+        """Discards cached packets, so they are fetched on the next read.
+
+        Parameters
+        ----------
+        ids : Optional[Iterable[int]], optional
+            The packet ids, by default None (all packets)
+        """
+        with self._lock:
+            if ids is None:
+                self._entries.clear()
+            else:
+                for id in ids:
+                    self._entries.pop(id, None)
+
+    def _store(self, packet: Packet, timestamp: float):
+        """Caches a packet and, if it is a group packet, its member packets. The caller must hold the lock.
+
+        Parameters
+        ----------
+        packet : Packet
+            The packet.
+        timestamp : float
+            The time the packet was requested.
+        """
+        self._entries[packet.id] = (timestamp, packet)
+        for member in packet.members:
+            self._store(getattr(packet, f"packet_{member.id}"), timestamp)
@@ -0,0 +1,654 @@
+"""
+iRobot Roomba fleet.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+import os
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from selectors import EVENT_READ, DefaultSelector
+from threading import Lock, Thread
+from time import monotonic
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from .packet import Packet
+from .roomba import Priority, QueryPlan, Roomba, query_plan
+from .transport import Transport
+
+QUIET_DURATION = 50 / 1000
+"""The time the serial port of a Roomba must be quiet, after a response timed out, before it is used again."""
+RECEIVE_LIMIT = 4096
+"""The maximum number of received bytes kept for the operation in progress of a Roomba."""
+
+
+class _Operation:
+    """A pending write, read, or write followed by a read, for a robot in a `Fleet`."""
+
+    __slots__ = ("data", "size", "priority", "timeout", "future", "claimed", "sent", "deadline")
+
+    def __init__(self, data: Optional[bytes], size: int, priority: Priority, timeout: float):
+        """Initializes a new `_Operation` instance.
+
+        Parameters
+        ----------
+        data : Optional[bytes]
+            The data to write or `None` to only read.
+        size : int
+            The number of bytes to read (0 to only write).
+        priority : Priority
+            The priority.
+        timeout : float
+            The maximum time, in seconds, to wait for the data to be read once the data has been written.
+        """
+        self.data = data
+        self.size = size
+        self.priority = priority
+        self.timeout = timeout
+        self.future: Future = Future()
+        self.claimed = data is None
+        """Whether the I/O thread has started sending the data, so no operation may be queued ahead of it."""
+        self.sent = data is None
+        self.deadline: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class FleetQueryResult:
+    """The result of `Fleet.query_list()`."""
+
+    ids: Tuple[int, ...]
+    """The queried packet ids."""
+    packets: Dict[str, Dict[int, Packet]] = field(default_factory=dict)
+    """The packets of each Roomba that responded, by Roomba name and packet id."""
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    """The error of each Roomba that did not respond (in time), by Roomba name."""
+
+    def __getitem__(self, key: Tuple[str, int]) -> Packet:
+        """Returns the packet with the specified id from the Roomba with the specified name, e.g. `result["a", 35]`.
+
+        Parameters
+        ----------
+        key : Tuple[str, int]
+            The Roomba name and the packet id.
+
+        Returns
+        -------
+        Packet
+            The packet.
+
+        Raises
+        ------
+        KeyError
+            If the Roomba did not respond, or the packet was not queried.
+        """
+        name, id = key
+        return self.packets[name][id]
+
+
+class FleetRoomba(Roomba):
+    """A handle to a Roomba in a `Fleet`, offering the same methods as `Roomba`.
+
+    Writes and reads are queued to the I/O thread of the fleet, which paces the commands and gathers the responses of
+    all Roombas in the fleet concurrently. The `Roomba` methods block the calling thread until the I/O thread has sent
+    the command (and received the response). Use `FleetRoomba.submit()` to queue a command without blocking.
+    """
+
+    def __init__(self, fleet: "Fleet", name: str, serial: Transport, logger=None, timeout: float = 1.0):
+        """Initializes a new `FleetRoomba` instance. Use `Fleet.add()` rather than creating instances directly.
+
+        Parameters
+        ----------
+        fleet : Fleet
+            The fleet.
+        name : str
+            The name of the Roomba within the fleet.
+        serial : Transport
+            The connection to the Roomba (e.g. a pyserial `Serial` or a `SocketTransport`).
+            Its read timeout is set to 0 (non-blocking).
+        logger : Logger, optional
+            The logger, by default None
+        timeout : float, optional
+            The maximum time, in seconds, to wait for a response from the Roomba, by default 1.0
+        """
+        super().__init__(serial, logger)
+        self.serial.timeout = 0
+        self.fleet = fleet
+        self.name = name
+        self.timeout = timeout
+        self._operations: Deque[_Operation] = deque()
+        self._received = bytearray()
+        self._quiet_until: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"FleetRoomba({self.name!r})"
+
+    def submit(self, data: Optional[bytes], size: int = 0, timeout: Optional[float] = None) -> Future:
+        """Queues a write, read, or write followed by a read, without waiting for it.
+
+        Commands are sent in order of priority (see `Roomba.priority()`) and, within a priority, in the order they were
+        submitted.
+
+        Parameters
+        ----------
+        data : Optional[bytes]
+            The raw bytes of data to send to the Roomba or `None` to only read.
+        size : int, optional
+            The size of the data to read (in number of bytes), by default 0 (only write)
+        timeout : Optional[float], optional
+            The maximum time, in seconds, to wait for the response once the command has been sent, by default None (the
+            timeout of the Roomba)
+
+        Returns
+        -------
+        Future
+            The future receiving the data read (empty if only writing). It fails with `TimeoutError` if the Roomba does
+            not respond in time.
+        """
+        priority = Priority.NORMAL if data is None else Roomba.priority(data)
+        operation = _Operation(data, size, priority, self.timeout if timeout is None else timeout)
+        self.fleet._enqueue(self, operation)
+        return operation.future
+
+    def write(self, data: bytes):
+        """Writes the specified data to the Roomba via the I/O thread of the fleet, waiting for it to be sent.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        """
+        self.submit(data).result()
+
+    def read(self, size: int = 1) -> bytes:
+        """Reads data of the specified size from the Roomba via the I/O thread of the fleet.
+
+        Parameters
+        ----------
+        size : int
+            The size of the data to read (in number of bytes).
+
+        Returns
+        -------
+        bytes
+            The requested data.
+        """
+        return self.submit(None, size).result()
+
+    def write_and_read(self, data: bytes, size: int = 1) -> bytes:
+        """Writes the specified data to the Roomba and reads data of the specified size from the Roomba via the I/O
+        thread of the fleet.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        size : int
+            The size of the data to read (in number of bytes).
+
+        Returns
+        -------
+        bytes
+            The requested data.
+        """
+        return self.submit(data, size).result()
+
+    def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Reads data from the Roomba via the I/O thread of the fleet into a buffer.
+
+        Parameters
+        ----------
+        buffer : Union[bytearray, memoryview]
+            The buffer.
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        data = self.read(len(buffer))
+        memoryview(buffer)[: len(data)] = data
+        return len(data)
+
+    def write_and_readinto(self, data: bytes, buffer: Union[bytearray, memoryview]) -> int:
+        """Writes the specified data to the Roomba and reads data from the Roomba via the I/O thread of the fleet into a
+        buffer.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        buffer : Union[bytearray, memoryview]
+            The buffer, as large as the expected response.
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        data = self.write_and_read(data, len(buffer))
+        memoryview(buffer)[: len(data)] = data
+        return len(data)
+
+    def write_motion(self, data: bytes):
+        """Writes the specified motion command to the Roomba (motion commands are not coalesced in a fleet).
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of the motion command.
+        """
+        self.write(data)
+
+
+class Fleet:
+    """Drives many Roombas from a single I/O thread.
+
+    The I/O thread waits for all serial ports at once with a selector, so the cost of polling grows with the amount of
+    I/O rather than with the number of Roombas. It paces the commands of each Roomba individually with timestamps, so a
+    Roomba that needs time to process a command never holds up the others.
+    """
+
+    def __init__(self):
+        """Initializes a new `Fleet` instance."""
+        self._robots: Dict[str, FleetRoomba] = {}
+        self._lock = Lock()
+        self._selector = DefaultSelector()
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_read, False)
+        os.set_blocking(self._wakeup_write, False)
+        self._selector.register(self._wakeup_read, EVENT_READ)
+        self._registrations: List[Tuple[int, FleetRoomba]] = []  # Registered with the selector by the I/O thread
+        self._stopped = False
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self) -> "Fleet":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __getitem__(self, name: str) -> FleetRoomba:
+        return self._robots[name]
+
+    def __len__(self) -> int:
+        return len(self._robots)
+
+    @property
+    def robots(self) -> List[FleetRoomba]:
+        """The Roombas in the fleet, in the order they were added."""
+        return list(self._robots.values())
+
+    @property
+    def running(self) -> bool:
+        """`True` if the I/O thread is running; `False` otherwise."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, name: str, serial: Transport, logger=None, timeout: float = 1.0) -> FleetRoomba:
+        """Adds a Roomba to the fleet.
+
+        Parameters
+        ----------
+        name : str
+            The name of the Roomba within the fleet.
+        serial : Transport
+            The connection to the Roomba (e.g. a pyserial `Serial` or a `SocketTransport`).
+            It must have a `fileno()` that can be registered with a selector.
+        logger : Logger, optional
+            The logger, by default None
+        timeout : float, optional
+            The maximum time, in seconds, to wait for a response from the Roomba, by default 1.0
+
+        Returns
+        -------
+        FleetRoomba
+            The handle to the Roomba.
+
+        Raises
+        ------
+        ValueError
+            If the fleet already has a Roomba with the specified name.
+        """
+        with self._lock:
+            if name in self._robots:
+                raise ValueError(f"Fleet already has a Roomba named {name!r}")
+            fd = serial.fileno()
+            robot = FleetRoomba(self, name, serial, logger, timeout)
+            self._robots[name] = robot
+            self._registrations.append((fd, robot))
+        self._wake()
+        return robot
+
+    def broadcast(self, data: bytes, size: int = 0, timeout: Optional[float] = None) -> Dict[str, Future]:
+        """Queues the same write, or write followed by a read, for all Roombas in the fleet.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to each Roomba.
+        size : int, optional
+            The size of the data to read from each Roomba (in number of bytes), by default 0 (only write)
+        timeout : Optional[float], optional
+            The maximum time, in seconds, to wait for each response once the command has been sent, by default None (the
+            timeout of each Roomba)
+
+        Returns
+        -------
+        Dict[str, Future]
+            The future of each Roomba, by name.
+        """
+        return {name: robot.submit(data, size, timeout) for name, robot in list(self._robots.items())}
+
+    def query_list(self, ids: Union[List[int], QueryPlan], timeout: Optional[float] = None) -> FleetQueryResult:
+        """Sends the same `QUERY_LIST` request to all Roombas in the fleet at once and gathers their responses.
+
+        The requests are sent back to back by the I/O thread, so the Roombas process them, and respond, concurrently
+        rather than one after the other.
+
+        Parameters
+        ----------
+        ids : Union[List[int], QueryPlan]
+            The list of ids, or a `QueryPlan` for them.
+        timeout : Optional[float], optional
+            The maximum time, in seconds, to wait for each response once the request has been sent, by default None (the
+            timeout of each Roomba)
+
+        Returns
+        -------
+        FleetQueryResult
+            The packets of each Roomba that responded, and the error of each Roomba that did not.
+
+        Raises
+        ------
+        ValueError
+            If `ids` is invalid.
+        """
+        plan = ids if isinstance(ids, QueryPlan) else query_plan(tuple(ids))
+        futures = self.broadcast(plan.request, plan.size, timeout)
+        packets: Dict[str, Dict[int, Packet]] = {}
+        errors: Dict[str, BaseException] = {}
+        for name, future in futures.items():
+            try:
+                packets[name] = dict(zip(plan.ids, plan.decode(future.result())))
+            except Exception as e:
+                errors[name] = e
+        return FleetQueryResult(plan.ids, packets, errors)
+
+    def start(self):
+        """Starts the I/O thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the I/O thread is already running.
+        """
+        if self._thread is not None:
+            raise RuntimeError("Fleet is already running")
+        self._stopped = False
+        self._thread = Thread(target=self._run, name="Fleet", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the I/O thread, cancelling all queued operations and failing those in progress."""
+        if self._thread is None:
+            return
+        self._stopped = True
+        self._wake()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            robots = list(self._robots.values())
+        for robot in robots:
+            self._fail(robot, RuntimeError("Fleet stopped"))
+
+    def _enqueue(self, robot: FleetRoomba, operation: _Operation):
+        """Queues an operation for the specified Roomba and wakes up the I/O thread.
+
+        Parameters
+        ----------
+        robot : FleetRoomba
+            The Roomba.
+        operation : _Operation
+            The operation.
+
+        Raises
+        ------
+        RuntimeError
+            If the I/O thread is not running.
+        """
+        with self._lock:
+            if not self.running or self._stopped:
+                raise RuntimeError("Fleet is not running")
+            operations = robot._operations
+            index = len(operations)
+            while (
+                index > 0 and not operations[index - 1].claimed and operations[index - 1].priority < operation.priority
+            ):
+                index -= 1  # Jump ahead of the waiting commands of lower priority
+            operations.insert(index, operation)
+        self._wake()
+
+    def _wake(self):
+        """Wakes up the I/O thread."""
+        try:
+            os.write(self._wakeup_write, b"\0")
+        except BlockingIOError:
+            pass  # Already awake
+
+    def _run(self):
+        """Services the queued operations and reads the serial ports until stopped."""
+        while not self._stopped:
+            self._register()
+            timeout = self._service()
+            for key, _ in self._selector.select(timeout):
+                robot: Optional[FleetRoomba] = key.data
+                if robot is None:
+                    while True:
+                        try:
+                            if len(os.read(self._wakeup_read, 256)) == 0:
+                                break
+                        except BlockingIOError:
+                            break
+                else:
+                    try:
+                        self._receive(robot, robot.serial.read(max(robot.serial.in_waiting, 1)))
+                    except Exception as e:
+                        self._selector.unregister(key.fileobj)
+                        self._fail(robot, e)
+
+    def _receive(self, robot: FleetRoomba, data: bytes):
+        """Keeps the data received from a Roomba for its operation in progress, discarding it if there is none.
+
+        Parameters
+        ----------
+        robot : FleetRoomba
+            The Roomba.
+        data : bytes
+            The data.
+        """
+        if robot._quiet_until is not None:
+            robot._quiet_until = monotonic() + QUIET_DURATION  # Discard a late response
+            return
+        with self._lock:
+            operation = robot._operations[0] if len(robot._operations) > 0 else None
+        if operation is None or not operation.sent or operation.size == 0:
+            discarded = len(data)  # Unsolicited, e.g. streamed frames
+        else:
+            robot._received += data
+            discarded = max(len(robot._received) - RECEIVE_LIMIT, 0)
+            del robot._received[RECEIVE_LIMIT:]
+        if discarded > 0 and robot.logger is not None:
+            robot.logger.debug("Discarded %d unsolicited bytes from Roomba %r", discarded, robot.name)
+
+    def _register(self):
+        """Registers the serial ports of the Roombas added since the last call with the selector.
+
+        Selectors are not thread-safe, so only the I/O thread uses the selector. `Fleet.add()` queues the registration
+        and wakes up the I/O thread instead.
+        """
+        with self._lock:
+            registrations = self._registrations
+            self._registrations = []
+        for fd, robot in registrations:
+            self._selector.register(fd, EVENT_READ, robot)
+
+    def _service(self) -> Optional[float]:
+        """Sends the commands that are due and completes the operations whose responses have arrived or timed out.
+
+        Returns
+        -------
+        Optional[float]
+            The time, in seconds, until the next command is due or operation times out, or `None` if there is none.
+        """
+        timeout = None
+        with self._lock:
+            robots = list(self._robots.values())
+        for robot in robots:
+            wait = self._service_robot(robot)
+            if wait is not None and (timeout is None or wait < timeout):
+                timeout = wait
+        return timeout
+
+    def _service_robot(self, robot: FleetRoomba) -> Optional[float]:
+        """Services the queued operations of a Roomba, in order.
+
+        Parameters
+        ----------
+        robot : FleetRoomba
+            The Roomba.
+
+        Returns
+        -------
+        Optional[float]
+            The time, in seconds, until the Roomba's next command is due or its operation in progress times out, or
+            `None` if there is none.
+        """
+        while True:
+            with self._lock:
+                if len(robot._operations) == 0:
+                    return None
+                operation = robot._operations[0]
+            if robot._quiet_until is not None:
+                quiet = robot._quiet_until - monotonic()
+                if quiet > 0:
+                    return quiet
+                robot._quiet_until = None
+            if operation.future.cancelled():
+                self._complete(robot, operation)
+                continue
+            if not operation.sent:
+                delay = robot._pacer.delay()
+                if delay > 0:
+                    return delay
+                with self._lock:
+                    if robot._operations[0] is not operation:
+                        continue  # A command of higher priority jumped ahead
+                    operation.claimed = True
+            if not operation.future.running() and not operation.future.set_running_or_notify_cancel():
+                self._complete(robot, operation)
+                continue
+            if not operation.sent:
+                robot._dump_data("Writing data:", operation.data)
+                if operation.size > 0:
+                    robot._received.clear()  # Whatever arrived before the request is not its response
+                try:
+                    robot.serial.write(operation.data)
+                    robot.serial.flush()
+                except Exception as e:
+                    self._complete(robot, operation, exception=e)
+                    continue
+                robot._pacer.mark(Roomba.duration(operation.data))
+                operation.sent = True
+            if operation.deadline is None:
+                operation.deadline = monotonic() + operation.timeout
+            if len(robot._received) >= operation.size:
+                data = bytes(robot._received[: operation.size])
+                del robot._received[: operation.size]
+                if operation.size > 0:
+                    robot._dump_data("Read data:", data)
+                self._complete(robot, operation, result=data)
+                continue
+            remaining = operation.deadline - monotonic()
+            if remaining <= 0:
+                self._resynchronize(robot)
+                exception = TimeoutError(f"Roomba {robot.name!r} did not respond in time")
+                self._complete(robot, operation, exception=exception)
+                continue
+            return remaining
+
+    def _resynchronize(self, robot: FleetRoomba):
+        """Discards the input of a Roomba whose response timed out, including the rest of the response arriving late,
+        by waiting for its serial port to be quiet before the next operation.
+
+        Parameters
+        ----------
+        robot : FleetRoomba
+            The Roomba.
+        """
+        reset_input_buffer = getattr(robot.serial, "reset_input_buffer", None)
+        if reset_input_buffer is not None:
+            reset_input_buffer()
+        robot._received.clear()
+        robot._quiet_until = monotonic() + QUIET_DURATION
+
+    def _complete(self, robot: FleetRoomba, operation: _Operation, result: bytes = None, exception: Exception = None):
+        """Removes an operation from the queue of a Roomba and completes its future, unless cancelled.
+
+        Parameters
+        ----------
+        robot : FleetRoomba
+            The Roomba.
+        operation : _Operation
+            The operation.
+        result : bytes, optional
+            The data read, by default None
+        exception : Exception, optional
+            The exception failing the operation, by default None
+        """
+        with self._lock:
+            robot._operations.remove(operation)
+        if operation.future.cancelled():
+            return
+        if exception is not None:
+            operation.future.set_exception(exception)
+        else:
+            operation.future.set_result(result)
+
+    def _fail(self, robot: FleetRoomba, exception: Exception):
+        """Cancels the queued operations of a Roomba and fails its operation in progress, if any.
+
+        Parameters
+        ----------
+        robot : FleetRoomba
+            The Roomba.
+        exception : Exception
+            The exception failing the operation in progress.
+        """
+        with self._lock:
+            operations = list(robot._operations)
+            robot._operations.clear()
+        for operation in operations:
+            if not operation.future.cancel() and not operation.future.done():
+                operation.future.set_exception(exception)
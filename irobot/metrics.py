@@ -0,0 +1,164 @@
+"""
+iRobot Roomba metrics.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+LATENCY_BUCKETS = 24
+"""The number of read latency histogram buckets. The last bucket holds all latencies of 2^22 µs (about 4 s) or more."""
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """A point-in-time copy of the `Metrics` of a `Roomba`."""
+
+    commands: Dict[int, int] = field(default_factory=dict)
+    """The number of commands sent, by opcode (e.g. `commands[Command.DRIVE]`). Opcodes that were never sent are omitted."""
+    bytes_sent: int = 0
+    """The number of bytes sent."""
+    bytes_received: int = 0
+    """The number of bytes received."""
+    lock_waits: int = 0
+    """The number of times the serial port lock was acquired."""
+    lock_wait_time: float = 0.0
+    """The total time, in seconds, spent waiting for the serial port lock."""
+    lock_wait_max: float = 0.0
+    """The longest time, in seconds, spent waiting for the serial port lock."""
+    pacing_time: float = 0.0
+    """The total time, in seconds, spent waiting for the Roomba to be ready for the next command."""
+    reads: int = 0
+    """The number of serial port reads."""
+    read_latency: Tuple[int, ...] = (0,) * LATENCY_BUCKETS
+    """The read latency histogram. Bucket 0 counts reads taking less than 1 µs and bucket `n` those taking from
+    2^(n - 1) µs up to 2^n µs."""
+
+    def read_latency_percentile(self, percentile: float) -> float:
+        """Returns an upper bound of the specified read latency percentile.
+
+        Parameters
+        ----------
+        percentile : float
+            The percentile (0 to 100).
+
+        Returns
+        -------
+        float
+            The upper bound, in seconds, of the histogram bucket holding the percentile (0 if there were no reads).
+        """
+        remaining = self.reads * percentile / 100
+        for bucket, count in enumerate(self.read_latency):
+            remaining -= count
+            if count > 0 and remaining <= 0:
+                return (1 << bucket) / 1e6
+        return 0.0
+
+
+class Metrics:
+    """Counts the commands, bytes, lock waits, pacing waits and read latencies of a `Roomba`.
+
+    `Roomba` only updates its metrics while holding its serial port lock, so the updates are plain additions. Reading the
+    metrics (see `Metrics.snapshot()`) does not take the lock, so a snapshot taken while commands are being sent may be off
+    by the command in progress.
+    """
+
+    def __init__(self):
+        """Initializes a new `Metrics` instance."""
+        self.reset()
+
+    def reset(self):
+        """Resets all metrics to 0."""
+        self._commands: List[int] = [0] * 256
+        self._bytes_sent = 0
+        self._bytes_received = 0
+        self._lock_waits = 0
+        self._lock_wait_time = 0.0
+        self._lock_wait_max = 0.0
+        self._pacing_time = 0.0
+        self._reads = 0
+        self._read_latency: List[int] = [0] * LATENCY_BUCKETS
+
+    def locked(self, wait: float):
+        """Records acquiring the serial port lock.
+
+        Parameters
+        ----------
+        wait : float
+            The time, in seconds, spent waiting for the lock.
+        """
+        self._lock_waits += 1
+        self._lock_wait_time += wait
+        if wait > self._lock_wait_max:
+            self._lock_wait_max = wait
+
+    def sent(self, data: bytes, pacing: float):
+        """Records sending a command.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of the command, starting with the opcode.
+        pacing : float
+            The time, in seconds, spent waiting for the Roomba to be ready for the command.
+        """
+        self._commands[data[0]] += 1
+        self._bytes_sent += len(data)
+        self._pacing_time += pacing
+
+    def received(self, size: int, latency: float):
+        """Records a serial port read.
+
+        Parameters
+        ----------
+        size : int
+            The number of bytes read.
+        latency : float
+            The time, in seconds, the read took.
+        """
+        self._bytes_received += size
+        self._reads += 1
+        self._read_latency[min(int(latency * 1e6).bit_length(), LATENCY_BUCKETS - 1)] += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Returns a copy of the current metrics.
+
+        Returns
+        -------
+        MetricsSnapshot
+            The snapshot.
+        """
+        return MetricsSnapshot(
+            commands={opcode: count for opcode, count in enumerate(self._commands) if count > 0},
+            bytes_sent=self._bytes_sent,
+            bytes_received=self._bytes_received,
+            lock_waits=self._lock_waits,
+            lock_wait_time=self._lock_wait_time,
+            lock_wait_max=self._lock_wait_max,
+            pacing_time=self._pacing_time,
+            reads=self._reads,
+            read_latency=tuple(self._read_latency),
+        )
+
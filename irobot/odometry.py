@@ -0,0 +1,242 @@
+"""
+iRobot Roomba odometry.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from dataclasses import dataclass
+from math import cos, pi, radians, sin
+from typing import Iterable, Iterator, Optional
+
+from .packet import Packet, Packet19, Packet20, Packet43, Packet44
+
+WHEEL_BASE = 235.0
+"""The distance between the wheels (mm)."""
+WHEEL_DIAMETER = 72.0
+"""The wheel diameter (mm)."""
+COUNTS_PER_REVOLUTION = 508.8
+"""The number of encoder counts per wheel revolution."""
+COUNTS_PER_MM = COUNTS_PER_REVOLUTION / (WHEEL_DIAMETER * pi)
+"""The number of encoder counts per mm travelled by a wheel."""
+
+
+@dataclass(frozen=True)
+class Pose:
+    """A Roomba pose, relative to where odometry started."""
+
+    x: float = 0.0
+    """The x coordinate (mm). The Roomba starts out facing the positive x axis."""
+    y: float = 0.0
+    """The y coordinate (mm)."""
+    heading: float = 0.0
+    """The heading (radians), counterclockwise from the positive x axis."""
+
+
+_odometry_types = frozenset([Packet19, Packet20, Packet43, Packet44])
+"""The packets used by odometry."""
+
+
+def count_delta(old: int, new: int) -> int:
+    """Returns the change between two readings of a 16-bit unsigned encoder count, taking wraparound into account.
+
+    The change is assumed to be the shortest one, i.e. between -32,768 and 32,767 counts (about 14.5 m of travel).
+
+    Parameters
+    ----------
+    old : int
+        The previous count.
+    new : int
+        The current count.
+
+    Returns
+    -------
+    int
+        The change.
+    """
+    return ((new - old + 32768) % 65536) - 32768
+
+
+class Odometry:
+    """Tracks the pose of a Roomba incrementally from its encoder counts (packets 43 and 44).
+
+    Feed it every frame received from a stream (see `StreamDecoder` and `StreamReader`), or the packets returned from
+    repeated queries. The first encoder counts only establish a reference, and each subsequent pair moves the pose by the
+    change in counts since the previous pair.
+
+    Optionally, the distance and angle reported by the Roomba (packets 19 and 20) can be fused with the distance and angle
+    derived from the encoder counts. As the Roomba resets those whenever it reports them, each frame must be fed exactly
+    once.
+    """
+
+    def __init__(
+        self,
+        wheel_base: float = WHEEL_BASE,
+        counts_per_mm: float = COUNTS_PER_MM,
+        fusion_weight: float = 0.0,
+        pose: Pose = Pose(),
+    ):
+        """Initializes a new `Odometry` instance.
+
+        Parameters
+        ----------
+        wheel_base : float, optional
+            The distance between the wheels (mm), by default `WHEEL_BASE`
+        counts_per_mm : float, optional
+            The number of encoder counts per mm travelled by a wheel, by default `COUNTS_PER_MM`
+        fusion_weight : float, optional
+            The weight (0 to 1) of the distance and angle reported by the Roomba (packets 19 and 20) relative to those
+            derived from the encoder counts, by default 0.0 (encoder counts only)
+        pose : Pose, optional
+            The initial pose, by default the origin
+
+        Raises
+        ------
+        ValueError
+            If `fusion_weight` is not between 0 and 1.
+        """
+        if fusion_weight < 0.0 or fusion_weight > 1.0:
+            raise ValueError(f"Fusion weight {fusion_weight} is not between 0 and 1")
+        self.wheel_base = wheel_base
+        self.counts_per_mm = counts_per_mm
+        self.fusion_weight = fusion_weight
+        self.reset(pose)
+
+    @property
+    def pose(self) -> Pose:
+        """The current pose."""
+        return Pose(self._x, self._y, self._heading)
+
+    @property
+    def distance(self) -> float:
+        """The total distance travelled (mm), backwards travel counting as negative."""
+        return self._distance
+
+    def reset(self, pose: Pose = Pose()):
+        """Resets the pose and forgets the previous encoder counts.
+
+        Parameters
+        ----------
+        pose : Pose, optional
+            The pose, by default the origin
+        """
+        self._x = pose.x
+        self._y = pose.y
+        self._heading = pose.heading
+        self._distance = 0.0
+        self._left: Optional[int] = None
+        self._right: Optional[int] = None
+
+    def update(self, packets: Iterable[Packet]) -> Pose:
+        """Updates the pose from the packets of a frame. Group packets are searched for their member packets.
+
+        Parameters
+        ----------
+        packets : Iterable[Packet]
+            The packets, e.g. a frame from `StreamDecoder.feed()` or `StreamSnapshot.packets.values()`.
+
+        Returns
+        -------
+        Pose
+            The updated pose. Unchanged unless the packets include both encoder counts.
+        """
+        left = right = distance = angle = None
+        for packet in _odometry_packets(packets):
+            if type(packet) is Packet43:
+                right = packet.right_encoder_counts
+            elif type(packet) is Packet44:
+                left = packet.left_encoder_counts
+            elif type(packet) is Packet19:
+                distance = packet.distance
+            elif type(packet) is Packet20:
+                angle = packet.angle
+        if left is None or right is None:
+            return self.pose
+        return self.update_counts(left, right, distance, angle)
+
+    def update_counts(
+        self, left: int, right: int, distance: Optional[int] = None, angle: Optional[int] = None
+    ) -> Pose:
+        """Updates the pose from the encoder counts and, if fusing, the distance and angle reported by the Roomba.
+
+        Parameters
+        ----------
+        left : int
+            The left encoder counts.
+        right : int
+            The right encoder counts.
+        distance : Optional[int], optional
+            The distance (mm) reported by the Roomba since the previous update, by default None
+        angle : Optional[int], optional
+            The angle (degrees) reported by the Roomba since the previous update, by default None
+
+        Returns
+        -------
+        Pose
+            The updated pose.
+        """
+        if self._left is None:
+            self._left = left
+            self._right = right
+            return self.pose
+        left_mm = count_delta(self._left, left) / self.counts_per_mm
+        right_mm = count_delta(self._right, right) / self.counts_per_mm
+        self._left = left
+        self._right = right
+        step = (left_mm + right_mm) / 2
+        turn = (right_mm - left_mm) / self.wheel_base
+        if self.fusion_weight > 0.0:
+            if distance is not None:
+                step += self.fusion_weight * (distance - step)
+            if angle is not None:
+                turn += self.fusion_weight * (radians(angle) - turn)
+        heading = self._heading + turn / 2
+        self._x += step * cos(heading)
+        self._y += step * sin(heading)
+        self._heading = (self._heading + turn + pi) % (2 * pi) - pi
+        self._distance += step
+        return self.pose
+
+
+def _odometry_packets(packets: Iterable[Packet]) -> Iterator[Packet]:
+    """Iterates over the distance, angle and encoder count packets among the specified packets and their member packets.
+
+    Only the needed members of group packets are accessed, so lazy group packets only decode those.
+
+    Parameters
+    ----------
+    packets : Iterable[Packet]
+        The packets.
+
+    Yields
+    ------
+    Packet
+        The distance, angle and encoder count packets.
+    """
+    for packet in packets:
+        if type(packet) in _odometry_types:
+            yield packet
+        for member in packet.members:
+            if member in _odometry_types:
+                yield getattr(packet, f"packet_{member.id}")
+
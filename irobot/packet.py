@@ -26,10 +26,10 @@ SOFTWARE.
 
 
 from abc import ABC, abstractclassmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import IntEnum, unique
-from struct import unpack_from
-from typing import AnyStr, ClassVar, Dict, Type
+from struct import Struct, unpack_from
+from typing import AnyStr, Callable, ClassVar, Dict, Tuple, Type
 
 
 @unique
@@ -69,15 +69,49 @@ class Mode(IntEnum):
 
 
 class Packet(ABC):
-    """Abstract base class for Roomba packets."""
+    """Abstract base class for Roomba packets.
+
+    The packet implementations are slotted dataclasses, so decoded packets have no instance `__dict__`. This keeps large
+    numbers of decoded packets compact and makes attribute access faster.
+    """
+
+    __slots__ = ()
 
     id: int = None
     """The packet `id`."""
     size: int = None
     """The packet `size`."""
+    format: str = None
+    """The packet `struct` format, without the byte order character (the Roomba is big-endian)."""
+    members: Tuple[Type["Packet"], ...] = ()
+    """The member packet types of a group packet. Empty for all other packets."""
+    struct: Struct = None
+    """The precompiled `Struct` of a group packet. `None` for all other packets."""
+    converters: Tuple[Callable[[int], "Packet"], ...] = ()
+    """The callables converting the values unpacked with the `struct` of a group packet to its member packets."""
+    table: Tuple["Packet", ...] = ()
+    """The shared, immutable packets for each of the 256 values of a tabulated flag packet. Empty for all other packets."""
     registry: Dict[AnyStr, Type]
     """The packet type registry."""
 
+    @classmethod
+    def from_value(cls, value: int) -> "Packet":
+        """Converts the raw value, unpacked using the packet `format`, to the corresponding packet implementation.
+
+        Packets that do more than store the raw value override this method.
+
+        Parameters
+        ----------
+        value : int
+            The raw value.
+
+        Returns
+        -------
+        Packet
+            The `Packet` implementation.
+        """
+        return cls(value)
+
     @staticmethod
     @abstractclassmethod
     def from_bytes(data: bytes, offset: int = 0) -> "Packet":  # pragma: no cover
@@ -98,128 +132,190 @@ class Packet(ABC):
         pass
 
 
-@dataclass
+def _tabulate(cls: Type[Packet]) -> Type[Packet]:
+    """Precomputes the packets for all 256 possible values of a single byte flag packet.
+
+    The packet type must be a frozen dataclass, as the packets in its `table` are shared by everyone decoding them.
+
+    Parameters
+    ----------
+    cls : Type[Packet]
+        The flag packet type.
+
+    Returns
+    -------
+    Type[Packet]
+        The flag packet type.
+    """
+    cls.table = tuple(cls._from_bits(value) for value in range(256))
+    return cls
+
+
+@_tabulate
+@dataclass(frozen=True, slots=True)
 class Packet7(Packet):
     """Roomba packet 7 (Bumps and wheel drops)."""
 
     id: ClassVar[int] = 7
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     wheel_drop_left: bool = False
     wheel_drop_right: bool = False
     bump_left: bool = False
     bump_right: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet7":
-        wheel_drop_left = data[offset] & 0b00001000 != 0
-        wheel_drop_right = data[offset] & 0b00000100 != 0
-        bump_left = data[offset] & 0b00000010 != 0
-        bump_right = data[offset] & 0b00000001 != 0
-        return Packet7(wheel_drop_left, wheel_drop_right, bump_left, bump_right)
+        return Packet7.table[data[offset]]
 
+    def from_value(value: int) -> "Packet7":
+        return Packet7.table[value]
 
-@dataclass
+    @classmethod
+    def _from_bits(cls, value: int) -> "Packet7":
+        wheel_drop_left = value & 0b00001000 != 0
+        wheel_drop_right = value & 0b00000100 != 0
+        bump_left = value & 0b00000010 != 0
+        bump_right = value & 0b00000001 != 0
+        return cls(wheel_drop_left, wheel_drop_right, bump_left, bump_right)
+
+
+@dataclass(slots=True)
 class Packet8(Packet):
     """Roomba packet 8 (Wall)."""
 
     id: ClassVar[int] = 8
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     wall: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet8":
-        wall = data[offset] & 0b00000001 != 0
+        return Packet8.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet8":
+        wall = value & 0b00000001 != 0
         return Packet8(wall)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet9(Packet):
     """Roomba packet 9 (Cliff left)."""
 
     id: ClassVar[int] = 9
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     cliff_left: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet9":
-        cliff_left = data[offset] & 0b00000001 != 0
+        return Packet9.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet9":
+        cliff_left = value & 0b00000001 != 0
         return Packet9(cliff_left)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet10(Packet):
     """Roomba packet 10 (Cliff front left)."""
 
     id: ClassVar[int] = 10
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     cliff_front_left: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet10":
-        cliff_front_left = data[offset] & 0b00000001 != 0
+        return Packet10.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet10":
+        cliff_front_left = value & 0b00000001 != 0
         return Packet10(cliff_front_left)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet11(Packet):
     """Roomba packet 11 (Cliff front right)."""
 
     id: ClassVar[int] = 11
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     cliff_front_right: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet11":
-        cliff_front_right = data[offset] & 0b00000001 != 0
+        return Packet11.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet11":
+        cliff_front_right = value & 0b00000001 != 0
         return Packet11(cliff_front_right)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet12(Packet):
     """Roomba packet 12 (Cliff right)."""
 
     id: ClassVar[int] = 12
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     cliff_right: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet12":
-        cliff_right = data[offset] & 0b00000001 != 0
+        return Packet12.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet12":
+        cliff_right = value & 0b00000001 != 0
         return Packet12(cliff_right)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet13(Packet):
     """Roomba packet 13 (Virtual wall)."""
 
     id: ClassVar[int] = 13
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     virtual_wall: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet13":
-        virtual_wall = data[offset] & 0b00000001 != 0
+        return Packet13.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet13":
+        virtual_wall = value & 0b00000001 != 0
         return Packet13(virtual_wall)
 
 
-@dataclass
+@_tabulate
+@dataclass(frozen=True, slots=True)
 class Packet14(Packet):
     """Roomba packet 14 (Wheel overcurrents)."""
 
     id: ClassVar[int] = 14
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     left_wheel: bool = False
     right_wheel: bool = False
     main_brush: bool = False
     side_brush: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet14":
-        left_wheel = data[offset] & 0b00010000 != 0
-        right_wheel = data[offset] & 0b00001000 != 0
-        main_brush = data[offset] & 0b00000100 != 0
-        side_brush = data[offset] & 0b00000001 != 0
-        return Packet14(left_wheel, right_wheel, main_brush, side_brush)
+        return Packet14.table[data[offset]]
+
+    def from_value(value: int) -> "Packet14":
+        return Packet14.table[value]
 
+    @classmethod
+    def _from_bits(cls, value: int) -> "Packet14":
+        left_wheel = value & 0b00010000 != 0
+        right_wheel = value & 0b00001000 != 0
+        main_brush = value & 0b00000100 != 0
+        side_brush = value & 0b00000001 != 0
+        return cls(left_wheel, right_wheel, main_brush, side_brush)
 
-@dataclass
+
+@dataclass(slots=True)
 class Packet15(Packet):
     """Roomba packet 15 (Dirt detect)."""
 
     id: ClassVar[int] = 15
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     dirt_detect: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet15":
@@ -227,12 +323,13 @@ class Packet15(Packet):
         return Packet15(dirt_detect)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet16(Packet):
     """Roomba packet 16 (Unused)."""
 
     id: ClassVar[int] = 16
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     unused_byte: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet16":
@@ -240,12 +337,13 @@ class Packet16(Packet):
         return Packet16(unused_byte)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet17(Packet):
     """Roomba packet 17 (Infrared character omni)."""
 
     id: ClassVar[int] = 17
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     ir_character_omni: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet17":
@@ -253,12 +351,14 @@ class Packet17(Packet):
         return Packet17(ir_character_omni)
 
 
-@dataclass
+@_tabulate
+@dataclass(frozen=True, slots=True)
 class Packet18(Packet):
     """Roomba packet 18 (Buttons)."""
 
     id: ClassVar[int] = 18
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     clock: bool = False
     schedule: bool = False
     day: bool = False
@@ -269,7 +369,13 @@ class Packet18(Packet):
     clean: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet18":
-        (button_bits,) = unpack_from(">B", data, offset=offset)
+        return Packet18.table[data[offset]]
+
+    def from_value(value: int) -> "Packet18":
+        return Packet18.table[value]
+
+    @classmethod
+    def _from_bits(cls, button_bits: int) -> "Packet18":
         clock = button_bits & 0b10000000 != 0
         schedule = button_bits & 0b01000000 != 0
         day = button_bits & 0b00100000 != 0
@@ -278,15 +384,16 @@ class Packet18(Packet):
         dock = button_bits & 0b00000100 != 0
         spot = button_bits & 0b00000010 != 0
         clean = button_bits & 0b00000001 != 0
-        return Packet18(clock, schedule, day, hour, minute, dock, spot, clean)
+        return cls(clock, schedule, day, hour, minute, dock, spot, clean)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet19(Packet):
     """Roomba packet 19 (Distance)."""
 
     id: ClassVar[int] = 19
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     distance: int
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet19":
@@ -294,12 +401,13 @@ class Packet19(Packet):
         return Packet19(distance)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet20(Packet):
     """Roomba packet 20 (Angle)."""
 
     id: ClassVar[int] = 20
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     angle: int
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet20":
@@ -307,16 +415,19 @@ class Packet20(Packet):
         return Packet20(angle)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet21(Packet):
     """Roomba packet 21 (Charging state)."""
 
     id: ClassVar[int] = 21
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     charging_state: ChargingState
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet21":
-        (value,) = unpack_from(">B", data, offset=offset)
+        return Packet21.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet21":
         try:
             charging_state = ChargingState(value)
         except ValueError:
@@ -324,12 +435,13 @@ class Packet21(Packet):
         return Packet21(charging_state)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet22(Packet):
     """Roomba packet 22 (Voltage)."""
 
     id: ClassVar[int] = 22
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     voltage: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet22":
@@ -337,12 +449,13 @@ class Packet22(Packet):
         return Packet22(voltage)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet23(Packet):
     """Roomba packet 23 (Current)."""
 
     id: ClassVar[int] = 23
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     current: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet23":
@@ -350,12 +463,13 @@ class Packet23(Packet):
         return Packet23(current)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet24(Packet):
     """Roomba packet 23 (Temperature)."""
 
     id: ClassVar[int] = 24
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "b"
     temperature: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet23":
@@ -363,12 +477,13 @@ class Packet24(Packet):
         return Packet24(temperature)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet25(Packet):
     """Roomba packet 25 (Battery charge)."""
 
     id: ClassVar[int] = 25
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     battery_charge: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet25":
@@ -376,12 +491,13 @@ class Packet25(Packet):
         return Packet25(battery_charge)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet26(Packet):
     """Roomba packet 25 (Battery capacity)."""
 
     id: ClassVar[int] = 26
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     battery_capacity: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet26":
@@ -389,12 +505,13 @@ class Packet26(Packet):
         return Packet26(battery_capacity)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet27(Packet):
     """Roomba packet 27 (Wall signal)."""
 
     id: ClassVar[int] = 27
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     wall_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet27":
@@ -402,12 +519,13 @@ class Packet27(Packet):
         return Packet27(wall_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet28(Packet):
     """Roomba packet 28 (Cliff left signal)."""
 
     id: ClassVar[int] = 28
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     cliff_left_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet28":
@@ -415,12 +533,13 @@ class Packet28(Packet):
         return Packet28(cliff_left_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet29(Packet):
     """Roomba packet 29 (Cliff front left signal)."""
 
     id: ClassVar[int] = 29
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     cliff_front_left_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet29":
@@ -428,12 +547,13 @@ class Packet29(Packet):
         return Packet29(cliff_front_left_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet30(Packet):
     """Roomba packet 30 (Cliff front right signal)."""
 
     id: ClassVar[int] = 30
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     cliff_front_right_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet29":
@@ -441,12 +561,13 @@ class Packet30(Packet):
         return Packet30(cliff_front_right_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet31(Packet):
     """Roomba packet 31 (Cliff right signal)."""
 
     id: ClassVar[int] = 31
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     cliff_right_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet28":
@@ -454,12 +575,13 @@ class Packet31(Packet):
         return Packet31(cliff_right_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet32(Packet):
     """Roomba packet 32 (Unused)."""
 
     id: ClassVar[int] = 32
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     unused_byte: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet32":
@@ -467,12 +589,13 @@ class Packet32(Packet):
         return Packet32(unused_byte)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet33(Packet):
     """Roomba packet 33 (Unused)."""
 
     id: ClassVar[int] = 33
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     unused_short: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet33":
@@ -480,32 +603,43 @@ class Packet33(Packet):
         return Packet33(unused_short)
 
 
-@dataclass
+@_tabulate
+@dataclass(frozen=True, slots=True)
 class Packet34(Packet):
     """Roomba packet 34 (Charging sources available)."""
 
     id: ClassVar[int] = 34
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     home_base: bool = False
     internal_charger: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet34":
-        (source_bits,) = unpack_from(">B", data, offset=offset)
+        return Packet34.table[data[offset]]
+
+    def from_value(value: int) -> "Packet34":
+        return Packet34.table[value]
+
+    @classmethod
+    def _from_bits(cls, source_bits: int) -> "Packet34":
         home_base = source_bits & 0b00000010 != 0
         internal_charger = source_bits & 0b00000001 != 0
-        return Packet34(home_base, internal_charger)
+        return cls(home_base, internal_charger)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet35(Packet):
     """Roomba packet 35 (OI mode)."""
 
     id: ClassVar[int] = 35
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     mode: Mode = Mode.OFF
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet35":
-        (value,) = unpack_from(">B", data, offset=offset)
+        return Packet35.from_value(data[offset])
+
+    def from_value(value: int) -> "Packet35":
         try:
             mode = Mode(value)
         except ValueError:
@@ -513,12 +647,13 @@ class Packet35(Packet):
         return Packet35(mode)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet36(Packet):
     """Roomba packet 36 (Song number)."""
 
     id: ClassVar[int] = 36
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     song: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet36":
@@ -526,26 +661,30 @@ class Packet36(Packet):
         return Packet36(song)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet37(Packet):
     """Roomba packet 37 (Song playing)."""
 
     id: ClassVar[int] = 37
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     song_playing: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet37":
-        (song_bits,) = unpack_from(">B", data, offset=offset)
+        return Packet37.from_value(data[offset])
+
+    def from_value(song_bits: int) -> "Packet37":
         song = song_bits & 0b00000001 != 0
         return Packet37(song)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet38(Packet):
     """Roomba packet 38 (Number of stream packets)."""
 
     id: ClassVar[int] = 38
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     stream_packet_count: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet38":
@@ -553,12 +692,13 @@ class Packet38(Packet):
         return Packet38(stream_packet_count)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet39(Packet):
     """Roomba packet 39 (Requested velocity)."""
 
     id: ClassVar[int] = 39
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     requested_velocity: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet39":
@@ -566,12 +706,13 @@ class Packet39(Packet):
         return Packet39(requested_velocity)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet40(Packet):
     """Roomba packet 40 (Requested radius)."""
 
     id: ClassVar[int] = 40
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     requested_radius: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet40":
@@ -579,12 +720,13 @@ class Packet40(Packet):
         return Packet40(requested_radius)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet41(Packet):
     """Roomba packet 41 (Requested right velocity)."""
 
     id: ClassVar[int] = 41
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     requested_right_velocity: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet41":
@@ -592,12 +734,13 @@ class Packet41(Packet):
         return Packet41(requested_right_velocity)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet42(Packet):
     """Roomba packet 42 (Requested left velocity)."""
 
     id: ClassVar[int] = 42
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     requested_left_velocity: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet42":
@@ -605,12 +748,13 @@ class Packet42(Packet):
         return Packet42(requested_left_velocity)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet43(Packet):
     """Roomba packet 43 (Right encoder counts)."""
 
     id: ClassVar[int] = 43
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     right_encoder_counts: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet43":
@@ -618,12 +762,13 @@ class Packet43(Packet):
         return Packet43(right_encoder_counts)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet44(Packet):
     """Roomba packet 44 (Left encoder counts)."""
 
     id: ClassVar[int] = 44
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     left_encoder_counts: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet44":
@@ -631,12 +776,14 @@ class Packet44(Packet):
         return Packet44(left_encoder_counts)
 
 
-@dataclass
+@_tabulate
+@dataclass(frozen=True, slots=True)
 class Packet45(Packet):
     """Roomba packet 45 (Light bumper)."""
 
     id: ClassVar[int] = 45
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     bumper_right: bool = False
     bumper_front_right: bool = False
     bumper_center_right: bool = False
@@ -645,22 +792,29 @@ class Packet45(Packet):
     bumper_left: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet45":
-        (bumper_bits,) = unpack_from(">B", data, offset=offset)
+        return Packet45.table[data[offset]]
+
+    def from_value(value: int) -> "Packet45":
+        return Packet45.table[value]
+
+    @classmethod
+    def _from_bits(cls, bumper_bits: int) -> "Packet45":
         bumper_right = bumper_bits & 0b00100000 != 0
         bumper_front_right = bumper_bits & 0b00010000 != 0
         bumper_center_right = bumper_bits & 0b00001000 != 0
         bumper_center_left = bumper_bits & 0b00000100 != 0
         bumper_front_left = bumper_bits & 0b00000010 != 0
         bumper_left = bumper_bits & 0b00000001 != 0
-        return Packet45(bumper_right, bumper_front_right, bumper_center_right, bumper_center_left, bumper_front_left, bumper_left)
+        return cls(bumper_right, bumper_front_right, bumper_center_right, bumper_center_left, bumper_front_left, bumper_left)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet46(Packet):
     """Roomba packet 46 (Light bump left signal)."""
 
     id: ClassVar[int] = 46
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     bump_left_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet46":
@@ -668,12 +822,13 @@ class Packet46(Packet):
         return Packet46(bump_left_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet47(Packet):
     """Roomba packet 47 (Light bump front left signal)."""
 
     id: ClassVar[int] = 47
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     bump_front_left_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet47":
@@ -681,12 +836,13 @@ class Packet47(Packet):
         return Packet47(bump_front_left_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet48(Packet):
     """Roomba packet 48 (Light bump center left signal)."""
 
     id: ClassVar[int] = 48
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     bump_center_left_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet48":
@@ -694,12 +850,13 @@ class Packet48(Packet):
         return Packet48(bump_center_left_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet49(Packet):
     """Roomba packet 49 (Light bump center right signal)."""
 
     id: ClassVar[int] = 49
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     bump_center_right_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet49":
@@ -707,12 +864,13 @@ class Packet49(Packet):
         return Packet49(bump_center_right_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet50(Packet):
     """Roomba packet 50 (Light bump front right signal)."""
 
     id: ClassVar[int] = 50
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     bump_front_right_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet50":
@@ -720,12 +878,13 @@ class Packet50(Packet):
         return Packet50(bump_front_right_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet51(Packet):
     """Roomba packet 51 (Light bump right signal)."""
 
     id: ClassVar[int] = 51
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "H"
     bump_right_signal: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet51":
@@ -733,12 +892,13 @@ class Packet51(Packet):
         return Packet51(bump_right_signal)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet52(Packet):
     """Roomba packet 52 (Infrared character left)."""
 
     id: ClassVar[int] = 52
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     ir_character_left: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet52":
@@ -746,12 +906,13 @@ class Packet52(Packet):
         return Packet52(ir_character_left)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet53(Packet):
     """Roomba packet 53 (Infrared character right)."""
 
     id: ClassVar[int] = 53
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     ir_character_right: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet53":
@@ -759,12 +920,13 @@ class Packet53(Packet):
         return Packet53(ir_character_right)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet54(Packet):
     """Roomba packet 54 (Left motor current)."""
 
     id: ClassVar[int] = 54
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     left_motor_current: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet54":
@@ -772,12 +934,13 @@ class Packet54(Packet):
         return Packet54(left_motor_current)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet55(Packet):
     """Roomba packet 55 (Right motor current)."""
 
     id: ClassVar[int] = 55
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     right_motor_current: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet55":
@@ -785,12 +948,13 @@ class Packet55(Packet):
         return Packet55(right_motor_current)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet56(Packet):
     """Roomba packet 56 (Main brush motor current)."""
 
     id: ClassVar[int] = 56
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     main_brush_motor_current: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet56":
@@ -798,12 +962,13 @@ class Packet56(Packet):
         return Packet56(main_brush_motor_current)
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet57(Packet):
     """Roomba packet 57 (Side brush motor current)."""
 
     id: ClassVar[int] = 57
     size: ClassVar[int] = 2
+    format: ClassVar[str] = "h"
     side_brush_motor_current: int = 0
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet57":
@@ -811,21 +976,76 @@ class Packet57(Packet):
         return Packet57(side_brush_motor_current)
 
 
-@dataclass
+@_tabulate
+@dataclass(frozen=True, slots=True)
 class Packet58(Packet):
     """Roomba packet 58 (Stasis)."""
 
     id: ClassVar[int] = 58
     size: ClassVar[int] = 1
+    format: ClassVar[str] = "B"
     forward_progress: bool = False
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet58":
-        (stasis_bits,) = unpack_from(">B", data, offset=offset)
-        forward_progress = stasis_bits & 0b00000001 != 0
-        return Packet58(forward_progress)
+        return Packet58.table[data[offset]]
 
+    def from_value(value: int) -> "Packet58":
+        return Packet58.table[value]
 
-@dataclass
+    @classmethod
+    def _from_bits(cls, stasis_bits: int) -> "Packet58":
+        forward_progress = stasis_bits & 0b00000001 != 0
+        return cls(forward_progress)
+
+
+def _converter(cls: Type[Packet]) -> Callable[[int], Packet]:
+    """Returns the fastest callable converting a raw value to a packet of the specified type.
+
+    Parameters
+    ----------
+    cls : Type[Packet]
+        The packet type.
+
+    Returns
+    -------
+    Callable[[int], Packet]
+        The callable.
+    """
+    if len(cls.table) > 0:
+        return cls.table.__getitem__
+    if "from_value" in vars(cls):
+        return cls.from_value
+    return cls
+
+
+def _group(cls: Type[Packet]) -> Type[Packet]:
+    """Prepares a group packet for decoding all of its member packets with a single, precompiled `Struct`.
+
+    Sets the `members` of the group packet to the member packet types, in the order of its fields, its `format` to the
+    concatenation of the members' formats, its `struct` to the compiled, big-endian `Struct` for that format, and its
+    `converters` to the callables converting each unpacked value to a member packet. Members that merely store the raw value
+    are converted by calling their type directly and tabulated flag packets by indexing their table, which saves a method
+    call per member.
+
+    Parameters
+    ----------
+    cls : Type[Packet]
+        The group packet type.
+
+    Returns
+    -------
+    Type[Packet]
+        The group packet type.
+    """
+    cls.members = tuple(field.type for field in fields(cls))
+    cls.format = "".join(member.format for member in cls.members)
+    cls.struct = Struct(">" + cls.format)
+    cls.converters = tuple(_converter(member) for member in cls.members)
+    return cls
+
+
+@_group
+@dataclass(slots=True)
 class Packet0(Packet):
     """Roomba packet 0 (Group packet for packets 7 to 26)."""
 
@@ -853,70 +1073,12 @@ class Packet0(Packet):
     packet_26: Packet26
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet0":
-        packet_7 = Packet7.from_bytes(data, offset=offset)
-        offset += Packet7.size
-        packet_8 = Packet8.from_bytes(data, offset=offset)
-        offset += Packet8.size
-        packet_9 = Packet9.from_bytes(data, offset=offset)
-        offset += Packet9.size
-        packet_10 = Packet10.from_bytes(data, offset=offset)
-        offset += Packet10.size
-        packet_11 = Packet11.from_bytes(data, offset=offset)
-        offset += Packet11.size
-        packet_12 = Packet12.from_bytes(data, offset=offset)
-        offset += Packet12.size
-        packet_13 = Packet13.from_bytes(data, offset=offset)
-        offset += Packet13.size
-        packet_14 = Packet14.from_bytes(data, offset=offset)
-        offset += Packet14.size
-        packet_15 = Packet15.from_bytes(data, offset=offset)
-        offset += Packet15.size
-        packet_16 = Packet16.from_bytes(data, offset=offset)
-        offset += Packet16.size
-        packet_17 = Packet17.from_bytes(data, offset=offset)
-        offset += Packet17.size
-        packet_18 = Packet18.from_bytes(data, offset=offset)
-        offset += Packet18.size
-        packet_19 = Packet19.from_bytes(data, offset=offset)
-        offset += Packet19.size
-        packet_20 = Packet20.from_bytes(data, offset=offset)
-        offset += Packet20.size
-        packet_21 = Packet21.from_bytes(data, offset=offset)
-        offset += Packet21.size
-        packet_22 = Packet22.from_bytes(data, offset=offset)
-        offset += Packet22.size
-        packet_23 = Packet23.from_bytes(data, offset=offset)
-        offset += Packet23.size
-        packet_24 = Packet24.from_bytes(data, offset=offset)
-        offset += Packet24.size
-        packet_25 = Packet25.from_bytes(data, offset=offset)
-        offset += Packet25.size
-        packet_26 = Packet26.from_bytes(data, offset=offset)
-        return Packet0(
-            packet_7,
-            packet_8,
-            packet_9,
-            packet_10,
-            packet_11,
-            packet_12,
-            packet_13,
-            packet_14,
-            packet_15,
-            packet_16,
-            packet_17,
-            packet_18,
-            packet_19,
-            packet_20,
-            packet_21,
-            packet_22,
-            packet_23,
-            packet_24,
-            packet_25,
-            packet_26,
-        )
-
-
-@dataclass
+        values = Packet0.struct.unpack_from(data, offset)
+        return Packet0(*[convert(value) for convert, value in zip(Packet0.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet1(Packet):
     """Roomba packet 1 (Group packet for packets 7 to 16)."""
 
@@ -934,29 +1096,12 @@ class Packet1(Packet):
     packet_16: Packet16
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet1":
-        packet_7 = Packet7.from_bytes(data, offset=offset)
-        offset += Packet7.size
-        packet_8 = Packet8.from_bytes(data, offset=offset)
-        offset += Packet8.size
-        packet_9 = Packet9.from_bytes(data, offset=offset)
-        offset += Packet9.size
-        packet_10 = Packet10.from_bytes(data, offset=offset)
-        offset += Packet10.size
-        packet_11 = Packet11.from_bytes(data, offset=offset)
-        offset += Packet11.size
-        packet_12 = Packet12.from_bytes(data, offset=offset)
-        offset += Packet12.size
-        packet_13 = Packet13.from_bytes(data, offset=offset)
-        offset += Packet13.size
-        packet_14 = Packet14.from_bytes(data, offset=offset)
-        offset += Packet14.size
-        packet_15 = Packet15.from_bytes(data, offset=offset)
-        offset += Packet15.size
-        packet_16 = Packet16.from_bytes(data, offset=offset)
-        return Packet1(packet_7, packet_8, packet_9, packet_10, packet_11, packet_12, packet_13, packet_14, packet_15, packet_16)
-
-
-@dataclass
+        values = Packet1.struct.unpack_from(data, offset)
+        return Packet1(*[convert(value) for convert, value in zip(Packet1.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet2(Packet):
     """Roomba packet 2 (Group packet for packets 17 to 20)."""
 
@@ -968,17 +1113,12 @@ class Packet2(Packet):
     packet_20: Packet20
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet2":
-        packet_17 = Packet17.from_bytes(data, offset=offset)
-        offset += Packet17.size
-        packet_18 = Packet18.from_bytes(data, offset=offset)
-        offset += Packet18.size
-        packet_19 = Packet19.from_bytes(data, offset=offset)
-        offset += Packet19.size
-        packet_20 = Packet20.from_bytes(data, offset=offset)
-        return Packet2(packet_17, packet_18, packet_19, packet_20)
+        values = Packet2.struct.unpack_from(data, offset)
+        return Packet2(*[convert(value) for convert, value in zip(Packet2.converters, values)])
 
 
-@dataclass
+@_group
+@dataclass(slots=True)
 class Packet3(Packet):
     """Roomba packet 3 (Group packet for packets 21 to 26)."""
 
@@ -992,21 +1132,12 @@ class Packet3(Packet):
     packet_26: Packet26
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet3":
-        packet_21 = Packet21.from_bytes(data, offset=offset)
-        offset += Packet21.size
-        packet_22 = Packet22.from_bytes(data, offset=offset)
-        offset += Packet22.size
-        packet_23 = Packet23.from_bytes(data, offset=offset)
-        offset += Packet23.size
-        packet_24 = Packet24.from_bytes(data, offset=offset)
-        offset += Packet24.size
-        packet_25 = Packet25.from_bytes(data, offset=offset)
-        offset += Packet25.size
-        packet_26 = Packet26.from_bytes(data, offset=offset)
-        return Packet3(packet_21, packet_22, packet_23, packet_24, packet_25, packet_26)
-
-
-@dataclass
+        values = Packet3.struct.unpack_from(data, offset)
+        return Packet3(*[convert(value) for convert, value in zip(Packet3.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet4(Packet):
     """Roomba packet 4 (Group packet for packets 27 to 34)."""
 
@@ -1022,25 +1153,12 @@ class Packet4(Packet):
     packet_34: Packet34
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet4":
-        packet_27 = Packet27.from_bytes(data, offset=offset)
-        offset += Packet27.size
-        packet_28 = Packet28.from_bytes(data, offset=offset)
-        offset += Packet28.size
-        packet_29 = Packet29.from_bytes(data, offset=offset)
-        offset += Packet29.size
-        packet_30 = Packet30.from_bytes(data, offset=offset)
-        offset += Packet30.size
-        packet_31 = Packet31.from_bytes(data, offset=offset)
-        offset += Packet31.size
-        packet_32 = Packet32.from_bytes(data, offset=offset)
-        offset += Packet32.size
-        packet_33 = Packet33.from_bytes(data, offset=offset)
-        offset += Packet33.size
-        packet_34 = Packet34.from_bytes(data, offset=offset)
-        return Packet4(packet_27, packet_28, packet_29, packet_30, packet_31, packet_32, packet_33, packet_34)
-
-
-@dataclass
+        values = Packet4.struct.unpack_from(data, offset)
+        return Packet4(*[convert(value) for convert, value in zip(Packet4.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet5(Packet):
     """Roomba packet 5 (Group packet for packets 35 to 42)."""
 
@@ -1056,25 +1174,12 @@ class Packet5(Packet):
     packet_42: Packet42
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet5":
-        packet_35 = Packet35.from_bytes(data, offset=offset)
-        offset += Packet35.size
-        packet_36 = Packet36.from_bytes(data, offset=offset)
-        offset += Packet36.size
-        packet_37 = Packet37.from_bytes(data, offset=offset)
-        offset += Packet37.size
-        packet_38 = Packet38.from_bytes(data, offset=offset)
-        offset += Packet38.size
-        packet_39 = Packet39.from_bytes(data, offset=offset)
-        offset += Packet39.size
-        packet_40 = Packet40.from_bytes(data, offset=offset)
-        offset += Packet40.size
-        packet_41 = Packet41.from_bytes(data, offset=offset)
-        offset += Packet41.size
-        packet_42 = Packet42.from_bytes(data, offset=offset)
-        return Packet5(packet_35, packet_36, packet_37, packet_38, packet_39, packet_40, packet_41, packet_42)
-
-
-@dataclass
+        values = Packet5.struct.unpack_from(data, offset)
+        return Packet5(*[convert(value) for convert, value in zip(Packet5.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet6(Packet):
     """Roomba packet 6 (Group packet for packets 7 to 42)."""
 
@@ -1117,119 +1222,13 @@ class Packet6(Packet):
     packet_41: Packet41
     packet_42: Packet42
 
-    def from_bytes(data: bytes, offset: int = 0) -> "Packet0":
-        packet_7 = Packet7.from_bytes(data, offset=offset)
-        offset += Packet7.size
-        packet_8 = Packet8.from_bytes(data, offset=offset)
-        offset += Packet8.size
-        packet_9 = Packet9.from_bytes(data, offset=offset)
-        offset += Packet9.size
-        packet_10 = Packet10.from_bytes(data, offset=offset)
-        offset += Packet10.size
-        packet_11 = Packet11.from_bytes(data, offset=offset)
-        offset += Packet11.size
-        packet_12 = Packet12.from_bytes(data, offset=offset)
-        offset += Packet12.size
-        packet_13 = Packet13.from_bytes(data, offset=offset)
-        offset += Packet13.size
-        packet_14 = Packet14.from_bytes(data, offset=offset)
-        offset += Packet14.size
-        packet_15 = Packet15.from_bytes(data, offset=offset)
-        offset += Packet15.size
-        packet_16 = Packet16.from_bytes(data, offset=offset)
-        offset += Packet16.size
-        packet_17 = Packet17.from_bytes(data, offset=offset)
-        offset += Packet17.size
-        packet_18 = Packet18.from_bytes(data, offset=offset)
-        offset += Packet18.size
-        packet_19 = Packet19.from_bytes(data, offset=offset)
-        offset += Packet19.size
-        packet_20 = Packet20.from_bytes(data, offset=offset)
-        offset += Packet20.size
-        packet_21 = Packet21.from_bytes(data, offset=offset)
-        offset += Packet21.size
-        packet_22 = Packet22.from_bytes(data, offset=offset)
-        offset += Packet22.size
-        packet_23 = Packet23.from_bytes(data, offset=offset)
-        offset += Packet23.size
-        packet_24 = Packet24.from_bytes(data, offset=offset)
-        offset += Packet24.size
-        packet_25 = Packet25.from_bytes(data, offset=offset)
-        offset += Packet25.size
-        packet_26 = Packet26.from_bytes(data, offset=offset)
-        offset += Packet26.size
-        packet_27 = Packet27.from_bytes(data, offset=offset)
-        offset += Packet27.size
-        packet_28 = Packet28.from_bytes(data, offset=offset)
-        offset += Packet28.size
-        packet_29 = Packet29.from_bytes(data, offset=offset)
-        offset += Packet29.size
-        packet_30 = Packet30.from_bytes(data, offset=offset)
-        offset += Packet30.size
-        packet_31 = Packet31.from_bytes(data, offset=offset)
-        offset += Packet31.size
-        packet_32 = Packet32.from_bytes(data, offset=offset)
-        offset += Packet32.size
-        packet_33 = Packet33.from_bytes(data, offset=offset)
-        offset += Packet33.size
-        packet_34 = Packet34.from_bytes(data, offset=offset)
-        offset += Packet34.size
-        packet_35 = Packet35.from_bytes(data, offset=offset)
-        offset += Packet35.size
-        packet_36 = Packet36.from_bytes(data, offset=offset)
-        offset += Packet36.size
-        packet_37 = Packet37.from_bytes(data, offset=offset)
-        offset += Packet37.size
-        packet_38 = Packet38.from_bytes(data, offset=offset)
-        offset += Packet38.size
-        packet_39 = Packet39.from_bytes(data, offset=offset)
-        offset += Packet39.size
-        packet_40 = Packet40.from_bytes(data, offset=offset)
-        offset += Packet40.size
-        packet_41 = Packet41.from_bytes(data, offset=offset)
-        offset += Packet41.size
-        packet_42 = Packet42.from_bytes(data, offset=offset)
-        return Packet6(
-            packet_7,
-            packet_8,
-            packet_9,
-            packet_10,
-            packet_11,
-            packet_12,
-            packet_13,
-            packet_14,
-            packet_15,
-            packet_16,
-            packet_17,
-            packet_18,
-            packet_19,
-            packet_20,
-            packet_21,
-            packet_22,
-            packet_23,
-            packet_24,
-            packet_25,
-            packet_26,
-            packet_27,
-            packet_28,
-            packet_29,
-            packet_30,
-            packet_31,
-            packet_32,
-            packet_33,
-            packet_34,
-            packet_35,
-            packet_36,
-            packet_37,
-            packet_38,
-            packet_39,
-            packet_40,
-            packet_41,
-            packet_42,
-        )
-
-
-@dataclass
+    def from_bytes(data: bytes, offset: int = 0) -> "Packet6":
+        values = Packet6.struct.unpack_from(data, offset)
+        return Packet6(*[convert(value) for convert, value in zip(Packet6.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet100(Packet):
     """Roomba packet 100 (Group packet for packets 7 to 58)."""
 
@@ -1289,166 +1288,12 @@ class Packet100(Packet):
     packet_58: Packet58
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet100":
-        packet_7 = Packet7.from_bytes(data, offset=offset)
-        offset += Packet7.size
-        packet_8 = Packet8.from_bytes(data, offset=offset)
-        offset += Packet8.size
-        packet_9 = Packet9.from_bytes(data, offset=offset)
-        offset += Packet9.size
-        packet_10 = Packet10.from_bytes(data, offset=offset)
-        offset += Packet10.size
-        packet_11 = Packet11.from_bytes(data, offset=offset)
-        offset += Packet11.size
-        packet_12 = Packet12.from_bytes(data, offset=offset)
-        offset += Packet12.size
-        packet_13 = Packet13.from_bytes(data, offset=offset)
-        offset += Packet13.size
-        packet_14 = Packet14.from_bytes(data, offset=offset)
-        offset += Packet14.size
-        packet_15 = Packet15.from_bytes(data, offset=offset)
-        offset += Packet15.size
-        packet_16 = Packet16.from_bytes(data, offset=offset)
-        offset += Packet16.size
-        packet_17 = Packet17.from_bytes(data, offset=offset)
-        offset += Packet17.size
-        packet_18 = Packet18.from_bytes(data, offset=offset)
-        offset += Packet18.size
-        packet_19 = Packet19.from_bytes(data, offset=offset)
-        offset += Packet19.size
-        packet_20 = Packet20.from_bytes(data, offset=offset)
-        offset += Packet20.size
-        packet_21 = Packet21.from_bytes(data, offset=offset)
-        offset += Packet21.size
-        packet_22 = Packet22.from_bytes(data, offset=offset)
-        offset += Packet22.size
-        packet_23 = Packet23.from_bytes(data, offset=offset)
-        offset += Packet23.size
-        packet_24 = Packet24.from_bytes(data, offset=offset)
-        offset += Packet24.size
-        packet_25 = Packet25.from_bytes(data, offset=offset)
-        offset += Packet25.size
-        packet_26 = Packet26.from_bytes(data, offset=offset)
-        offset += Packet26.size
-        packet_27 = Packet27.from_bytes(data, offset=offset)
-        offset += Packet27.size
-        packet_28 = Packet28.from_bytes(data, offset=offset)
-        offset += Packet28.size
-        packet_29 = Packet29.from_bytes(data, offset=offset)
-        offset += Packet29.size
-        packet_30 = Packet30.from_bytes(data, offset=offset)
-        offset += Packet30.size
-        packet_31 = Packet31.from_bytes(data, offset=offset)
-        offset += Packet31.size
-        packet_32 = Packet32.from_bytes(data, offset=offset)
-        offset += Packet32.size
-        packet_33 = Packet33.from_bytes(data, offset=offset)
-        offset += Packet33.size
-        packet_34 = Packet34.from_bytes(data, offset=offset)
-        offset += Packet34.size
-        packet_35 = Packet35.from_bytes(data, offset=offset)
-        offset += Packet35.size
-        packet_36 = Packet36.from_bytes(data, offset=offset)
-        offset += Packet36.size
-        packet_37 = Packet37.from_bytes(data, offset=offset)
-        offset += Packet37.size
-        packet_38 = Packet38.from_bytes(data, offset=offset)
-        offset += Packet38.size
-        packet_39 = Packet39.from_bytes(data, offset=offset)
-        offset += Packet39.size
-        packet_40 = Packet40.from_bytes(data, offset=offset)
-        offset += Packet40.size
-        packet_41 = Packet41.from_bytes(data, offset=offset)
-        offset += Packet41.size
-        packet_42 = Packet42.from_bytes(data, offset=offset)
-        offset += Packet42.size
-        packet_43 = Packet43.from_bytes(data, offset=offset)
-        offset += Packet43.size
-        packet_44 = Packet44.from_bytes(data, offset=offset)
-        offset += Packet44.size
-        packet_45 = Packet45.from_bytes(data, offset=offset)
-        offset += Packet45.size
-        packet_46 = Packet46.from_bytes(data, offset=offset)
-        offset += Packet46.size
-        packet_47 = Packet47.from_bytes(data, offset=offset)
-        offset += Packet47.size
-        packet_48 = Packet48.from_bytes(data, offset=offset)
-        offset += Packet48.size
-        packet_49 = Packet49.from_bytes(data, offset=offset)
-        offset += Packet49.size
-        packet_50 = Packet50.from_bytes(data, offset=offset)
-        offset += Packet50.size
-        packet_51 = Packet51.from_bytes(data, offset=offset)
-        offset += Packet51.size
-        packet_52 = Packet52.from_bytes(data, offset=offset)
-        offset += Packet52.size
-        packet_53 = Packet53.from_bytes(data, offset=offset)
-        offset += Packet53.size
-        packet_54 = Packet54.from_bytes(data, offset=offset)
-        offset += Packet54.size
-        packet_55 = Packet55.from_bytes(data, offset=offset)
-        offset += Packet55.size
-        packet_56 = Packet56.from_bytes(data, offset=offset)
-        offset += Packet56.size
-        packet_57 = Packet57.from_bytes(data, offset=offset)
-        offset += Packet57.size
-        packet_58 = Packet58.from_bytes(data, offset=offset)
-        return Packet100(
-            packet_7,
-            packet_8,
-            packet_9,
-            packet_10,
-            packet_11,
-            packet_12,
-            packet_13,
-            packet_14,
-            packet_15,
-            packet_16,
-            packet_17,
-            packet_18,
-            packet_19,
-            packet_20,
-            packet_21,
-            packet_22,
-            packet_23,
-            packet_24,
-            packet_25,
-            packet_26,
-            packet_27,
-            packet_28,
-            packet_29,
-            packet_30,
-            packet_31,
-            packet_32,
-            packet_33,
-            packet_34,
-            packet_35,
-            packet_36,
-            packet_37,
-            packet_38,
-            packet_39,
-            packet_40,
-            packet_41,
-            packet_42,
-            packet_43,
-            packet_44,
-            packet_45,
-            packet_46,
-            packet_47,
-            packet_48,
-            packet_49,
-            packet_50,
-            packet_51,
-            packet_52,
-            packet_53,
-            packet_54,
-            packet_55,
-            packet_56,
-            packet_57,
-            packet_58,
-        )
-
-
-@dataclass
+        values = Packet100.struct.unpack_from(data, offset)
+        return Packet100(*[convert(value) for convert, value in zip(Packet100.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet101(Packet):
     """Roomba packet 101 (Group packet for packets 43 to 58)."""
 
@@ -1472,41 +1317,12 @@ class Packet101(Packet):
     packet_58: Packet58
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet101":
-        packet_43 = Packet43.from_bytes(data, offset=offset)
-        offset += Packet43.size
-        packet_44 = Packet44.from_bytes(data, offset=offset)
-        offset += Packet44.size
-        packet_45 = Packet45.from_bytes(data, offset=offset)
-        offset += Packet45.size
-        packet_46 = Packet46.from_bytes(data, offset=offset)
-        offset += Packet46.size
-        packet_47 = Packet47.from_bytes(data, offset=offset)
-        offset += Packet47.size
-        packet_48 = Packet48.from_bytes(data, offset=offset)
-        offset += Packet48.size
-        packet_49 = Packet49.from_bytes(data, offset=offset)
-        offset += Packet49.size
-        packet_50 = Packet50.from_bytes(data, offset=offset)
-        offset += Packet50.size
-        packet_51 = Packet51.from_bytes(data, offset=offset)
-        offset += Packet51.size
-        packet_52 = Packet52.from_bytes(data, offset=offset)
-        offset += Packet52.size
-        packet_53 = Packet53.from_bytes(data, offset=offset)
-        offset += Packet53.size
-        packet_54 = Packet54.from_bytes(data, offset=offset)
-        offset += Packet54.size
-        packet_55 = Packet55.from_bytes(data, offset=offset)
-        offset += Packet55.size
-        packet_56 = Packet56.from_bytes(data, offset=offset)
-        offset += Packet56.size
-        packet_57 = Packet57.from_bytes(data, offset=offset)
-        offset += Packet57.size
-        packet_58 = Packet58.from_bytes(data, offset=offset)
-        return Packet101(packet_43, packet_44, packet_45, packet_46, packet_47, packet_48, packet_49, packet_50, packet_51, packet_52, packet_53, packet_54, packet_55, packet_56, packet_57, packet_58)
-
-
-@dataclass
+        values = Packet101.struct.unpack_from(data, offset)
+        return Packet101(*[convert(value) for convert, value in zip(Packet101.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet106(Packet):
     """Roomba packet 106 (Group packet for packets 46 to 51)."""
 
@@ -1520,21 +1336,12 @@ class Packet106(Packet):
     packet_51: Packet51
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet106":
-        packet_46 = Packet46.from_bytes(data, offset=offset)
-        offset += Packet46.size
-        packet_47 = Packet47.from_bytes(data, offset=offset)
-        offset += Packet47.size
-        packet_48 = Packet48.from_bytes(data, offset=offset)
-        offset += Packet48.size
-        packet_49 = Packet49.from_bytes(data, offset=offset)
-        offset += Packet49.size
-        packet_50 = Packet50.from_bytes(data, offset=offset)
-        offset += Packet50.size
-        packet_51 = Packet51.from_bytes(data, offset=offset)
-        return Packet106(packet_46, packet_47, packet_48, packet_49, packet_50, packet_51)
-
-
-@dataclass
+        values = Packet106.struct.unpack_from(data, offset)
+        return Packet106(*[convert(value) for convert, value in zip(Packet106.converters, values)])
+
+
+@_group
+@dataclass(slots=True)
 class Packet107(Packet):
     """Roomba packet 107 (Group packet for packets 54 to 58)."""
 
@@ -1547,16 +1354,8 @@ class Packet107(Packet):
     packet_58: Packet58
 
     def from_bytes(data: bytes, offset: int = 0) -> "Packet107":
-        packet_54 = Packet54.from_bytes(data, offset=offset)
-        offset += Packet54.size
-        packet_55 = Packet55.from_bytes(data, offset=offset)
-        offset += Packet55.size
-        packet_56 = Packet56.from_bytes(data, offset=offset)
-        offset += Packet56.size
-        packet_57 = Packet57.from_bytes(data, offset=offset)
-        offset += Packet57.size
-        packet_58 = Packet58.from_bytes(data, offset=offset)
-        return Packet107(packet_54, packet_55, packet_56, packet_57, packet_58)
+        values = Packet107.struct.unpack_from(data, offset)
+        return Packet107(*[convert(value) for convert, value in zip(Packet107.converters, values)])
 
 
 Packet.registry = {
@@ -1624,3 +1423,155 @@ Packet.registry = {
     106: Packet106,
     107: Packet107,
 }
+
+
+class _LazyMember:
+    """Descriptor decoding a member packet of a lazy group packet on first access.
+
+    The decoded packet is stored in the instance dictionary under the member name, where it shadows this (non-data)
+    descriptor, so subsequent accesses are plain attribute lookups.
+    """
+
+    def __init__(self, name: str, offset: int, member: Type[Packet]):
+        """Initializes a new `_LazyMember` instance.
+
+        Parameters
+        ----------
+        name : str
+            The member name, e.g. `packet_22`.
+        offset : int
+            The offset of the member packet data within the group packet data.
+        member : Type[Packet]
+            The member packet type.
+        """
+        self.name = name
+        self.offset = offset
+        self.struct = Struct(">" + member.format)
+        self.convert = _converter(member)
+
+    def __get__(self, instance: "LazyPacket", owner: type) -> Packet:
+        if instance is None:
+            return self
+        packet = self.convert(self.struct.unpack_from(instance.data, self.offset)[0])
+        instance.__dict__[self.name] = packet
+        return packet
+
+
+class LazyPacket(Packet):
+    """Abstract base class for lazy group packets.
+
+    A lazy group packet keeps a `memoryview` of the raw group packet data and decodes each member packet only when it is
+    first accessed, so reading a few members of a large group packet does not pay for decoding all of them. The members
+    are accessed by the same names as those of the corresponding (eager) group packet.
+    """
+
+    group: ClassVar[Type[Packet]] = None
+    """The corresponding group packet type."""
+    registry: ClassVar[Dict[int, Type["LazyPacket"]]]
+    """The lazy group packet type registry."""
+
+    def __init__(self, data: bytes, offset: int = 0):
+        """Initializes a new `LazyPacket` instance.
+
+        Immutable data (e.g. the `bytes` returned from a serial port) is referenced, not copied. Mutable data (e.g. a
+        reused `bytearray`) is copied, as it may change before the members are accessed.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw data bytes.
+        offset : int, optional
+            The offset, into the list of data bytes, where the packet data begins, by default 0
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than `size` bytes of data from the offset.
+        """
+        view = memoryview(data)[offset : offset + self.size]
+        if len(view) < self.size:
+            raise ValueError(f"Packet {self.id} requires {self.size} bytes of data, not {len(view)}")
+        self.data = view if view.readonly else memoryview(bytes(view))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyPacket):
+            return type(self) == type(other) and self.data == other.data
+        if isinstance(other, self.group):
+            return self.materialize() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({bytes(self.data)!r})"
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> "LazyPacket":
+        return cls(data, offset)
+
+    def materialize(self) -> Packet:
+        """Decodes all member packets.
+
+        Returns
+        -------
+        Packet
+            The corresponding (eager) group packet.
+        """
+        return self.group(*[getattr(self, field.name) for field in fields(self.group)])
+
+
+def _lazy(group: Type[Packet]) -> Callable[[Type[LazyPacket]], Type[LazyPacket]]:
+    """Returns a decorator preparing a lazy group packet type for the specified group packet type.
+
+    The decorator sets the `group`, `id`, `size` and `members` of the lazy group packet type and adds a `_LazyMember`
+    descriptor for each member packet.
+
+    Parameters
+    ----------
+    group : Type[Packet]
+        The group packet type.
+
+    Returns
+    -------
+    Callable[[Type[LazyPacket]], Type[LazyPacket]]
+        The decorator.
+    """
+
+    def decorate(cls: Type[LazyPacket]) -> Type[LazyPacket]:
+        cls.group = group
+        cls.id = group.id
+        cls.size = group.size
+        cls.members = group.members
+        offset = 0
+        for field in fields(group):
+            setattr(cls, field.name, _LazyMember(field.name, offset, field.type))
+            offset += field.type.size
+        return cls
+
+    return decorate
+
+
+@_lazy(Packet0)
+class LazyPacket0(LazyPacket):
+    """Lazy Roomba packet 0 (Group packet for packets 7 to 26)."""
+
+
+@_lazy(Packet6)
+class LazyPacket6(LazyPacket):
+    """Lazy Roomba packet 6 (Group packet for packets 7 to 42)."""
+
+
+@_lazy(Packet100)
+class LazyPacket100(LazyPacket):
+    """Lazy Roomba packet 100 (Group packet for packets 7 to 58)."""
+
+
+@_lazy(Packet101)
+class LazyPacket101(LazyPacket):
+    """Lazy Roomba packet 101 (Group packet for packets 43 to 58)."""
+
+
+LazyPacket.registry = {
+    0: LazyPacket0,
+    6: LazyPacket6,
+    100: LazyPacket100,
+    101: LazyPacket101,
+}
@@ -0,0 +1,446 @@
+"""
+iRobot Roomba session recording and replay.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+import mmap
+from enum import IntEnum, unique
+from struct import Struct
+from threading import Lock
+from time import monotonic, monotonic_ns, sleep
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional, Union
+
+from serial import Serial
+
+MAGIC = b"IRBT"
+"""The magic bytes at the start of a session log."""
+VERSION = 1
+"""The session log format version."""
+HEADER = Struct("<4sB3xI")
+"""The session log header: magic, version, and baud rate."""
+RECORD = Struct("<BQI")
+"""The record header: kind, timestamp (ns since the recording started), and payload length. The payload follows."""
+
+
+@unique
+class RecordKind(IntEnum):
+    """The kinds of session log records."""
+
+    WRITE = 1
+    """Data written to the Roomba."""
+    READ = 2
+    """Data read from the Roomba."""
+
+
+class Record(NamedTuple):
+    """A session log record."""
+
+    kind: RecordKind
+    """The record kind."""
+    timestamp: int
+    """The time, in nanoseconds since the recording started, the data was written or read."""
+    data: memoryview
+    """The data."""
+
+
+def read_header(buffer: bytes) -> int:
+    """Reads the header of a session log.
+
+    Parameters
+    ----------
+    buffer : bytes
+        The session log (e.g. a memory-mapped file).
+
+    Returns
+    -------
+    int
+        The recorded baud rate.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is not a session log of a supported version.
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("Not a session log")
+    magic, version, baudrate = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a session log")
+    if version != VERSION:
+        raise ValueError(f"Session log version {version} is unsupported")
+    return baudrate
+
+
+def iter_records(buffer: bytes) -> Iterator[Record]:
+    """Iterates over the records of a session log, without copying their data.
+
+    Parameters
+    ----------
+    buffer : bytes
+        The session log (e.g. a memory-mapped file).
+
+    Yields
+    ------
+    Record
+        The records, in the order they were recorded.
+
+    Raises
+    ------
+    ValueError
+        If the buffer is not a session log of a supported version, or if its last record is truncated.
+    """
+    read_header(buffer)
+    view = memoryview(buffer)
+    offset = HEADER.size
+    while offset < len(view):
+        if offset + RECORD.size > len(view):
+            raise ValueError(f"Truncated record at offset {offset}")
+        kind, timestamp, length = RECORD.unpack_from(view, offset)
+        offset += RECORD.size
+        if offset + length > len(view):
+            raise ValueError(f"Truncated record at offset {offset - RECORD.size}")
+        yield Record(RecordKind(kind), timestamp, view[offset : offset + length])
+        offset += length
+
+
+class Recorder:
+    """Wraps the serial connection of a `Roomba` and records everything written to and read from it to a session log.
+
+    The session log starts with a header (see `HEADER`) followed by one length-prefixed record (see `RECORD`) per write or
+    (non-empty) read, so it can be memory-mapped and scanned without parsing (see `iter_records()` and `Replay`).
+    """
+
+    def __init__(self, serial: Serial, log: Union[str, BinaryIO], clock: Callable[[], int] = monotonic_ns):
+        """Initializes a new `Recorder` instance.
+
+        Parameters
+        ----------
+        serial : Serial
+            The serial connection.
+        log : Union[str, BinaryIO]
+            The path of the session log, or a binary file to write it to.
+        clock : Callable[[], int], optional
+            The clock returning the current time in nanoseconds, by default `time.monotonic_ns`
+        """
+        self.serial = serial
+        self._owned = isinstance(log, str)
+        self._log: BinaryIO = open(log, "wb") if self._owned else log
+        self._clock = clock
+        self._start = clock()
+        self._lock = Lock()
+        self._log.write(HEADER.pack(MAGIC, VERSION, serial.baudrate))
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self.serial, name)
+
+    @property
+    def baudrate(self) -> int:
+        """The baud rate of the serial connection."""
+        return self.serial.baudrate
+
+    @baudrate.setter
+    def baudrate(self, baudrate: int):
+        self.serial.baudrate = baudrate
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """The read timeout of the serial connection."""
+        return self.serial.timeout
+
+    @timeout.setter
+    def timeout(self, timeout: Optional[float]):
+        self.serial.timeout = timeout
+
+    def write(self, data: bytes) -> int:
+        """Writes the specified data to the serial connection and records it.
+
+        Parameters
+        ----------
+        data : bytes
+            The data.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+        """
+        count = self.serial.write(data)
+        self._record(RecordKind.WRITE, data)
+        return count
+
+    def read(self, size: int = 1) -> bytes:
+        """Reads data from the serial connection and records it.
+
+        Parameters
+        ----------
+        size : int, optional
+            The number of bytes, by default 1
+
+        Returns
+        -------
+        bytes
+            The data.
+        """
+        data = self.serial.read(size)
+        if len(data) > 0:
+            self._record(RecordKind.READ, data)
+        return data
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Reads data from the serial connection into a buffer and records it.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer (or a writable `memoryview`).
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        count = self.serial.readinto(buffer) or 0
+        if count > 0:
+            self._record(RecordKind.READ, memoryview(buffer)[:count])
+        return count
+
+    def close(self):
+        """Closes the session log (if opened by the recorder) and the serial connection."""
+        with self._lock:
+            if self._owned:
+                self._log.close()
+            else:
+                self._log.flush()
+        self.serial.close()
+
+    def _record(self, kind: RecordKind, data: bytes):
+        """Appends a record to the session log.
+
+        Parameters
+        ----------
+        kind : RecordKind
+            The record kind.
+        data : bytes
+            The data.
+        """
+        with self._lock:
+            self._log.write(RECORD.pack(kind, self._clock() - self._start, len(data)))
+            self._log.write(data)
+
+
+class Replay:
+    """A serial connection replaying a session log recorded with `Recorder` to a `Roomba`.
+
+    Reads return the recorded reads, in order, either as fast as possible or no sooner than they were recorded, relative to
+    the first read or write. Writes are checked against the recorded writes, unless told otherwise.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        realtime: bool = False,
+        strict: bool = True,
+        clock: Callable[[], float] = monotonic,
+        sleeper: Callable[[float], None] = sleep,
+    ):
+        """Initializes a new `Replay` instance.
+
+        Parameters
+        ----------
+        path : str
+            The path of the session log.
+        realtime : bool, optional
+            Whether to replay reads at the recorded speed rather than as fast as possible, by default False
+        strict : bool, optional
+            Whether writes must match the recorded writes, by default True
+        clock : Callable[[], float], optional
+            The clock returning the current time in seconds, by default `time.monotonic`
+        sleeper : Callable[[float], None], optional
+            The function sleeping for a number of seconds, by default `time.sleep`
+        """
+        self.realtime = realtime
+        self.strict = strict
+        self.timeout: Optional[float] = None
+        self._clock = clock
+        self._sleeper = sleeper
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.baudrate = read_header(self._mmap)
+        records = list(iter_records(self._mmap))
+        self._reads = [record for record in records if record.kind == RecordKind.READ]
+        self._writes = [record for record in records if record.kind == RecordKind.WRITE]
+        self._origin = records[0].timestamp if len(records) > 0 else 0
+        self._start: Optional[float] = None
+        self._next_read = 0
+        self._next_write = 0
+        self._pending = bytearray()
+
+    def __enter__(self) -> "Replay":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def finished(self) -> bool:
+        """Whether all recorded reads have been returned."""
+        return self._next_read == len(self._reads) and len(self._pending) == 0
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of recorded bytes that may be read now."""
+        self._begin()
+        waiting = len(self._pending)
+        for record in self._reads[self._next_read :]:
+            if self.realtime and not self._due(record):
+                break
+            waiting += len(record.data)
+        return waiting
+
+    def write(self, data: bytes) -> int:
+        """Checks the specified data against the next recorded write.
+
+        Parameters
+        ----------
+        data : bytes
+            The data.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+
+        Raises
+        ------
+        ValueError
+            If replaying strictly, and the data does not match the next recorded write.
+        """
+        self._begin()
+        if self._next_write < len(self._writes):
+            expected = self._writes[self._next_write].data
+            self._next_write += 1
+            if self.strict and expected != data:
+                raise ValueError(f"Write {bytes(data).hex()} does not match recorded write {bytes(expected).hex()}")
+        elif self.strict:
+            raise ValueError(f"Write {bytes(data).hex()} exceeds the recording")
+        return len(data)
+
+    def flush(self):
+        """Does nothing, as there is nothing to flush."""
+        pass
+
+    def read(self, size: int = 1) -> bytes:
+        """Returns the next recorded bytes, waiting for them to be due if replaying in realtime.
+
+        Parameters
+        ----------
+        size : int, optional
+            The number of bytes, by default 1
+
+        Returns
+        -------
+        bytes
+            The bytes. Shorter than `size` once the recording is exhausted.
+        """
+        self._fill(size)
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Copies the next recorded bytes into a buffer, waiting for them to be due if replaying in realtime.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer (or a writable `memoryview`).
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        view = memoryview(buffer)
+        self._fill(len(view))
+        count = min(len(view), len(self._pending))
+        with memoryview(self._pending) as pending:
+            view[:count] = pending[:count]
+        del self._pending[:count]
+        return count
+
+    def _fill(self, size: int):
+        """Appends the next recorded reads to the pending bytes until there are at least `size` of them, waiting for
+        them to be due if replaying in realtime.
+
+        Parameters
+        ----------
+        size : int
+            The number of bytes.
+        """
+        self._begin()
+        while len(self._pending) < size and self._next_read < len(self._reads):
+            record = self._reads[self._next_read]
+            if self.realtime:
+                delay = self._start + (record.timestamp - self._origin) / 1e9 - self._clock()
+                if delay > 0:
+                    self._sleeper(delay)
+            self._pending += record.data
+            self._next_read += 1
+
+    def reset_input_buffer(self):
+        """Discards the recorded bytes that are due."""
+        self.read(self.in_waiting)
+
+    def close(self):
+        """Closes the session log."""
+        self._reads.clear()
+        self._writes.clear()
+        self._mmap.close()
+
+    def _begin(self):
+        """Starts the replay clock on the first read or write."""
+        if self._start is None:
+            self._start = self._clock()
+
+    def _due(self, record: Record) -> bool:
+        """Returns whether the specified record is due.
+
+        Parameters
+        ----------
+        record : Record
+            The record.
+
+        Returns
+        -------
+        bool
+            `True` if the record is due, `False` otherwise.
+        """
+        return self._start + (record.timestamp - self._origin) / 1e9 <= self._clock()
@@ -27,17 +27,18 @@ SOFTWARE.
 
 from datetime import datetime
 from enum import IntEnum, unique
+from functools import lru_cache
 from io import StringIO
 from logging import DEBUG, Logger
 from struct import pack
-from threading import Lock
-from time import sleep
-from typing import List, Tuple
+from threading import Lock, local
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-from serial import Serial
-
-from .packet import Packet
-from .util import hex_dump
+from .packet import LazyPacket, Packet
+from .metrics import Metrics
+from .transport import Transport
+from .util import Pacer, PriorityLock, Trace, hex_dump
 
 START_DURATION = 0.5
 """The delay after a `START` command."""
@@ -193,43 +194,407 @@ class Button(IntEnum):
     """The `CLOCK` button."""
 
 
+@unique
+class Priority(IntEnum):
+    """Transmit priorities (see `Roomba.priority()`)."""
+
+    NORMAL = 0
+    """All other commands and sensor queries."""
+    HIGH = 1
+    """Stop and mode change commands, which are sent ahead of all waiting commands of normal priority."""
+
+
+_baud_codes = {
+    300: BaudCode.B300,
+    600: BaudCode.B600,
+    1200: BaudCode.B1200,
+    2400: BaudCode.B2400,
+    4800: BaudCode.B4800,
+    9600: BaudCode.B9600,
+    14400: BaudCode.B14400,
+    19200: BaudCode.B19200,
+    28800: BaudCode.B28800,
+    38400: BaudCode.B38400,
+    57600: BaudCode.B57600,
+    115200: BaudCode.B115200,
+}
+
+
+def encode_start() -> bytes:
+    """Encodes the `START` command (see `Roomba.start()`)."""
+    return bytes([Command.START])
+
+
+def encode_baud(baud_code: BaudCode) -> bytes:
+    """Encodes the `BAUD` command (see `Roomba.set_baud()`)."""
+    return bytes([Command.BAUD, baud_code])
+
+
+def encode_baud_rate(baud_rate: int) -> bytes:
+    """Encodes the `BAUD` command (see `Roomba.set_baud_rate()`)."""
+    if baud_rate not in _baud_codes:
+        raise ValueError(f"Baud rate {baud_rate} is usnupported by Roomba")
+    return encode_baud(_baud_codes[baud_rate])
+
+
+def encode_control() -> bytes:
+    """Encodes the `CONTROL` command (see `Roomba.control()`)."""
+    return bytes([Command.CONTROL])
+
+
+def encode_safe() -> bytes:
+    """Encodes the `SAFE` command (see `Roomba.safe()`)."""
+    return bytes([Command.SAFE])
+
+
+def encode_full() -> bytes:
+    """Encodes the `FULL` command (see `Roomba.full()`)."""
+    return bytes([Command.FULL])
+
+
+def encode_power() -> bytes:
+    """Encodes the `POWER` command (see `Roomba.power()`)."""
+    return bytes([Command.POWER])
+
+
+def encode_spot() -> bytes:
+    """Encodes the `SPOT` command (see `Roomba.spot()`)."""
+    return bytes([Command.SPOT])
+
+
+def encode_clean() -> bytes:
+    """Encodes the `CLEAN` command (see `Roomba.clean()`)."""
+    return bytes([Command.CLEAN])
+
+
+def encode_max() -> bytes:
+    """Encodes the `MAX` command (see `Roomba.max()`)."""
+    return bytes([Command.MAX])
+
+
+def encode_drive(velocity: int, radius: int) -> bytes:
+    """Encodes the `DRIVE` command (see `Roomba.drive()`)."""
+    if velocity < -500 or velocity > 500:
+        raise ValueError(f"Velocity {velocity} is unsupported by Roomba")
+    if radius < -2000 or radius > 2000:
+        raise ValueError(f"Radius {radius} is unsupported by Roomba")
+    return pack(">Bhh", Command.DRIVE, velocity, radius)
+
+
+def encode_motors(main_brush: Motor, side_brush: Motor, vacuum: Motor) -> bytes:
+    """Encodes the `MOTORS` command (see `Roomba.motors()`)."""
+    motor_bits = 0b00000000
+    if main_brush == Motor.OFF:
+        pass
+    elif main_brush == Motor.DEFAULT:
+        motor_bits |= 0b00000100
+    else:
+        motor_bits |= 0b00010100
+    if side_brush == Motor.OFF:
+        pass
+    elif side_brush == Motor.DEFAULT:
+        motor_bits |= 0b00000001
+    else:
+        motor_bits |= 0b00001001
+    if vacuum == Motor.OFF:
+        pass
+    elif vacuum == Motor.DEFAULT:
+        motor_bits |= 0b00000010
+    else:
+        raise ValueError("Vacuum can only run in the default direction")
+    return bytes([Command.MOTORS, motor_bits])
+
+
+def encode_leds(color: int, intensity: int, check_robot: bool, dock: bool, spot: bool, debris: bool) -> bytes:
+    """Encodes the `LEDS` command (see `Roomba.leds()`)."""
+    if color < 0 or color > 255:
+        raise ValueError(f"Color {color} is invalid")
+    if intensity < 0 or intensity > 255:
+        raise ValueError(f"Intensity {intensity} is invalid")
+    led_bits = 0b00000000
+    if check_robot is True:
+        led_bits |= 0b00001000
+    if dock is True:
+        led_bits |= 0b00000100
+    if spot is True:
+        led_bits |= 0b00000010
+    if debris is True:
+        led_bits |= 0b00000001
+    return bytes([Command.LEDS, led_bits, color, intensity])
+
+
+def encode_song(song: int, notes: List[Tuple[int, int]]) -> bytes:
+    """Encodes the `SONG` command (see `Roomba.song()`)."""
+    if song < 0 or song > 4:
+        raise ValueError(f"Song {song} is not supported by Roomba")
+    if len(notes) == 0 or len(notes) > 16:
+        raise ValueError(f"A song length of {len(notes)} notes is not supported by Roomba")
+    for i in range(len(notes)):
+        if notes[i][0] < 31 or notes[i][0] > 127:
+            raise ValueError(f"Note number {notes[i][0]} at position {i} is not supported by Roomba")
+        if notes[i][1] < 0 or notes[i][1] > 255:
+            raise ValueError(f"Note duration {notes[i][1]} at position {i} is not supported by Roomba")
+    a = [0] * (1 + 2 + 2 * len(notes))  # Command, song, number of notes, and two bytes per note
+    a[0] = Command.SONG
+    a[1] = song
+    a[2] = len(notes)
+    for i in range(len(notes)):
+        a[3 + 2 * i] = notes[i][0]
+        a[4 + 2 * i] = notes[i][1]
+    return bytes(a)
+
+
+def encode_play(song: int) -> bytes:
+    """Encodes the `PLAY` command (see `Roomba.play()`)."""
+    if song < 0 or song > 4:
+        raise ValueError(f"Song {song} is not supported by Roomba")
+    return bytes([Command.PLAY, song])
+
+
+def encode_sensors(id: int) -> bytes:
+    """Encodes the `SENSORS` command (see `Roomba.sensors()`)."""
+    if id not in Packet.registry:
+        raise ValueError(f"Packet {id} is unknown")
+    return bytes([Command.SENSORS, id])
+
+
+def encode_seek_dock() -> bytes:
+    """Encodes the `SEEK_DOCK` command (see `Roomba.seek_dock()`)."""
+    return bytes([Command.SEEK_DOCK])
+
+
+def encode_motors_pwm(main_brush_pwm: int, side_brush_pwm: int, vacuum_pwm: int) -> bytes:
+    """Encodes the `MOTORS_PWM` command (see `Roomba.motors_pwm()`)."""
+    if main_brush_pwm < -127 or main_brush_pwm > 127:
+        raise ValueError(f"Main brush PWM {main_brush_pwm} is invalid")
+    if side_brush_pwm < -127 or side_brush_pwm > 127:
+        raise ValueError(f"Side brush PWM {side_brush_pwm} is invalid")
+    if vacuum_pwm < 0 or vacuum_pwm > 127:
+        raise ValueError(f"Vacuum PWM {side_brush_pwm} is invalid")
+    return pack(">BbbB", Command.MOTORS_PWM, main_brush_pwm, side_brush_pwm, vacuum_pwm)
+
+
+def encode_drive_direct(left_velocity: int, right_velocity: int) -> bytes:
+    """Encodes the `DRIVE_DIRECT` command (see `Roomba.drive_direct()`)."""
+    if left_velocity < -500 or left_velocity > 500:
+        raise ValueError(f"Velocity {left_velocity} is unsupported by Roomba")
+    if right_velocity < -500 or right_velocity > 500:
+        raise ValueError(f"Velocity {right_velocity} is unsupported by Roomba")
+    return pack(">Bhh", Command.DRIVE_DIRECT, right_velocity, left_velocity)
+
+
+def encode_drive_pwm(left_pwm: int, right_pwm: int) -> bytes:
+    """Encodes the `DRIVE_PWM` command (see `Roomba.drive_pwm()`)."""
+    if left_pwm < -255 or left_pwm > 255:
+        raise ValueError(f"PWM {left_pwm} is unsupported by Roomba")
+    if right_pwm < -255 or right_pwm > 255:
+        raise ValueError(f"PWM {right_pwm} is unsupported by Roomba")
+    return pack(">Bhh", Command.DRIVE_PWM, right_pwm, left_pwm)
+
+
+def encode_stream(ids: List[int], baudrate: int) -> Tuple[bytes, int]:
+    """Encodes the `STREAM` command (see `Roomba.stream()`).
+
+    Returns
+    -------
+    Tuple[bytes, int]
+        The command and the raw size of each frame that will be streamed from the Roomba.
+    """
+    if len(ids) > 255:
+        raise ValueError("Cannot request more than 255 packets")
+    max_size = (baudrate / 10) * (15 / 1000)  # 10 bits per byte; packets sent every 15 ms
+    size = 0
+    for id in ids:
+        if id not in Packet.registry:
+            raise ValueError(f"Packet id {id} is unknown")
+        cls: Packet = Packet.registry[id]
+        size += cls.size
+    if size > max_size:
+        raise ValueError(f"Too much data requested({size} - at {baudrate} baud max size is {max_size}")
+    a = [0] * (1 + 1 + len(ids))  # Command, number of packets, and 1 byte per packet id
+    a[0] = Command.STREAM
+    a[1] = len(ids)
+    for i in range(len(ids)):
+        a[2 + i] = ids[i]
+    data = bytes(a)
+    return data, 1 + 1 + len(ids) + size + 1  # Header, size, packet ids, size of packet data, and checksum
+
+
+class QueryPlan:
+    """A precompiled `QUERY_LIST` request for a fixed list of packet ids.
+
+    The plan validates the ids once and caches the request bytes, the size of the response, and the decoder and offset of
+    each packet in the response, so repeatedly querying the same packets only sends the request and decodes the response.
+    """
+
+    def __init__(self, ids: Iterable[int]):
+        """Initializes a new `QueryPlan` instance.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            The packet ids.
+
+        Raises
+        ------
+        ValueError
+            If `ids` is invalid.
+        """
+        self.ids = tuple(ids)
+        if len(self.ids) > 255:
+            raise ValueError("Cannot request more than 255 packets")
+        decoders = []
+        size = 0
+        for id in self.ids:
+            cls = Packet.registry.get(id)
+            if cls is None:
+                raise ValueError(f"Packet id {id} is unknown")
+            decoders.append((cls.from_bytes, size))
+            size += cls.size
+        self.request = bytes([Command.QUERY_LIST, len(self.ids), *self.ids])
+        """The raw bytes of the `QUERY_LIST` command."""
+        self.size = size
+        """The raw size of the response from the Roomba."""
+        self.decoders: Tuple[Tuple[Callable[[bytes, int], Packet], int], ...] = tuple(decoders)
+        """The function decoding each packet and the offset of its data in the response."""
+
+    def decode(self, data: bytes) -> List[Packet]:
+        """Decodes the response to the request.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw response.
+
+        Returns
+        -------
+        List[Packet]
+            The packets, in the order of the ids.
+        """
+        return [from_bytes(data, offset) for from_bytes, offset in self.decoders]
+
+
+@lru_cache(maxsize=64)
+def query_plan(ids: Tuple[int, ...]) -> QueryPlan:
+    """Returns the (cached) `QueryPlan` for the specified packet ids.
+
+    Parameters
+    ----------
+    ids : Tuple[int, ...]
+        The packet ids.
+
+    Returns
+    -------
+    QueryPlan
+        The query plan.
+
+    Raises
+    ------
+    ValueError
+        If `ids` is invalid.
+    """
+    return QueryPlan(ids)
+
+
+def encode_pause_resume_stream(start: bool) -> bytes:
+    """Encodes the `PAUSE_RESUME_STREAM` command (see `Roomba.pause_resume_stream()`)."""
+    return bytes([Command.PAUSE_RESUME_STREAM, int(start)])
+
+
+def encode_digit_leds_ascii(digits: str) -> bytes:
+    """Encodes the `DIGIT_LEDS_ASCII` command (see `Roomba.digit_leds_ascii()`)."""
+    if len(digits) != 4:
+        raise ValueError(f"Digits '{digits}' not valid - must be 4 characters")
+    for c in digits:
+        value = ord(c)
+        if value < 32 or value > 126:
+            raise ValueError(f"Digit {value} not valid - must be 32 to 126")
+    return bytes([Command.DIGIT_LEDS_ASCII]) + bytes(digits, "ASCII")
+
+
+def encode_buttons(buttons: List[Button]) -> bytes:
+    """Encodes the `BUTTONS` command (see `Roomba.buttons()`)."""
+    button_bits = 0b00000000
+    for button in buttons:
+        button_bits |= 1 << button
+    return bytes([Command.BUTTONS, button_bits])
+
+
+def encode_day_time(week_day: WeekDay, hour: int, minute: int) -> bytes:
+    """Encodes the `SET_DAY_TIME` command (see `Roomba.set_day_time()`)."""
+    if hour < 0 or hour > 23:
+        raise ValueError(f"Hour {hour} is invalid")
+    if minute < 0 or minute > 59:
+        raise ValueError(f"Minute {minute} is invalid")
+    return bytes([Command.SET_DAY_TIME, int(week_day), hour, minute])
+
+
 class Roomba:
     """Roomba API for communicating with a physical Roomba vacuum cleaner through a serial connection."""
 
-    _baud_codes = {
-        300: BaudCode.B300,
-        600: BaudCode.B600,
-        1200: BaudCode.B1200,
-        2400: BaudCode.B2400,
-        4800: BaudCode.B4800,
-        9600: BaudCode.B9600,
-        14400: BaudCode.B14400,
-        19200: BaudCode.B19200,
-        28800: BaudCode.B28800,
-        38400: BaudCode.B38400,
-        57600: BaudCode.B57600,
-        115200: BaudCode.B115200,
+    _command_durations = {
+        Command.START: START_DURATION,  # The beep from the Roomba actually takes time...
+        Command.BAUD: MODE_CHANGE_DURATION,
+        Command.CONTROL: MODE_CHANGE_DURATION,
+        Command.SAFE: MODE_CHANGE_DURATION,
+        Command.FULL: MODE_CHANGE_DURATION,
+        Command.POWER: MODE_CHANGE_DURATION,
     }
-
-    def __init__(self, serial: Serial, logger: Logger = None):
+    _motion_slots = {
+        Command.DRIVE: Command.DRIVE,
+        Command.DRIVE_DIRECT: Command.DRIVE,
+        Command.DRIVE_PWM: Command.DRIVE,
+        Command.MOTORS_PWM: Command.MOTORS_PWM,
+    }
+    """The output slot of each coalesced motion command. The drive commands all set the wheels, so they share a slot."""
+    _mode_changes = frozenset([Command.START, Command.CONTROL, Command.SAFE, Command.FULL, Command.POWER])
+    """The mode change commands, which are sent with high priority."""
+    _stop_arguments = {
+        Command.DRIVE: slice(1, 3),  # Velocity (the radius is irrelevant)
+        Command.MOTORS: slice(1, 2),
+        Command.MOTORS_PWM: slice(1, 4),
+        Command.DRIVE_DIRECT: slice(1, 5),
+        Command.DRIVE_PWM: slice(1, 5),
+    }
+    """The arguments that are all zero when a motion command stops the Roomba, and is sent with high priority."""
+
+    def __init__(
+        self,
+        serial: Transport,
+        logger: Logger = None,
+        coalesce: bool = False,
+        trace: Optional[Trace] = None,
+        metrics: Optional[Metrics] = None,
+    ):
         """Initializes a new `Roomba` instance.
 
         Parameters
         ----------
-        serial : Serial
-            The serial connection.
+        serial : Transport
+            The connection to the Roomba (e.g. a pyserial `Serial` or a `SocketTransport`).
         logger : Logger, optional
             The logger, by default None
+        coalesce : bool, optional
+            Whether to coalesce motion commands (see `Roomba.write_motion()`), by default False
+        trace : Optional[Trace], optional
+            The trace recording all data sent and received, by default None
+        metrics : Optional[Metrics], optional
+            The metrics counting commands, bytes, lock waits and read latencies, by default None
         """
         self.serial = serial
         self.logger = logger
-        self._lock = Lock()
+        self.trace = trace
+        self.metrics = metrics
+        self.coalesce = coalesce
+        self._lock = PriorityLock()
+        self._pacer = Pacer()
+        self._pending_lock = Lock()
+        self._pending_motion: Dict[int, bytes] = {}
+        self._buffers = local()
 
     def start(self):
         """Start the Open Interface (OI)."""
-        data = bytes([Command.START])
-        self.write(data)
-        sleep(START_DURATION)  # The beep from the Roomba actually takes time...
+        self.write(encode_start())
 
     def set_baud_rate(self, baud_rate: int):
         """Sets the baud rate.
@@ -244,9 +609,7 @@ class Roomba:
         ValueError
             If the baud rate is invalid.
         """
-        if baud_rate not in Roomba._baud_codes:
-            raise ValueError(f"Baud rate {baud_rate} is usnupported by Roomba")
-        self.set_baud(Roomba._baud_codes[baud_rate])
+        self.write(encode_baud_rate(baud_rate))
 
     def set_baud(self, baud_code: BaudCode):
         """Sets the baud rate.
@@ -256,21 +619,15 @@ class Roomba:
         baud_code : BaudCode
             The baud code.
         """
-        data = bytes([Command.BAUD, baud_code])
-        self.write(data)
-        sleep(MODE_CHANGE_DURATION)
+        self.write(encode_baud(baud_code))
 
     def control(self):
         """Enables control."""
-        data = bytes([Command.CONTROL])
-        self.write(data)
-        sleep(MODE_CHANGE_DURATION)
+        self.write(encode_control())
 
     def safe(self):
         """Puts the OI in safe mode."""
-        data = bytes([Command.SAFE])
-        self.write(data)
-        sleep(MODE_CHANGE_DURATION)
+        self.write(encode_safe())
 
     def full(self):
         """Puts the OI in full mode.
@@ -278,30 +635,23 @@ class Roomba:
         The OI can be in Passive, Safe, or Full mode to accept this command. In Full mode, Roomba executes any command that you send it, even if the internal
         charger is plugged in, or command triggers a cliff or wheel drop condition.
         """
-        data = bytes([Command.FULL])
-        self.write(data)
-        sleep(MODE_CHANGE_DURATION)
+        self.write(encode_full())
 
     def power(self):
         """Powers down the Roomba."""
-        data = bytes([Command.POWER])
-        self.write(data)
-        sleep(MODE_CHANGE_DURATION)
+        self.write(encode_power())
 
     def spot(self):
         """Starts the Spot cleaning mode."""
-        data = bytes([Command.SPOT])
-        self.write(data)
+        self.write(encode_spot())
 
     def clean(self):
         """Starts the default cleaning mode."""
-        data = bytes([Command.CLEAN])
-        self.write(data)
+        self.write(encode_clean())
 
     def max(self):
         """Starts the Max cleaning mode."""
-        data = bytes([Command.MAX])
-        self.write(data)
+        self.write(encode_max())
 
     def drive(self, velocity: int, radius: int):
         """Instructs the Roomba to drive at the specified velocity (mm/s), turning at the specified radius (mm).
@@ -321,12 +671,7 @@ class Roomba:
         ValueError
             If the `velocity` or the `radius` is invalid.
         """
-        if velocity < -500 or velocity > 500:
-            raise ValueError(f"Velocity {velocity} is unsupported by Roomba")
-        if radius < -2000 or radius > 2000:
-            raise ValueError(f"Radius {radius} is unsupported by Roomba")
-        data = pack(">Bhh", Command.DRIVE, velocity, radius)
-        self.write(data)
+        self.write_motion(encode_drive(velocity, radius))
 
     def motors(self, main_brush: Motor, side_brush: Motor, vacuum: Motor):
         """Instructs the Roomba to turn its motors on and off.
@@ -345,27 +690,7 @@ class Roomba:
         ValueError
             If `vacuum` is set to `Motor.OPPOSITE`.
         """
-        motor_bits = 0b00000000
-        if main_brush == Motor.OFF:
-            pass
-        elif main_brush == Motor.DEFAULT:
-            motor_bits |= 0b00000100
-        else:
-            motor_bits |= 0b00010100
-        if side_brush == Motor.OFF:
-            pass
-        elif side_brush == Motor.DEFAULT:
-            motor_bits |= 0b00000001
-        else:
-            motor_bits |= 0b00001001
-        if vacuum == Motor.OFF:
-            pass
-        elif vacuum == Motor.DEFAULT:
-            motor_bits |= 0b00000010
-        else:
-            raise ValueError("Vacuum can only run in the default direction")
-        data = bytes([Command.MOTORS, motor_bits])
-        self.write(data)
+        self.write(encode_motors(main_brush, side_brush, vacuum))
 
     def leds(self, color: int, intensity: int, check_robot: bool, dock: bool, spot: bool, debris: bool):
         """Instructs the Roomba to turn its LEDs on and off.
@@ -390,21 +715,7 @@ class Roomba:
         ValueError
             If `color` or `intensity` is invalid.
         """
-        if color < 0 or color > 255:
-            raise ValueError(f"Color {color} is invalid")
-        if intensity < 0 or intensity > 255:
-            raise ValueError(f"Intensity {intensity} is invalid")
-        led_bits = 0b00000000
-        if check_robot is True:
-            led_bits |= 0b00001000
-        if dock is True:
-            led_bits |= 0b00000100
-        if spot is True:
-            led_bits |= 0b00000010
-        if debris is True:
-            led_bits |= 0b00000001
-        data = bytes([Command.LEDS, led_bits, color, intensity])
-        self.write(data)
+        self.write(encode_leds(color, intensity, check_robot, dock, spot, debris))
 
     def song(self, song: int, notes: List[Tuple[int, int]]):
         """Defines a song the Roomba can play.
@@ -421,24 +732,7 @@ class Roomba:
         ValueError
             If `song` or `notes` is invalid.
         """
-        if song < 0 or song > 4:
-            raise ValueError(f"Song {song} is not supported by Roomba")
-        if len(notes) == 0 or len(notes) > 16:
-            raise ValueError(f"A song length of {len(notes)} notes is not supported by Roomba")
-        for i in range(len(notes)):
-            if notes[i][0] < 31 or notes[i][0] > 127:
-                raise ValueError(f"Note number {notes[i][0]} at position {i} is not supported by Roomba")
-            if notes[i][1] < 0 or notes[i][1] > 255:
-                raise ValueError(f"Note duration {notes[i][1]} at position {i} is not supported by Roomba")
-        a = [0] * (1 + 2 + 2 * len(notes))  # Command, song, number of notes, and two bytes per note
-        a[0] = Command.SONG
-        a[1] = song
-        a[2] = len(notes)
-        for i in range(len(notes)):
-            a[3 + 2 * i] = notes[i][0]
-            a[4 + 2 * i] = notes[i][1]
-        data = bytes(a)
-        self.write(data)
+        self.write(encode_song(song, notes))
 
     def play(self, song: int):
         """Instructs the Roomba to play the specified song.
@@ -453,18 +747,21 @@ class Roomba:
         ValueError
             If `song` is invalid.
         """
-        if song < 0 or song > 4:
-            raise ValueError(f"Song {song} is not supported by Roomba")
-        data = bytes([Command.PLAY, song])
-        self.write(data)
+        self.write(encode_play(song))
 
-    def sensors(self, id: int) -> Packet:
+    def sensors(self, id: int, lazy: bool = False, buffer: Optional[Union[bytearray, memoryview]] = None) -> Packet:
         """Requests the sensors with the specified id to be queried.
 
         Parameters
         ----------
         id : int
             The id of the sensors to be queried.
+        lazy : bool, optional
+            Whether to return a `LazyPacket`, decoding member packets on access, for group packets that have one, by
+            default False
+        buffer : Optional[Union[bytearray, memoryview]], optional
+            The buffer receiving the raw response (at least as large as the packet), by default None (a buffer pooled
+            per thread)
 
         Returns
         -------
@@ -476,17 +773,15 @@ class Roomba:
         ValueError
             If `id` does not not a known `Packet` type.
         """
-        if id not in Packet.registry:
-            raise ValueError(f"Packet {id} is unknown")
-        cls = Packet.registry[id]
-        data = bytes([Command.SENSORS, id])
-        data = self.write_and_read(data, size=cls.size)
-        return cls.from_bytes(data)
+        data = encode_sensors(id)
+        cls = LazyPacket.registry[id] if lazy and id in LazyPacket.registry else Packet.registry[id]
+        view = self._response_buffer(cls.size, buffer)
+        count = self.write_and_readinto(data, view)
+        return cls.from_bytes(view[:count])
 
     def seek_dock(self) -> None:
         """Instructs the Roomba to seek its dock."""
-        data = bytes([Command.SEEK_DOCK])
-        self.write(data)
+        self.write(encode_seek_dock())
 
     def motors_pwm(self, main_brush_pwm: int, side_brush_pwm: int, vacuum_pwm: int):
         """Instructs the Roomba to turn its motors on and off, using the specified, raw Pulse Width Modulation (PWM) values.
@@ -505,14 +800,7 @@ class Roomba:
         ValueError
             If `main_brush_pwm`, `side_brush_pwm` or `vacuum_pwm` is invalid.
         """
-        if main_brush_pwm < -127 or main_brush_pwm > 127:
-            raise ValueError(f"Main brush PWM {main_brush_pwm} is invalid")
-        if side_brush_pwm < -127 or side_brush_pwm > 127:
-            raise ValueError(f"Side brush PWM {side_brush_pwm} is invalid")
-        if vacuum_pwm < 0 or vacuum_pwm > 127:
-            raise ValueError(f"Vacuum PWM {side_brush_pwm} is invalid")
-        data = pack(">BbbB", Command.MOTORS_PWM, main_brush_pwm, side_brush_pwm, vacuum_pwm)
-        self.write(data)
+        self.write_motion(encode_motors_pwm(main_brush_pwm, side_brush_pwm, vacuum_pwm))
 
     def drive_direct(self, left_velocity: int, right_velocity: int):
         """Instruct the Roomba to drive at the specified left and right velocities.
@@ -535,12 +823,7 @@ class Roomba:
         as the second, rightmost argument. When sending the command to the Roomba, the right velocity is the first
         `short` and the left velocity is the second `short`.
         """
-        if left_velocity < -500 or left_velocity > 500:
-            raise ValueError(f"Velocity {left_velocity} is unsupported by Roomba")
-        if right_velocity < -500 or right_velocity > 500:
-            raise ValueError(f"Velocity {right_velocity} is unsupported by Roomba")
-        data = pack(">Bhh", Command.DRIVE_DIRECT, right_velocity, left_velocity)
-        self.write(data)
+        self.write_motion(encode_drive_direct(left_velocity, right_velocity))
 
     def drive_pwm(self, left_pwm: int, right_pwm: int):
         """Instructs the Roomba to drive using the specified, raw Pulse Width Modulation (PWM) values.
@@ -563,12 +846,7 @@ class Roomba:
         as the second, rightmost argument. When sending the command to the Roomba, the right PWM is the
         first `short` and the left PWM is the second `short`.
         """
-        if left_pwm < -255 or left_pwm > 255:
-            raise ValueError(f"PWM {left_pwm} is unsupported by Roomba")
-        if right_pwm < -255 or right_pwm > 255:
-            raise ValueError(f"PWM {right_pwm} is unsupported by Roomba")
-        data = pack(">Bhh", Command.DRIVE_PWM, right_pwm, left_pwm)
-        self.write(data)
+        self.write_motion(encode_drive_pwm(left_pwm, right_pwm))
 
     def stream(self, ids: List[int]) -> int:
         """Instructs the Roomba to stream sensor packets every 15 ms.
@@ -592,27 +870,13 @@ class Roomba:
         ValueError
             If `ids` is invalid or the total length exceeds what is possible.
         """
-        if len(ids) > 255:
-            raise ValueError("Cannot request more than 255 packets")
-        max_size = (self.serial.baudrate / 10) * (15 / 1000)  # 10 bits per byte; packets sent every 15 ms
-        size = 0
-        for id in ids:
-            if id not in Packet.registry:
-                raise ValueError(f"Packet id {id} is unknown")
-            cls: Packet = Packet.registry[id]
-            size += cls.size
-        if size > max_size:
-            raise ValueError(f"Too much data requested({size} - at {self.serial.baudrate} baud max size is {max_size}")
-        a = [0] * (1 + 1 + len(ids))  # Command, number of packets, and 1 byte per packet id
-        a[0] = Command.STREAM
-        a[1] = len(ids)
-        for i in range(len(ids)):
-            a[2 + i] = ids[i]
-        data = bytes(a)
+        data, size = encode_stream(ids, self.serial.baudrate)
         self.write(data)
-        return 1 + 1 + len(ids) + size + 1  # Header, size, packet ids, size of packet data, and checksum
+        return size
 
-    def query_list(self, ids: List[int]) -> List[Packet]:
+    def query_list(
+        self, ids: Union[List[int], QueryPlan], buffer: Optional[Union[bytearray, memoryview]] = None
+    ) -> List[Packet]:
         """Instructs the Roomba to send a list of sensor packets.
 
         Note
@@ -621,8 +885,11 @@ class Roomba:
 
         Parameters
         ----------
-        ids : List[int]
-            The list of ids.
+        ids : Union[List[int], QueryPlan]
+            The list of ids, or a `QueryPlan` for them. Plans for lists of ids are cached (see `query_plan()`).
+        buffer : Optional[Union[bytearray, memoryview]], optional
+            The buffer receiving the raw response (at least as large as the response), by default None (a buffer pooled
+            per thread)
 
         Returns
         -------
@@ -634,29 +901,10 @@ class Roomba:
         ValueError
             If `ids` is invalid.
         """
-        if len(ids) > 255:
-            raise ValueError("Cannot request more than 255 packets")
-        size = 0
-        for id in ids:
-            if id not in Packet.registry:
-                raise ValueError(f"Packet id {id} is unknown")
-            cls: Packet = Packet.registry[id]
-            size += cls.size
-        a = [0] * (1 + 1 + len(ids))  # Command, number of packets, and 1 byte per packet id
-        a[0] = Command.QUERY_LIST
-        a[1] = len(ids)
-        for i in range(len(ids)):
-            a[2 + i] = ids[i]
-        data = bytes(a)
-        data = self.write_and_read(data, size=size)
-        packets = []
-        offset = 0
-        for id in ids:
-            cls: Packet = Packet.registry[id]
-            packet = cls.from_bytes(data, offset=offset)
-            packets.append(packet)
-            offset += cls.size
-        return packets
+        plan = ids if isinstance(ids, QueryPlan) else query_plan(tuple(ids))
+        view = self._response_buffer(plan.size, buffer)
+        count = self.write_and_readinto(plan.request, view)
+        return plan.decode(view[:count])
 
     def pause_resume_stream(self, start: bool):
         """Instructs the Roomba to pause or resume the stream of packets requested with `Roomba.stream()`.
@@ -666,8 +914,7 @@ class Roomba:
         start : bool
             `True` to start streaming packets; `False` otherwise.
         """
-        data = bytes([Command.PAUSE_RESUME_STREAM, int(start)])
-        self.write(data)
+        self.write(encode_pause_resume_stream(start))
 
     def digit_leds_ascii(self, digits: str):
         """Instructs the Roomba to turn on the LEDs to display ASCII characters.
@@ -677,14 +924,7 @@ class Roomba:
         digits : str
             The four (4) digits.
         """
-        if len(digits) != 4:
-            raise ValueError(f"Digits '{digits}' not valid - must be 4 characters")
-        for c in digits:
-            value = ord(c)
-            if value < 32 or value > 126:
-                raise ValueError(f"Digit {value} not valid - must be 32 to 126")
-        data = bytes([Command.DIGIT_LEDS_ASCII]) + bytes(digits, "ASCII")
-        self.write(data)
+        self.write(encode_digit_leds_ascii(digits))
 
     def buttons(self, buttons: List[Button]):
         """Instructs the Roomba to "press" one or more of its buttons.
@@ -694,11 +934,7 @@ class Roomba:
         buttons : List[Button]
             The list of buttons to press.
         """
-        button_bits = 0b00000000
-        for button in buttons:
-            button_bits |= 1 << button
-        data = bytes([Command.BUTTONS, button_bits])
-        self.write(data)
+        self.write(encode_buttons(buttons))
 
     def button(self, button: Button):
         """Instructs the Roomba to "press" the specified button.
@@ -741,29 +977,102 @@ class Roomba:
         ValueError
             If `hour` or `minute` is invalid.
         """
-        if hour < 0 or hour > 23:
-            raise ValueError(f"Hour {hour} is invalid")
-        if minute < 0 or minute > 59:
-            raise ValueError(f"Minute {minute} is invalid")
-        data = bytes([Command.SET_DAY_TIME, int(week_day), hour, minute])
-        self.write(data)
+        self.write(encode_day_time(week_day, hour, minute))
+
+    @staticmethod
+    def duration(data: bytes) -> float:
+        """Returns the time the Roomba needs to process the specified command before it can accept the next one.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of the command, starting with the opcode.
+
+        Returns
+        -------
+        float
+            The duration, in seconds.
+        """
+        return Roomba._command_durations.get(data[0], COMMAND_PROCESS_DURATION)
+
+    @staticmethod
+    def priority(data: bytes) -> Priority:
+        """Returns the transmit priority of the specified command.
+
+        Mode change commands (`START`, `CONTROL`, `SAFE`, `FULL`, and `POWER`) and motion commands stopping the Roomba (e.g.
+        `drive_direct(0, 0)`) have high priority. All other commands have normal priority.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of the command, starting with the opcode.
+
+        Returns
+        -------
+        Priority
+            The priority.
+        """
+        opcode = data[0]
+        if opcode in Roomba._mode_changes:
+            return Priority.HIGH
+        arguments = Roomba._stop_arguments.get(opcode)
+        if arguments is not None and not any(data[arguments]):
+            return Priority.HIGH
+        return Priority.NORMAL
 
     def write(self, data: bytes):
         """Writes the specified data to the Roomba via the serial port.
 
+        The Roomba needs time to process a command before it can accept the next one (see `Roomba.duration()`). Rather than
+        sleeping after every command, `write` only waits if the previous command was sent too recently.
+
+        Commands are sent in order of priority (see `Roomba.priority()`), so a high priority command waits for at most the
+        command (or query) in progress and other high priority commands, never for waiting commands of normal priority.
+        Its worst-case latency is therefore bounded by the processing time of the command in progress (at most
+        `START_DURATION`), or the serial timeout of a query in progress, plus that of any other waiting high priority
+        commands.
+
         Parameters
         ----------
         data : bytes
             The raw bytes of data to send to the Roomba.
         """
         self._dump_data("Writing data:", data)
-        self._lock.acquire()
+        self._acquire(Roomba.priority(data))
         try:
-            self.serial.write(data)
-            self.serial.flush()
+            self._send(data)
+        finally:
+            self._lock.release()
+
+    def write_motion(self, data: bytes):
+        """Writes the specified motion command (`DRIVE`, `DRIVE_DIRECT`, `DRIVE_PWM`, or `MOTORS_PWM`) to the Roomba.
+
+        Unless the Roomba coalesces motion commands, this is the same as `write`. If it does, the command replaces any
+        pending command for the same output slot, and only the newest pending command is sent once the Roomba can accept
+        the next command. Callers whose command was superseded while they waited return without sending anything.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of the motion command.
+        """
+        if not self.coalesce:
+            self.write(data)
+            return
+        slot = Roomba._motion_slots[data[0]]
+        with self._pending_lock:
+            self._pending_motion[slot] = data
+        self._acquire(Roomba.priority(data))
+        try:
+            if slot not in self._pending_motion:
+                return  # Already sent by another caller
+            pacing = self._pacer.wait()
+            with self._pending_lock:
+                data = self._pending_motion.pop(slot)
+            self._dump_data("Writing data:", data)
+            self._send(data, pacing)
         finally:
             self._lock.release()
-        sleep(COMMAND_PROCESS_DURATION)
 
     def read(self, size: int = 1) -> bytes:
         """Reads data of the specified size from the Roomba via the serial port.
@@ -778,17 +1087,18 @@ class Roomba:
         bytes
             The requested data.
         """
-        self._lock.acquire()
+        self._acquire()
         try:
-            data = self.serial.read(size=size)
-            self._dump_data("Read data:", data)
-            return data
+            return self._receive(size)
         finally:
             self._lock.release()
 
     def write_and_read(self, data: bytes, size: int = 1) -> bytes:
         """Writes the specified data to the Roomba and reads data of the specified size from the Roomba via the serial port.
 
+        The lock is held from the write until the response is read, and the response is returned as soon as `size` bytes
+        have arrived (or the serial port times out).
+
         Parameters
         ----------
         data : bytes
@@ -801,33 +1111,186 @@ class Roomba:
         bytes
             The requested data.
         """
-        self._lock.acquire()
+        self._acquire(Roomba.priority(data))
         try:
             self._dump_data("Writing data:", data)
-            self.serial.write(data)
-            self.serial.flush()
-            sleep(COMMAND_PROCESS_DURATION)
-            data = self.serial.read(size=size)
-            self._dump_data("Read data:", data)
-            return data
+            self._send(data)
+            return self._receive(size)
         finally:
             self._lock.release()
 
+    def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Reads data from the Roomba via the serial port into a buffer, filling it unless the serial port times out.
+
+        Parameters
+        ----------
+        buffer : Union[bytearray, memoryview]
+            The buffer.
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        self._acquire()
+        try:
+            return self._receive_into(memoryview(buffer))
+        finally:
+            self._lock.release()
+
+    def write_and_readinto(self, data: bytes, buffer: Union[bytearray, memoryview]) -> int:
+        """Writes the specified data to the Roomba and reads data from the Roomba via the serial port into a buffer.
+
+        Works like `Roomba.write_and_read()`, but the response is read into the buffer rather than returned as new
+        `bytes`. Whether reading allocates nothing at all depends on the transport: `SocketTransport`,
+        `LoopbackTransport` and `Replay` copy straight into the buffer, but pyserial's `Serial.readinto()` reads a
+        `bytes` object and copies it.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        buffer : Union[bytearray, memoryview]
+            The buffer, as large as the expected response.
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        self._acquire(Roomba.priority(data))
+        try:
+            self._dump_data("Writing data:", data)
+            self._send(data)
+            return self._receive_into(memoryview(buffer))
+        finally:
+            self._lock.release()
+
+    def _response_buffer(self, size: int, buffer: Optional[Union[bytearray, memoryview]] = None) -> memoryview:
+        """Returns a view of the specified size of a buffer receiving a response.
+
+        Parameters
+        ----------
+        size : int
+            The size of the response (in number of bytes).
+        buffer : Optional[Union[bytearray, memoryview]], optional
+            The buffer supplied by the caller, by default None (the buffer pooled for the calling thread, grown as
+            needed)
+
+        Returns
+        -------
+        memoryview
+            The view.
+
+        Raises
+        ------
+        ValueError
+            If the buffer supplied by the caller is too small.
+        """
+        if buffer is not None:
+            view = memoryview(buffer)
+            if len(view) < size:
+                raise ValueError(f"Buffer of {len(view)} bytes cannot hold a response of {size} bytes")
+            return view[:size]
+        pooled = getattr(self._buffers, "pooled", None)
+        if pooled is None or len(pooled) < size:
+            pooled = self._buffers.pooled = memoryview(bytearray(max(size, 2 * len(pooled or b""), 64)))
+        return pooled[:size]
+
+    def _acquire(self, priority: Priority = Priority.NORMAL):
+        """Acquires the lock, recording the time spent waiting for it in the metrics (if any).
+
+        Parameters
+        ----------
+        priority : Priority, optional
+            The priority, by default `Priority.NORMAL`
+        """
+        if self.metrics is None:
+            self._lock.acquire(priority)
+            return
+        start = perf_counter()
+        self._lock.acquire(priority)
+        self.metrics.locked(perf_counter() - start)
+
+    def _send(self, data: bytes, pacing: float = 0.0):
+        """Sends the specified data to the Roomba, once the Roomba can accept it. The caller must hold the lock.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of data to send to the Roomba.
+        pacing : float, optional
+            The time, in seconds, already spent waiting for the Roomba to be ready, by default 0.0
+        """
+        pacing += self._pacer.wait()
+        self.serial.write(data)
+        self.serial.flush()
+        self._pacer.mark(Roomba.duration(data))
+        if self.metrics is not None:
+            self.metrics.sent(data, pacing)
+
+    def _receive(self, size: int) -> bytes:
+        """Reads data of the specified size from the Roomba, recording its latency in the metrics (if any). The caller must
+        hold the lock.
+
+        Parameters
+        ----------
+        size : int
+            The size of the data to read (in number of bytes).
+
+        Returns
+        -------
+        bytes
+            The data.
+        """
+        if self.metrics is None:
+            data = self.serial.read(size=size)
+        else:
+            start = perf_counter()
+            data = self.serial.read(size=size)
+            self.metrics.received(len(data), perf_counter() - start)
+        self._dump_data("Read data:", data)
+        return data
+
+    def _receive_into(self, view: memoryview) -> int:
+        """Reads data from the Roomba into a buffer, recording its latency in the metrics (if any). The caller must hold
+        the lock.
+
+        Parameters
+        ----------
+        view : memoryview
+            The buffer.
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        if self.metrics is None:
+            count = self.serial.readinto(view) or 0
+        else:
+            start = perf_counter()
+            count = self.serial.readinto(view) or 0
+            self.metrics.received(count, perf_counter() - start)
+        self._dump_data("Read data:", view[:count])
+        return count
+
     def _dump_data(self, message: str, data: bytes) -> None:
-        """Dumps data being sent or received.
+        """Dumps data being sent or received to the trace and, if debugging, the logger.
 
         Parameters
         ----------
         message : str
-            The message to output before the hex dump.
+            The message to output before the hex dump (or to record in the trace).
         data : bytes
             The data.
         """
+        if self.trace is not None:
+            self.trace.record(message, data)
         if self.logger is None or not self.logger.isEnabledFor(DEBUG):
             return
         io = StringIO()
+        io.write(message)
+        io.write("\n")
         hex_dump(data, io)
-        self.logger.debug(message)
-        for line in io.getvalue().split("\n"):
-            if len(line) > 0:
-                self.logger.debug(line)
+        self.logger.debug(io.getvalue().rstrip("\n"))
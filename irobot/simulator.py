@@ -0,0 +1,586 @@
+"""
+iRobot Roomba simulator.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+import os
+import pty
+import tty
+from math import cos, degrees, sin
+from select import select
+from struct import Struct, unpack_from
+from threading import Condition, Event, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .odometry import COUNTS_PER_MM, WHEEL_BASE
+from .packet import ChargingState, Mode, Packet
+from .roomba import Command, _baud_codes
+from .stream import STREAM_HEADER
+
+STREAM_PERIOD = 15 / 1000
+"""The time between two stream frames."""
+
+_baud_rates = {code: rate for rate, code in _baud_codes.items()}
+
+
+class SimulatedRoomba:
+    """A simulated Roomba that implements the OI behind the subset of the pyserial `Serial` interface `Roomba` uses.
+
+    The simulator keeps the OI mode, the wheel velocities, the encoder counts, the distance and angle travelled, the battery
+    state, songs, and the requested stream. Time advances according to the clock (`time.monotonic` by default) whenever
+    the simulator is written to or read from, and streamed frames are produced every 15 ms of that time.
+
+    Pass it to `Roomba` (or `StreamReader`) instead of a `Serial`, or expose it on a pseudo-terminal with `PtyBridge`.
+    """
+
+    _argument_sizes: Dict[int, int] = {
+        Command.START: 0,
+        Command.BAUD: 1,
+        Command.CONTROL: 0,
+        Command.SAFE: 0,
+        Command.FULL: 0,
+        Command.POWER: 0,
+        Command.SPOT: 0,
+        Command.CLEAN: 0,
+        Command.MAX: 0,
+        Command.DRIVE: 4,
+        Command.MOTORS: 1,
+        Command.LEDS: 3,
+        Command.SONG: 2,
+        Command.PLAY: 1,
+        Command.SENSORS: 1,
+        Command.SEEK_DOCK: 0,
+        Command.MOTORS_PWM: 3,
+        Command.DRIVE_DIRECT: 4,
+        Command.DRIVE_PWM: 4,
+        Command.STREAM: 1,
+        Command.QUERY_LIST: 1,
+        Command.PAUSE_RESUME_STREAM: 1,
+        Command.SCHEDULING_LEDS: 2,
+        Command.DIGIT_LEDS_RAW: 4,
+        Command.DIGIT_LEDS_ASCII: 4,
+        Command.BUTTONS: 1,
+        Command.SCHEDULE: 15,
+        Command.SET_DAY_TIME: 3,
+    }
+    """The number of argument bytes following each opcode."""
+    _counted_arguments: Dict[int, Tuple[int, int]] = {
+        Command.SONG: (2, 2),
+        Command.STREAM: (1, 1),
+        Command.QUERY_LIST: (1, 1),
+    }
+    """The index of the count byte, and the bytes per counted item, of the variable length commands."""
+
+    def __init__(self, baudrate: int = 115200, timeout: Optional[float] = 1.0, clock: Callable[[], float] = monotonic):
+        """Initializes a new `SimulatedRoomba` instance.
+
+        Parameters
+        ----------
+        baudrate : int, optional
+            The baud rate, by default 115200
+        timeout : Optional[float], optional
+            The read timeout, in seconds, as for `Serial`, by default 1.0
+        clock : Callable[[], float], optional
+            The clock returning the current time in seconds, by default `time.monotonic`
+        """
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.clock = clock
+        self.mode = Mode.OFF
+        self.left_velocity = 0
+        self.right_velocity = 0
+        self.requested_velocity = 0
+        self.requested_radius = 0
+        self.requested_left_velocity = 0
+        self.requested_right_velocity = 0
+        self.left_encoder = 0.0
+        self.right_encoder = 0.0
+        self.distance = 0.0
+        self.angle = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self.battery_capacity = 2696
+        self.battery_charge = 2696.0
+        self.voltage = 16000
+        self.temperature = 25
+        self.charging_state = ChargingState.NOT_CHARGING
+        self.buttons = 0
+        self.songs: Dict[int, List[int]] = {}
+        self.song_playing = False
+        self.song_number = 0
+        self._song_end = 0.0
+        self.stream_ids: List[int] = []
+        self.streaming = False
+        self.commands: List[bytes] = []
+        self._input = bytearray()
+        self._output = bytearray()
+        self._condition = Condition()
+        self._now = clock()
+        self._next_frame = self._now
+        self._values: Dict[int, Callable[[], int]] = {
+            7: lambda: 0,
+            8: lambda: 0,
+            9: lambda: 0,
+            10: lambda: 0,
+            11: lambda: 0,
+            12: lambda: 0,
+            13: lambda: 0,
+            14: lambda: 0,
+            15: lambda: 0,
+            16: lambda: 0,
+            17: lambda: 0,
+            18: lambda: self.buttons,
+            19: lambda: self._take_distance(),
+            20: lambda: self._take_angle(),
+            21: lambda: self.charging_state,
+            22: lambda: self.voltage,
+            23: lambda: self.current,
+            24: lambda: self.temperature,
+            25: lambda: int(self.battery_charge),
+            26: lambda: self.battery_capacity,
+            27: lambda: 0,
+            28: lambda: 0,
+            29: lambda: 0,
+            30: lambda: 0,
+            31: lambda: 0,
+            32: lambda: 0,
+            33: lambda: 0,
+            34: lambda: 0,
+            35: lambda: self.mode,
+            36: lambda: self.song_number,
+            37: lambda: int(self.song_playing),
+            38: lambda: len(self.stream_ids),
+            39: lambda: self.requested_velocity,
+            40: lambda: self.requested_radius,
+            41: lambda: self.requested_right_velocity,
+            42: lambda: self.requested_left_velocity,
+            43: lambda: int(self.right_encoder) & 0xFFFF,
+            44: lambda: int(self.left_encoder) & 0xFFFF,
+            45: lambda: 0,
+            46: lambda: 0,
+            47: lambda: 0,
+            48: lambda: 0,
+            49: lambda: 0,
+            50: lambda: 0,
+            51: lambda: 0,
+            52: lambda: 0,
+            53: lambda: 0,
+            54: lambda: self._motor_current(self.left_velocity),
+            55: lambda: self._motor_current(self.right_velocity),
+            56: lambda: 0,
+            57: lambda: 0,
+            58: lambda: int(self.left_velocity != 0 or self.right_velocity != 0),
+        }
+        self._structs = {id: Struct(">" + cls.format) for id, cls in Packet.registry.items() if len(cls.members) == 0}
+
+    @property
+    def current(self) -> int:
+        """The battery current (mA), negative when discharging."""
+        return -150 - self._motor_current(self.left_velocity) - self._motor_current(self.right_velocity)
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of bytes waiting to be read."""
+        with self._condition:
+            self._advance()
+            return len(self._output)
+
+    def write(self, data: bytes) -> int:
+        """Receives and executes the commands in the specified data.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes of one or more commands. Incomplete commands are completed by the next write.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+        """
+        with self._condition:
+            self._advance()
+            self._input += data
+            self._execute()
+            self._condition.notify_all()
+        return len(data)
+
+    def flush(self):
+        """Does nothing, as written data is processed immediately."""
+        pass
+
+    def read(self, size: int = 1) -> bytes:
+        """Reads up to `size` bytes of responses and streamed frames, waiting for them as `Serial.read` does.
+
+        Parameters
+        ----------
+        size : int, optional
+            The number of bytes, by default 1
+
+        Returns
+        -------
+        bytes
+            The bytes. Shorter than `size` if the timeout expires first.
+        """
+        with self._condition:
+            deadline = None if self.timeout is None else self.clock() + self.timeout
+            while True:
+                self._advance()
+                if len(self._output) >= size:
+                    break
+                now = self.clock()
+                length = len(self._output)
+                wait = None if deadline is None else deadline - now
+                if wait is not None and wait <= 0:
+                    break
+                if self.streaming:
+                    until_frame = max(self._next_frame - self._now, 0.0)
+                    wait = until_frame if wait is None else min(wait, until_frame)
+                self._condition.wait(wait)
+                if wait is not None and self.clock() == now and len(self._output) == length:
+                    break  # The injected clock is not advancing, so waiting again changes nothing
+            data = bytes(self._output[:size])
+            del self._output[:size]
+            return data
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Reads up to `len(buffer)` bytes of responses and streamed frames into a buffer, waiting as `read` does.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            The buffer (or a writable `memoryview`).
+
+        Returns
+        -------
+        int
+            The number of bytes read.
+        """
+        data = self.read(len(buffer))
+        memoryview(buffer)[: len(data)] = data
+        return len(data)
+
+    def reset_input_buffer(self):
+        """Discards the responses and frames waiting to be read."""
+        with self._condition:
+            self._output.clear()
+
+    def close(self):
+        """Does nothing, as there is no port to close."""
+        pass
+
+    def encode(self, id: int) -> bytes:
+        """Encodes the current value of the specified packet, as the Roomba sends it.
+
+        Reading packets 19 (distance) and 20 (angle) resets them, as it does on the Roomba.
+
+        Parameters
+        ----------
+        id : int
+            The packet id.
+
+        Returns
+        -------
+        bytes
+            The raw packet data.
+        """
+        cls = Packet.registry[id]
+        if len(cls.members) > 0:
+            return b"".join(self.encode(member.id) for member in cls.members)
+        return self._structs[id].pack(self._values[id]())
+
+    def _advance(self):
+        """Advances the simulation to the current time, moving the Roomba and producing streamed frames."""
+        now = self.clock()
+        while self.streaming and self._next_frame <= now:
+            self._move(self._next_frame - self._now)
+            self._now = self._next_frame
+            self.song_playing = self.song_playing and self._now < self._song_end
+            self._output += self._frame()
+            self._next_frame += STREAM_PERIOD
+        self._move(now - self._now)
+        self._now = now
+        self.song_playing = self.song_playing and now < self._song_end
+        if not self.streaming:
+            self._next_frame = now
+
+    def _move(self, dt: float):
+        """Moves the Roomba according to its wheel velocities and drains its battery.
+
+        Parameters
+        ----------
+        dt : float
+            The elapsed time, in seconds.
+        """
+        if dt <= 0:
+            return
+        left = self.left_velocity * dt
+        right = self.right_velocity * dt
+        self.left_encoder = (self.left_encoder + left * COUNTS_PER_MM) % 65536
+        self.right_encoder = (self.right_encoder + right * COUNTS_PER_MM) % 65536
+        distance = (left + right) / 2
+        angle = (right - left) / WHEEL_BASE
+        self.x += distance * cos(self.heading + angle / 2)
+        self.y += distance * sin(self.heading + angle / 2)
+        self.heading += angle
+        self.distance += distance
+        self.angle += degrees(angle)
+        self.battery_charge = max(self.battery_charge + self.current * dt / 3600, 0.0)
+
+    def _frame(self) -> bytes:
+        """Encodes a stream frame of the requested packets.
+
+        Returns
+        -------
+        bytes
+            The frame.
+        """
+        frame = bytearray([STREAM_HEADER, 0])
+        for id in self.stream_ids:
+            frame.append(id)
+            frame += self.encode(id)
+        frame[1] = len(frame) - 2
+        frame.append(-sum(frame) & 0xFF)
+        return bytes(frame)
+
+    def _execute(self):
+        """Executes the complete commands received so far."""
+        while len(self._input) > 0:
+            opcode = self._input[0]
+            if opcode not in SimulatedRoomba._argument_sizes:
+                del self._input[0]  # The OI ignores what it does not understand
+                continue
+            size = 1 + SimulatedRoomba._argument_sizes[opcode]
+            if opcode in SimulatedRoomba._counted_arguments:
+                index, width = SimulatedRoomba._counted_arguments[opcode]
+                if len(self._input) <= index:
+                    return
+                size += width * self._input[index]
+            if len(self._input) < size:
+                return
+            command = bytes(self._input[:size])
+            del self._input[:size]
+            self.commands.append(command)
+            self._command(command)
+
+    def _command(self, command: bytes):
+        """Executes a single command.
+
+        Parameters
+        ----------
+        command : bytes
+            The command, starting with the opcode.
+        """
+        opcode = command[0]
+        if opcode == Command.START:
+            self.mode = Mode.PASSIVE
+            return
+        if self.mode == Mode.OFF:
+            return
+        if opcode == Command.BAUD:
+            if command[1] in _baud_rates:
+                self.baudrate = _baud_rates[command[1]]
+        elif opcode in (Command.CONTROL, Command.SAFE):
+            self.mode = Mode.SAFE
+        elif opcode == Command.FULL:
+            self.mode = Mode.FULL
+        elif opcode in (Command.POWER, Command.SPOT, Command.CLEAN, Command.MAX, Command.SEEK_DOCK):
+            self.mode = Mode.PASSIVE
+            self._drive(0, 0)
+            self.requested_left_velocity = 0
+            self.requested_right_velocity = 0
+        elif opcode == Command.SONG:
+            self.songs[command[1]] = list(command[3:])
+        elif opcode == Command.PLAY:
+            if command[1] in self.songs:
+                self.song_number = command[1]
+                self.song_playing = True
+                self._song_end = self._now + sum(self.songs[command[1]][1::2]) / 64  # Durations in 1/64 s
+        elif opcode == Command.SENSORS:
+            if command[1] in Packet.registry:
+                self._output += self.encode(command[1])
+        elif opcode == Command.QUERY_LIST:
+            for id in command[2:]:
+                if id in Packet.registry:
+                    self._output += self.encode(id)
+        elif opcode == Command.STREAM:
+            self.stream_ids = [id for id in command[2:] if id in Packet.registry]
+            self.streaming = True
+            self._next_frame = self._now
+        elif opcode == Command.PAUSE_RESUME_STREAM:
+            self.streaming = command[1] != 0 and len(self.stream_ids) > 0
+            self._next_frame = self._now
+        elif opcode == Command.BUTTONS:
+            self.buttons = command[1]
+        elif self.mode not in (Mode.SAFE, Mode.FULL):
+            pass  # The remaining commands require safe or full mode
+        elif opcode == Command.DRIVE:
+            velocity, radius = unpack_from(">hh", command, 1)
+            self.requested_velocity = velocity
+            self.requested_radius = radius
+            if radius in (-32768, 32767):
+                self._drive(velocity, velocity)
+            elif radius == -1:
+                self._drive(velocity, -velocity)
+            elif radius == 1:
+                self._drive(-velocity, velocity)
+            else:
+                self._drive(
+                    round(velocity * (radius - WHEEL_BASE / 2) / radius),
+                    round(velocity * (radius + WHEEL_BASE / 2) / radius),
+                )
+            self.requested_left_velocity = self.left_velocity
+            self.requested_right_velocity = self.right_velocity
+        elif opcode == Command.DRIVE_DIRECT:
+            right, left = unpack_from(">hh", command, 1)
+            self.requested_left_velocity = left
+            self.requested_right_velocity = right
+            self._drive(left, right)
+        elif opcode == Command.DRIVE_PWM:
+            right, left = unpack_from(">hh", command, 1)
+            self._drive(round(left * 500 / 255), round(right * 500 / 255))
+
+    def _drive(self, left_velocity: int, right_velocity: int):
+        """Sets the wheel velocities.
+
+        Parameters
+        ----------
+        left_velocity : int
+            The left velocity (mm/s).
+        right_velocity : int
+            The right velocity (mm/s).
+        """
+        self.left_velocity = max(min(left_velocity, 500), -500)
+        self.right_velocity = max(min(right_velocity, 500), -500)
+
+    def _take_distance(self) -> int:
+        """Returns the distance travelled (mm) since it was last read and resets it.
+
+        Returns
+        -------
+        int
+            The distance.
+        """
+        distance = max(min(int(self.distance), 32767), -32768)
+        self.distance -= distance
+        return distance
+
+    def _take_angle(self) -> int:
+        """Returns the angle turned (degrees) since it was last read and resets it.
+
+        Returns
+        -------
+        int
+            The angle.
+        """
+        angle = max(min(int(self.angle), 32767), -32768)
+        self.angle -= angle
+        return angle
+
+    @staticmethod
+    def _motor_current(velocity: int) -> int:
+        """Returns the simulated current drawn by a wheel motor.
+
+        Parameters
+        ----------
+        velocity : int
+            The wheel velocity (mm/s).
+
+        Returns
+        -------
+        int
+            The current (mA).
+        """
+        return abs(velocity) // 2
+
+
+class PtyBridge:
+    """Exposes a `SimulatedRoomba` on a pseudo-terminal, so it can be opened by port name like a real Roomba.
+
+    A background thread copies commands written to the port into the simulator and the simulator's responses and
+    streamed frames back out.
+    """
+
+    def __init__(self, roomba: SimulatedRoomba, poll_interval: float = 0.002):
+        """Initializes a new `PtyBridge` instance.
+
+        Parameters
+        ----------
+        roomba : SimulatedRoomba
+            The simulated Roomba.
+        poll_interval : float, optional
+            The maximum time, in seconds, between checks for simulator output, by default 0.002
+        """
+        self.roomba = roomba
+        self.poll_interval = poll_interval
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+        self._closed = False
+
+    def __enter__(self) -> "PtyBridge":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def port(self) -> str:
+        """The name of the pseudo-terminal to open, e.g. with `serial.Serial(bridge.port)`."""
+        return os.ttyname(self._slave)
+
+    def start(self):
+        """Starts copying data between the pseudo-terminal and the simulator."""
+        if self._thread is not None:
+            raise ValueError("Bridge already started")
+        if self._closed:
+            raise ValueError("Bridge closed")
+        self._thread = Thread(target=self._run, name="PtyBridge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops copying data and closes the pseudo-terminal. Does nothing if already stopped."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if not self._closed:
+            self._closed = True
+            os.close(self._master)
+            os.close(self._slave)
+
+    def _run(self):
+        """Copies data between the pseudo-terminal and the simulator until stopped."""
+        while not self._stopped.is_set():
+            readable, _, _ = select([self._master], [], [], self.poll_interval)
+            if readable:
+                self.roomba.write(os.read(self._master, 1024))
+            waiting = self.roomba.in_waiting
+            if waiting > 0:
+                os.write(self._master, self.roomba.read(waiting))
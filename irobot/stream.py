@@ -0,0 +1,322 @@
+"""
+iRobot stream decoding.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from dataclasses import dataclass, replace
+from threading import Event, Thread
+from time import monotonic
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .packet import Packet
+from .roomba import Roomba
+
+STREAM_HEADER = 19
+"""The header byte that starts every frame streamed by the Roomba."""
+MAX_FRAME_SIZE = 2 + 255 + 1
+"""The maximum size of a frame: the header, the size, up to 255 bytes of packet ids and data, and the checksum."""
+
+
+@dataclass
+class StreamStatistics:
+    """Link quality statistics for a stream of frames."""
+
+    frames: int = 0
+    """The number of valid frames decoded."""
+    resyncs: int = 0
+    """The number of times bytes had to be skipped to find the next valid frame."""
+    checksum_failures: int = 0
+    """The number of complete frames with an invalid checksum."""
+    malformed_frames: int = 0
+    """The number of complete frames with a valid checksum, but unknown packet ids or packet sizes that do not add up."""
+    skipped_bytes: int = 0
+    """The number of bytes that were not part of any valid frame."""
+
+
+class StreamDecoder:
+    """Decodes the frames streamed by the Roomba after a `Roomba.stream()` command.
+
+    A frame consists of the header byte (19), the number of bytes `n` that follow (excluding the checksum), `n` bytes of
+    packet ids and packet data, and a checksum. The low byte of the sum of all the bytes of a frame, including the checksum,
+    is zero.
+    """
+
+    def __init__(self):
+        """Initializes a new `StreamDecoder` instance."""
+        self._buffer = bytearray()
+        self._statistics = StreamStatistics()
+        self._resyncing = False
+
+    @property
+    def statistics(self) -> "StreamStatistics":
+        """A copy of the decoder's link quality statistics."""
+        return replace(self._statistics)
+
+    def feed(self, data: bytes) -> Iterator[List[Packet]]:
+        """Feeds a chunk of raw bytes, as read from the serial port, to the decoder.
+
+        The chunk does not have to be aligned with the frame boundaries. Incomplete frames are buffered until the rest of
+        their bytes are fed to the decoder.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw bytes.
+
+        Returns
+        -------
+        Iterator[List[Packet]]
+            An iterator over the complete frames decoded so far. Each frame is the list of packets it contains.
+        """
+        self._buffer += data
+        return self._frames()
+
+    def _frames(self) -> Iterator[List[Packet]]:
+        """Yields the complete frames in the buffer, discarding their bytes as it goes.
+
+        Returns
+        -------
+        Iterator[List[Packet]]
+            An iterator over the decoded frames.
+        """
+        while True:
+            packets = self._next_frame()
+            if packets is None:
+                return
+            yield packets
+
+    def _next_frame(self) -> Optional[List[Packet]]:
+        """Decodes the next complete and valid frame in the buffer.
+
+        Bytes that cannot be part of a valid frame are skipped. If the frame at the front of the buffer is incomplete,
+        the decoder waits for the rest of it, even if a valid frame seems to follow, as that may be part of the payload
+        of the front frame. A corrupted length byte therefore delays the decoder by at most `MAX_FRAME_SIZE` bytes, after
+        which the checksum of the front frame fails and the frames following its header are decoded.
+
+        Returns
+        -------
+        Optional[List[Packet]]
+            The packets of the frame or `None` if the buffer does not hold a complete frame.
+        """
+        buffer = self._buffer
+        start = 0
+        while True:
+            start = buffer.find(STREAM_HEADER, start)
+            if start < 0:
+                self._skip(len(buffer))
+                return None
+            end, packets = self._frame_at(start)
+            if end is None:
+                self._skip(start)
+                return None
+            if packets is None:
+                start += 1  # Not a frame after all; look for the next header
+                continue
+            self._skip(start)
+            del buffer[: end - start]
+            if self._resyncing:
+                self._statistics.resyncs += 1
+                self._resyncing = False
+            self._statistics.frames += 1
+            return packets
+
+    def _frame_at(self, start: int) -> Tuple[Optional[int], Optional[List[Packet]]]:
+        """Decodes the frame starting at the specified offset into the buffer, counting checksum failures and malformed
+        frames.
+
+        Parameters
+        ----------
+        start : int
+            The offset of the header byte.
+
+        Returns
+        -------
+        Tuple[Optional[int], Optional[List[Packet]]]
+            The offset of the end of the frame (`None` if the frame is incomplete) and the packets (`None` if the frame is
+            incomplete or invalid).
+        """
+        buffer = self._buffer
+        if start + 2 > len(buffer):
+            return None, None
+        end = start + 2 + buffer[start + 1] + 1  # Header, size, packet ids and data, and checksum
+        if end > len(buffer):
+            return None, None
+        frame = bytes(buffer[start:end])
+        if sum(frame) & 0xFF != 0:
+            self._statistics.checksum_failures += 1
+            return end, None
+        packets = StreamDecoder._decode(frame)
+        if packets is None:
+            self._statistics.malformed_frames += 1
+        return end, packets
+
+    def _skip(self, count: int):
+        """Discards bytes from the front of the buffer.
+
+        Parameters
+        ----------
+        count : int
+            The number of bytes to discard.
+        """
+        if count == 0:
+            return
+        del self._buffer[:count]
+        self._statistics.skipped_bytes += count
+        self._resyncing = True
+
+    @staticmethod
+    def _decode(frame: bytes) -> Optional[List[Packet]]:
+        """Decodes the packet ids and packet data of a frame.
+
+        Parameters
+        ----------
+        frame : bytes
+            The frame, including the header, size, and checksum.
+
+        Returns
+        -------
+        Optional[List[Packet]]
+            The packets or `None` if the frame is empty, contains an unknown packet id or its size does not add up.
+        """
+        if frame[1] == 0:
+            return None  # The Roomba never streams empty frames
+        packets = []
+        offset = 2
+        end = len(frame) - 1
+        while offset < end:
+            cls = Packet.registry.get(frame[offset])
+            if cls is None:
+                return None
+            offset += 1
+            if offset + cls.size > end:
+                return None
+            packets.append(cls.from_bytes(frame, offset=offset))
+            offset += cls.size
+        return packets
+
+
+@dataclass(frozen=True)
+class StreamSnapshot:
+    """The most recent frame streamed by the Roomba."""
+
+    packets: Dict[int, Packet]
+    """The packets of the frame, keyed by packet id. Must not be modified."""
+    timestamp: float
+    """The `time.monotonic()` timestamp of when the frame was decoded."""
+    sequence: int
+    """The sequence number of the frame, starting at 1 for the first frame after `StreamReader.start()`."""
+
+
+class StreamReader:
+    """Continuously reads and decodes the frames streamed by the Roomba on a dedicated thread.
+
+    The most recent frame is published as an immutable `StreamSnapshot` by replacing a single reference, so reading
+    `StreamReader.latest` never blocks and never waits for the serial port.
+
+    Note
+    ----
+    1. While streaming the reader owns the receiving side of the serial port, so `Roomba.sensors()`, `Roomba.query_list()`,
+       and `Roomba.read()` must not be used until the reader is stopped. Commands can still be sent.
+    2. The serial port must have a read timeout, or `StreamReader.stop()` may block until the next byte arrives.
+    """
+
+    def __init__(self, roomba: Roomba, ids: List[int], chunk_size: int = 256):
+        """Initializes a new `StreamReader` instance.
+
+        Parameters
+        ----------
+        roomba : Roomba
+            The Roomba.
+        ids : List[int]
+            The list of packet ids to stream.
+        chunk_size : int, optional
+            The maximum number of bytes to read from the serial port at a time, by default 256
+        """
+        self.roomba = roomba
+        self.ids = list(ids)
+        self.chunk_size = chunk_size
+        self._decoder = StreamDecoder()
+        self._latest: Optional[StreamSnapshot] = None
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def latest(self) -> Optional[StreamSnapshot]:
+        """The most recent snapshot or `None` if no frame has been decoded yet."""
+        return self._latest
+
+    @property
+    def statistics(self) -> StreamStatistics:
+        """A copy of the link quality statistics of the stream."""
+        return self._decoder.statistics
+
+    @property
+    def running(self) -> bool:
+        """`True` if the reader thread is running; `False` otherwise."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Instructs the Roomba to start streaming and starts the reader thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the reader is already running.
+        """
+        if self._thread is not None:
+            raise RuntimeError("Stream reader is already running")
+        self._latest = None
+        self._stopped.clear()
+        self.roomba.stream(self.ids)
+        self._thread = Thread(target=self._run, name="StreamReader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Instructs the Roomba to stop streaming and waits for the reader thread to finish."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self.roomba.pause_resume_stream(False)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """Reads and decodes frames until the reader is stopped."""
+        serial = self.roomba.serial
+        sequence = 0
+        while not self._stopped.is_set():
+            data = serial.read(size=min(max(serial.in_waiting, 1), self.chunk_size))
+            if len(data) == 0:
+                continue
+            for packets in self._decoder.feed(data):
+                sequence += 1
+                self._latest = StreamSnapshot({packet.id: packet for packet in packets}, monotonic(), sequence)
+
+    def __enter__(self) -> "StreamReader":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
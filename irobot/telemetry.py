@@ -0,0 +1,213 @@
+"""
+iRobot telemetry.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from array import array
+from collections import Counter
+from dataclasses import fields
+from operator import attrgetter
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Union
+
+from .packet import Packet
+
+
+class Column(NamedTuple):
+    """A sensor field of a non-group packet, stored as a column of values."""
+
+    name: str
+    """The column name. The field name, suffixed with the packet id if several packets have a field with that name."""
+    packet: Type[Packet]
+    """The non-group packet type."""
+    field: str
+    """The field name."""
+    typecode: str
+    """The `array` type code of the values. Booleans and enums are stored as unsigned bytes."""
+
+
+def columns(ids: Iterable[int]) -> List[Column]:
+    """Returns the columns of the sensor fields of the specified packets.
+
+    Group packets contribute the fields of their member packets. Packets appearing more than once contribute their fields
+    once.
+
+    Parameters
+    ----------
+    ids : Iterable[int]
+        The packet ids.
+
+    Returns
+    -------
+    List[Column]
+        The columns, in packet and field order.
+
+    Raises
+    ------
+    ValueError
+        If `ids` contains an unknown packet id.
+    """
+    packets: List[Type[Packet]] = []
+    for id in ids:
+        if id not in Packet.registry:
+            raise ValueError(f"Packet id {id} is unknown")
+        cls = Packet.registry[id]
+        for packet in cls.members if len(cls.members) > 0 else (cls,):
+            if packet not in packets:
+                packets.append(packet)
+    names = Counter(field.name for packet in packets for field in fields(packet))
+    result = []
+    for packet in packets:
+        for field in fields(packet):
+            name = field.name if names[field.name] == 1 else f"{field.name}_{packet.id}"
+            typecode = "B" if field.type is bool else packet.format
+            result.append(Column(name, packet, field.name, typecode))
+    return result
+
+
+class TelemetryBuffer:
+    """Fixed-capacity ring buffer storing decoded frames column by column.
+
+    Each sensor field of the frames is stored in its own preallocated, typed `array`, so a frame takes up a few dozen bytes
+    rather than a few dozen packet instances. Once the buffer is full, appending a frame overwrites the oldest one.
+    """
+
+    def __init__(self, ids: List[int], capacity: int):
+        """Initializes a new `TelemetryBuffer` instance.
+
+        Parameters
+        ----------
+        ids : List[int]
+            The ids of the packets in the frames, e.g. the ids passed to `Roomba.stream()`.
+        capacity : int
+            The maximum number of frames to keep.
+
+        Raises
+        ------
+        ValueError
+            If `ids` contains an unknown packet id or `capacity` is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity {capacity} is invalid")
+        self.capacity = capacity
+        self.columns = columns(ids)
+        self._arrays: Dict[str, array] = {}
+        for column in self.columns:
+            self._arrays[column.name] = array(column.typecode, bytes(array(column.typecode).itemsize * capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._writers: Dict[int, List[Tuple[Callable[[Packet], int], array]]] = {}
+        for id in ids:
+            cls = Packet.registry[id]
+            writers = []
+            for column in self.columns:
+                if column.packet is cls:
+                    writers.append((attrgetter(column.field), self._arrays[column.name]))
+                elif column.packet in cls.members:
+                    writers.append((attrgetter(f"packet_{column.packet.id}.{column.field}"), self._arrays[column.name]))
+            self._writers[id] = writers
+        self._head = 0
+        self._count = 0
+
+    @property
+    def names(self) -> List[str]:
+        """The column names."""
+        return [column.name for column in self.columns]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, packets: Iterable[Packet], timestamp: Optional[float] = None):
+        """Appends a frame.
+
+        Parameters
+        ----------
+        packets : Iterable[Packet]
+            The packets of the frame, e.g. as decoded by `StreamDecoder`.
+        timestamp : Optional[float], optional
+            The timestamp of the frame, by default `time.monotonic()`
+        """
+        index = self._head
+        for packet in packets:
+            for getter, values in self._writers[packet.id]:
+                values[index] = getter(packet)
+        self._timestamps[index] = monotonic() if timestamp is None else timestamp
+        self._head = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        """Removes all frames."""
+        self._head = 0
+        self._count = 0
+
+    def column(self, name: str) -> Tuple[memoryview, ...]:
+        """Returns the values of the specified column, oldest first, without copying them.
+
+        Parameters
+        ----------
+        name : str
+            The column name or `timestamp` for the frame timestamps.
+
+        Returns
+        -------
+        Tuple[memoryview, ...]
+            One view of the values or, if the stored frames wrap around the end of the ring, two views whose concatenation
+            is the values.
+
+        Raises
+        ------
+        KeyError
+            If there is no column with the specified name.
+        """
+        values = memoryview(self._timestamps if name == "timestamp" else self._arrays[name])
+        start = (self._head - self._count) % self.capacity
+        if start + self._count <= self.capacity:
+            return (values[start : start + self._count],)
+        return (values[start:], values[: self._head])
+
+    def latest(self, name: str) -> Union[int, float]:
+        """Returns the most recent value of the specified column.
+
+        Parameters
+        ----------
+        name : str
+            The column name or `timestamp` for the frame timestamps.
+
+        Returns
+        -------
+        Union[int, float]
+            The value.
+
+        Raises
+        ------
+        IndexError
+            If the buffer is empty.
+        KeyError
+            If there is no column with the specified name.
+        """
+        if self._count == 0:
+            raise IndexError("Telemetry buffer is empty")
+        values = self._timestamps if name == "timestamp" else self._arrays[name]
+        return values[self._head - 1]
@@ -0,0 +1,330 @@
+"""
+iRobot Roomba transports.
+
+Copyright (c) 2022, 2023, 2024 Peter Hagelund
+
+License (MIT):
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+import socket
+from time import monotonic
+from typing import Optional, Protocol, runtime_checkable
+
+from serial import Serial
+
+DEFAULT_CHUNK_SIZE = 4096
+"""The number of bytes requested from the operating system per socket read."""
+
+
+@runtime_checkable
+class Transport(Protocol):
+    """The connection to a Roomba, as used by `Roomba`, `AsyncRoomba`, `StreamReader` and `Fleet`.
+
+    A pyserial `Serial` is a transport, as are `SerialTransport`, `SocketTransport` and `LoopbackTransport`. Reads
+    follow the semantics of `Serial.read()`: they block until the requested number of bytes has arrived or the
+    `timeout` expires (`None` waits forever and 0 does not wait at all).
+    """
+
+    baudrate: int
+    """The baud rate of the serial link to the Roomba (used to check the bandwidth of streams)."""
+    timeout: Optional[float]
+    """The read timeout, in seconds."""
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of bytes that can be read without waiting."""
+        ...  # pragma: no cover
+
+    def write(self, data: bytes) -> Optional[int]:
+        """Writes data to the Roomba."""
+        ...  # pragma: no cover
+
+    def flush(self):
+        """Waits until all written data has been sent."""
+        ...  # pragma: no cover
+
+    def read(self, size: int = 1) -> bytes:
+        """Reads up to `size` bytes from the Roomba."""
+        ...  # pragma: no cover
+
+    def readinto(self, buffer: bytearray) -> Optional[int]:
+        """Reads up to `len(buffer)` bytes from the Roomba into a buffer and returns the number of bytes read."""
+        ...  # pragma: no cover
+
+    def fileno(self) -> int:
+        """Returns the file descriptor to wait for (e.g. with `selectors` or `asyncio`) until data can be read."""
+        ...  # pragma: no cover
+
+    def close(self):
+        """Closes the connection."""
+        ...  # pragma: no cover
+
+
+class SerialTransport:
+    """A transport over a serial port."""
+
+    def __init__(self, port: str, baudrate: int = 115200, timeout: Optional[float] = 1.0):
+        """Initializes a new `SerialTransport` instance, opening the specified serial port.
+
+        Parameters
+        ----------
+        port : str
+            The serial port, e.g. `/dev/ttyUSB0`.
+        baudrate : int, optional
+            The baud rate, by default 115200
+        timeout : Optional[float], optional
+            The read timeout, in seconds, by default 1.0
+        """
+        self.serial = Serial(port, baudrate=baudrate, timeout=timeout)
+
+    def __enter__(self) -> "SerialTransport":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def baudrate(self) -> int:
+        """The baud rate."""
+        return self.serial.baudrate
+
+    @baudrate.setter
+    def baudrate(self, baudrate: int):
+        self.serial.baudrate = baudrate
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """The read timeout, in seconds."""
+        return self.serial.timeout
+
+    @timeout.setter
+    def timeout(self, timeout: Optional[float]):
+        self.serial.timeout = timeout
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of bytes that can be read without waiting."""
+        return self.serial.in_waiting
+
+    def write(self, data: bytes) -> Optional[int]:
+        return self.serial.write(data)
+
+    def flush(self):
+        self.serial.flush()
+
+    def read(self, size: int = 1) -> bytes:
+        return self.serial.read(size)
+
+    def readinto(self, buffer: bytearray) -> Optional[int]:
+        """Reads into the buffer. Note that pyserial reads a `bytes` object and copies it into the buffer."""
+        return self.serial.readinto(buffer)
+
+    def reset_input_buffer(self):
+        """Discards the data received, but not yet read."""
+        self.serial.reset_input_buffer()
+
+    def fileno(self) -> int:
+        return self.serial.fileno()
+
+    def close(self):
+        self.serial.close()
+
+
+class SocketTransport:
+    """A transport over a connected stream socket, e.g. to a serial-to-TCP bridge (such as ser2net) in raw mode.
+
+    Nagle's algorithm is disabled on TCP sockets, so each command is sent as soon as it is written, and the socket is
+    read in large chunks, so a whole response (or several stream frames) is received with a single system call. Bytes
+    received beyond those requested are kept for the next read. `readinto()` copies straight from that receive buffer,
+    so it allocates no `bytes` object.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        baudrate: int = 115200,
+        timeout: Optional[float] = 1.0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Initializes a new `SocketTransport` instance.
+
+        Parameters
+        ----------
+        sock : socket.socket
+            The connected socket.
+        baudrate : int, optional
+            The baud rate of the serial link between the bridge and the Roomba, by default 115200
+        timeout : Optional[float], optional
+            The read timeout, in seconds, by default 1.0
+        chunk_size : int, optional
+            The number of bytes requested from the operating system per read, by default `DEFAULT_CHUNK_SIZE`
+        """
+        self.socket = sock
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self._buffer = bytearray()
+        self._chunk = memoryview(bytearray(chunk_size))
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    @classmethod
+    def connect(
+        cls, host: str, port: int, baudrate: int = 115200, timeout: Optional[float] = 1.0, connect_timeout: float = 5.0
+    ) -> "SocketTransport":
+        """Connects to a serial-to-TCP bridge.
+
+        Parameters
+        ----------
+        host : str
+            The host name or address of the bridge.
+        port : int
+            The TCP port of the bridge.
+        baudrate : int, optional
+            The baud rate of the serial link between the bridge and the Roomba, by default 115200
+        timeout : Optional[float], optional
+            The read timeout, in seconds, by default 1.0
+        connect_timeout : float, optional
+            The maximum time, in seconds, to wait for the connection, by default 5.0
+
+        Returns
+        -------
+        SocketTransport
+            The transport.
+        """
+        return cls(socket.create_connection((host, port), timeout=connect_timeout), baudrate, timeout)
+
+    def __enter__(self) -> "SocketTransport":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def in_waiting(self) -> int:
+        """The number of bytes that can be read without waiting."""
+        self._receive(0.0)
+        return len(self._buffer)
+
+    def write(self, data: bytes) -> int:
+        self.socket.settimeout(None)
+        self.socket.sendall(data)
+        return len(data)
+
+    def flush(self):
+        pass  # Nagle's algorithm is disabled, so written data is already on its way
+
+    def read(self, size: int = 1) -> bytes:
+        self._fill(size)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readinto(self, buffer: bytearray) -> int:
+        view = memoryview(buffer)
+        size = len(view)
+        self._fill(size)
+        count = min(size, len(self._buffer))
+        with memoryview(self._buffer) as source:
+            view[:count] = source[:count]
+        del self._buffer[:count]
+        return count
+
+    def reset_input_buffer(self):
+        """Discards the data received, but not yet read."""
+        self._buffer.clear()
+        while self._receive(0.0):
+            self._buffer.clear()
+
+    def fileno(self) -> int:
+        return self.socket.fileno()
+
+    def close(self):
+        self.socket.close()
+
+    def _fill(self, size: int):
+        """Receives data until at least `size` bytes are buffered or the read timeout expires.
+
+        Parameters
+        ----------
+        size : int
+            The number of bytes.
+        """
+        deadline = None if self.timeout is None else monotonic() + self.timeout
+        while len(self._buffer) < size:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0.0)
+            if not self._receive(remaining) and remaining == 0.0:
+                break
+
+    def _receive(self, timeout: Optional[float]) -> bool:
+        """Receives a chunk of data into the buffer, waiting for it for at most the specified time.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The maximum time, in seconds, to wait (`None` waits forever and 0 does not wait at all).
+
+        Returns
+        -------
+        bool
+            `True` if data was received, `False` otherwise.
+
+        Raises
+        ------
+        ConnectionError
+            If the peer closed the connection.
+        """
+        self.socket.settimeout(timeout)
+        try:
+            count = self.socket.recv_into(self._chunk)
+        except (BlockingIOError, socket.timeout):
+            return False
+        if count == 0:
+            raise ConnectionError("Connection closed by peer")
+        self._buffer += self._chunk[:count]
+        return True
+
+
+class LoopbackTransport(SocketTransport):
+    """An in-memory transport, connected to a `peer` transport playing the part of the Roomba (e.g. in tests).
+
+    Both ends are backed by a local socket pair, so they have file descriptors and work with `selectors` and `asyncio`.
+    """
+
+    def __init__(self, baudrate: int = 115200, timeout: Optional[float] = 1.0):
+        """Initializes a new `LoopbackTransport` instance.
+
+        Parameters
+        ----------
+        baudrate : int, optional
+            The baud rate, by default 115200
+        timeout : Optional[float], optional
+            The read timeout, in seconds, by default 1.0
+        """
+        local, remote = socket.socketpair()
+        super().__init__(local, baudrate, timeout)
+        self.peer = SocketTransport(remote, baudrate, timeout)
+        """The other end of the loopback, receiving what is written to this end and vice versa."""
+
+    def close(self):
+        """Closes both ends."""
+        super().close()
+        self.peer.close()
@@ -25,32 +25,232 @@ SOFTWARE.
 """
 
 
-from typing import IO
+from collections import deque
+from heapq import heapify, heappop, heappush
+from io import StringIO
+from itertools import count
+from threading import Condition
+from time import monotonic, sleep
+from typing import IO, Callable, Deque, List, NamedTuple, Tuple
+
+
+_printable = bytes(c if 32 <= c <= 126 else ord(".") for c in range(256))
+"""Translation table replacing the unprintable bytes with `.`."""
 
 
 def hex_dump(data: bytes, io: IO) -> None:
     """Emits the contents of the specified `data` to the specified `io` as hex.
 
+    The dump is built a line of 16 bytes at a time, using `bytes.hex()` and `bytes.translate()`, and written in one call.
+
     :param data: the data bytes to emit.
     :param io: the IO instance to write to.
     """
-    offset = 0
-    while offset < len(data):
-        io.write(f"{offset:08x}  ")
-        for index in range(16):
-            if offset + index < len(data):
-                io.write(f"{data[offset + index]:02x} ")
-            else:
-                io.write("   ")
-            if index == 7 or index == 15:
-                io.write(" ")
-        io.write("|")
-        for index in range(16):
-            if offset + index < len(data):
-                c = data[offset + index]
-                if c < 32 or c > 126:
-                    io.write(".")
-                else:
-                    io.write(f"{c:c}")
-        io.write("|\n")
-        offset += 16
+    lines = []
+    for offset in range(0, len(data), 16):
+        chunk = bytes(data[offset : offset + 16])
+        left = chunk[:8].hex(" ")
+        right = chunk[8:].hex(" ")
+        text = chunk.translate(_printable).decode("ascii")
+        lines.append(f"{offset:08x}  {left:<23}  {right:<23}  |{text}|\n")
+    io.write("".join(lines))
+
+
+class TraceEntry(NamedTuple):
+    """A `Trace` entry."""
+
+    timestamp: float
+    """The time the data was sent or received."""
+    message: str
+    """The message describing the data, e.g. `Writing data:`."""
+    data: bytes
+    """The data."""
+
+
+class Trace:
+    """A ring buffer of the most recent data sent to and received from a Roomba.
+
+    Recording an entry only stores a timestamp and a copy of the data (which may be a view of a reused buffer), so
+    tracing is cheap enough to leave on at stream rates. The entries are only formatted when the trace is read (see
+    `Trace.format()`).
+    """
+
+    def __init__(self, capacity: int = 1024, clock: Callable[[], float] = monotonic):
+        """Initializes a new `Trace` instance.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            The maximum number of entries kept, by default 1024
+        clock : Callable[[], float], optional
+            The clock returning the current time in seconds, by default `time.monotonic`
+        """
+        self.clock = clock
+        self._entries: Deque[Tuple[float, str, bytes]] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, message: str, data: bytes):
+        """Records an entry, discarding the oldest entry if the trace is full.
+
+        Parameters
+        ----------
+        message : str
+            The message describing the data.
+        data : bytes
+            The data.
+        """
+        self._entries.append((self.clock(), message, bytes(data)))
+
+    def entries(self) -> List[TraceEntry]:
+        """Returns the entries, oldest first.
+
+        Returns
+        -------
+        List[TraceEntry]
+            The entries.
+        """
+        return [TraceEntry(*entry) for entry in list(self._entries)]
+
+    def clear(self):
+        """Discards all entries."""
+        self._entries.clear()
+
+    def format(self) -> str:
+        """Formats the entries, oldest first, as a timestamped message followed by a hex dump of the data.
+
+        Returns
+        -------
+        str
+            The formatted entries.
+        """
+        io = StringIO()
+        for timestamp, message, data in self.entries():
+            io.write(f"{timestamp:.6f} {message}\n")
+            hex_dump(data, io)
+        return io.getvalue()
+
+
+class Pacer:
+    """Enforces the minimum gap the Roomba needs between commands, using timestamps rather than fixed sleeps.
+
+    Each command marks the time from which the next command may be sent. Waiting for that time only sleeps for whatever
+    part of the gap has not already passed, so a caller that has been idle long enough never sleeps at all.
+    """
+
+    def __init__(self, clock: Callable[[], float] = monotonic, sleeper: Callable[[float], None] = sleep):
+        """Initializes a new `Pacer` instance.
+
+        Parameters
+        ----------
+        clock : Callable[[], float], optional
+            The clock returning the current time in seconds, by default `time.monotonic`
+        sleeper : Callable[[float], None], optional
+            The function sleeping for a number of seconds, by default `time.sleep`
+        """
+        self.clock = clock
+        self.sleeper = sleeper
+        self.ready = clock()  # The time from which the next command may be sent
+
+    def delay(self) -> float:
+        """Returns the time left before the next command may be sent.
+
+        Returns
+        -------
+        float
+            The time left, in seconds (0 if the next command may be sent now).
+        """
+        return max(self.ready - self.clock(), 0.0)
+
+    def wait(self) -> float:
+        """Waits until the next command may be sent.
+
+        Returns
+        -------
+        float
+            The time waited, in seconds.
+        """
+        delay = self.delay()
+        if delay > 0:
+            self.sleeper(delay)
+        return delay
+
+    def mark(self, gap: float):
+        """Marks a command as sent.
+
+        Parameters
+        ----------
+        gap : float
+            The time, in seconds, the Roomba needs to process the command before it can accept the next one.
+        """
+        self.ready = self.clock() + gap
+
+
+class PriorityLock:
+    """A lock granted to the waiter with the highest priority, and in arrival order among waiters of the same priority.
+
+    Unlike `threading.Lock`, which makes no promise about the order in which waiters acquire it, a waiter of higher
+    priority never waits for a waiter of lower priority that arrived earlier; it only waits for the current holder and
+    for waiters of the same or higher priority.
+    """
+
+    def __init__(self):
+        """Initializes a new `PriorityLock` instance."""
+        self._condition = Condition()
+        self._locked = False
+        self._waiters: List[Tuple[int, int]] = []  # A heap of (-priority, arrival)
+        self._arrivals = count()
+
+    def __enter__(self) -> "PriorityLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def locked(self) -> bool:
+        """Returns whether the lock is held.
+
+        Returns
+        -------
+        bool
+            `True` if the lock is held, `False` otherwise.
+        """
+        return self._locked
+
+    def acquire(self, priority: int = 0):
+        """Acquires the lock, blocking until it is released to this waiter.
+
+        Parameters
+        ----------
+        priority : int, optional
+            The priority. Waiters with a higher priority acquire the lock first, by default 0
+        """
+        with self._condition:
+            waiter = (-priority, next(self._arrivals))
+            heappush(self._waiters, waiter)
+            try:
+                while self._locked or self._waiters[0] != waiter:
+                    self._condition.wait()
+            except BaseException:
+                self._waiters.remove(waiter)  # Never leave an abandoned waiter blocking those behind it
+                heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+            heappop(self._waiters)
+            self._locked = True
+
+    def release(self):
+        """Releases the lock to the waiter with the highest priority, if any.
+
+        Raises
+        ------
+        RuntimeError
+            If the lock is not held.
+        """
+        with self._condition:
+            if not self._locked:
+                raise RuntimeError("Release of unlocked lock")
+            self._locked = False
+            self._condition.notify_all()
@@ -0,0 +1,42 @@
+"""
+Shared test fixtures.
+"""
+
+
+from typing import List
+
+from pytest import fixture
+
+
+class ManualClock:
+    """A clock that only advances when told to, or when sleeping."""
+
+    def __init__(self, now: float = 0.0):
+        """Initializes a new `ManualClock` instance.
+
+        Parameters
+        ----------
+        now : float, optional
+            The current time, in seconds, by default 0.0
+        """
+        self.now = now
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        """Returns the current time, in seconds."""
+        return self.now
+
+    def ns(self) -> int:
+        """Returns the current time, in nanoseconds."""
+        return round(self.now * 1e9)
+
+    def sleep(self, duration: float):
+        """Records the sleep and advances the current time."""
+        self.sleeps.append(duration)
+        self.now += duration
+
+
+@fixture
+def clock() -> ManualClock:
+    """A clock that only advances when told to, or when sleeping."""
+    return ManualClock()
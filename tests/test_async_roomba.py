@@ -0,0 +1,124 @@
+"""
+Tests for AsyncRoomba.
+"""
+
+
+import os
+import pty
+from asyncio import gather, run
+from typing import Tuple
+
+from pytest import raises
+from serial import Serial
+
+from irobot.async_roomba import AsyncRoomba
+from irobot.packet import Mode, Packet7, Packet35
+
+
+def create_roomba(timeout: float = 1.0) -> Tuple[AsyncRoomba, int]:
+    """Creates an `AsyncRoomba` connected to a pseudo-terminal.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        The response timeout, by default 1.0
+
+    Returns
+    -------
+    Tuple[AsyncRoomba, int]
+        The `AsyncRoomba` and the file descriptor of the Roomba's end of the pseudo-terminal.
+    """
+    master, slave = pty.openpty()
+    serial = Serial(os.ttyname(slave), 115200)
+    os.close(slave)
+    return AsyncRoomba(serial, timeout=timeout), master
+
+
+def read_exactly(fd: int, size: int) -> bytes:
+    """Reads exactly `size` bytes from the specified file descriptor.
+
+    Parameters
+    ----------
+    fd : int
+        The file descriptor.
+    size : int
+        The number of bytes.
+
+    Returns
+    -------
+    bytes
+        The bytes.
+    """
+    data = b""
+    while len(data) < size:
+        data += os.read(fd, size - len(data))
+    return data
+
+
+def test_drive_direct():
+    """Tests drive direct."""
+    roomba, master = create_roomba()
+    try:
+        run(roomba.drive_direct(-200, 500))
+        assert read_exactly(master, 5) == bytes([145, 1, 244, 255, 56])
+    finally:
+        roomba.serial.close()
+        os.close(master)
+
+
+def test_drive_direct_invalid_velocity():
+    """Tests drive direct with invalid velocity."""
+    roomba, master = create_roomba()
+    try:
+        with raises(ValueError):
+            run(roomba.drive_direct(5000, 500))
+    finally:
+        roomba.serial.close()
+        os.close(master)
+
+
+def test_sensors():
+    """Tests sensors, with the response arriving after the request."""
+    roomba, master = create_roomba()
+
+    async def respond():
+        assert read_exactly(master, 2) == bytes([142, 7])
+        os.write(master, bytes([0b00001111]))
+
+    async def main() -> Packet7:
+        packet, _ = await gather(roomba.sensors(7), respond())
+        return packet
+
+    try:
+        packet = run(main())
+        assert type(packet) == Packet7
+        assert packet.bump_left is True
+    finally:
+        roomba.serial.close()
+        os.close(master)
+
+
+def test_query_list():
+    """Tests query list."""
+    roomba, master = create_roomba()
+    os.write(master, bytes([2, 42]))
+    try:
+        packets = run(roomba.query_list([35, 15]))
+        assert read_exactly(master, 4) == bytes([149, 2, 35, 15])
+        assert len(packets) == 2
+        assert packets[0] == Packet35(Mode.SAFE)
+        assert packets[1].dirt_detect == 42
+    finally:
+        roomba.serial.close()
+        os.close(master)
+
+
+def test_read_timeout():
+    """Tests that read returns what has arrived when the timeout expires."""
+    roomba, master = create_roomba(timeout=0.05)
+    os.write(master, bytes([1]))
+    try:
+        assert run(roomba.read(3)) == bytes([1])
+    finally:
+        roomba.serial.close()
+        os.close(master)
@@ -0,0 +1,55 @@
+"""
+Tests for bulk.
+"""
+
+
+from os import urandom
+
+from pytest import importorskip, raises
+
+numpy = importorskip("numpy")
+
+from irobot.bulk import decode_array, raw_dtype  # noqa: E402
+from irobot.packet import Packet7, Packet100  # noqa: E402
+
+
+def test_raw_dtype():
+    """Tests that the raw types match the packet sizes."""
+    assert raw_dtype(100).itemsize == Packet100.size
+    assert raw_dtype(7).itemsize == Packet7.size
+
+
+def test_raw_dtype_invalid_packet_id():
+    """Tests raw dtype with an invalid packet id."""
+    with raises(ValueError):
+        raw_dtype(200)
+
+
+def test_decode_array():
+    """Tests that decode array agrees with `from_bytes` for every packet and field."""
+    data = urandom(Packet100.size * 50)
+    result = decode_array(100, data)
+    assert len(result) == 50
+    for i in range(len(result)):
+        packet = Packet100.from_bytes(data, offset=i * Packet100.size)
+        assert result["voltage"][i] == packet.packet_22.voltage
+        assert result["distance"][i] == packet.packet_19.distance
+        assert result["temperature"][i] == packet.packet_24.temperature
+        assert result["bump_left"][i] == packet.packet_7.bump_left
+        assert result["clock"][i] == packet.packet_18.clock
+        assert result["forward_progress"][i] == packet.packet_58.forward_progress
+        assert result["left_encoder_counts"][i] == packet.packet_44.left_encoder_counts
+        assert result["unused_byte_32"][i] == packet.packet_32.unused_byte
+
+
+def test_decode_array_memoryview():
+    """Tests decode array with a memoryview of non-group packets."""
+    result = decode_array(7, memoryview(bytes([0b00000001, 0b00001000])))
+    assert result["bump_right"].tolist() == [True, False]
+    assert result["wheel_drop_left"].tolist() == [False, True]
+
+
+def test_decode_array_invalid_length():
+    """Tests decode array with a length that is not a multiple of the packet size."""
+    with raises(ValueError):
+        decode_array(100, bytes(81))
@@ -0,0 +1,110 @@
+"""
+Tests for cache.
+"""
+
+
+from pytest import raises
+
+from irobot.cache import SensorCache
+from irobot.packet import Mode, Packet3, Packet7, Packet25, Packet35
+from irobot.roomba import Roomba
+from irobot.simulator import SimulatedRoomba
+
+
+def create_cache(clock, **kwargs) -> SensorCache:
+    """Creates a `SensorCache` in front of a started `Roomba` connected to a `SimulatedRoomba`.
+
+    Parameters
+    ----------
+    clock : ManualClock
+        The cache clock (the `clock` fixture).
+    **kwargs
+        The other arguments of the cache.
+
+    Returns
+    -------
+    SensorCache
+        The cache.
+    """
+    roomba = Roomba(SimulatedRoomba(timeout=0.1))
+    roomba._pacer.sleeper = lambda duration: None
+    roomba.start()
+    return SensorCache(roomba, clock=clock, **kwargs)
+
+
+def queries(cache: SensorCache):
+    """Returns the sensor queries sent to the simulated Roomba."""
+    return [command for command in cache.roomba.serial.commands if command[0] in (142, 149)]
+
+
+def test_fresh_packets_served(clock):
+    """Tests that packets younger than their TTL are served from the cache."""
+    cache = create_cache(clock, ttls={25: 5.0, 35: 5.0})
+    charge, mode = cache.query_list([25, 35])
+    assert isinstance(charge, Packet25)
+    assert mode == Packet35(Mode.PASSIVE)
+    clock.now = 4.9
+    assert cache.query_list([35, 25]) == [mode, charge]
+    assert cache.sensors(25) is charge
+    assert queries(cache) == [bytes([149, 2, 25, 35])]
+    assert cache.timestamp(25) == 0.0
+    assert cache.timestamp(7) is None
+
+
+def test_only_stale_packets_fetched(clock):
+    """Tests that only the stale packets are fetched, with a single query."""
+    cache = create_cache(clock, ttls={25: 5.0})
+    cache.query_list([7, 25, 35])
+    clock.now = 1.0
+    packets = cache.query_list([7, 25, 35, 7])
+    assert isinstance(packets[0], Packet7) and packets[3] is packets[0]
+    assert queries(cache) == [bytes([149, 3, 7, 25, 35]), bytes([149, 2, 7, 35])]
+    clock.now = 5.0
+    cache.sensors(25)
+    assert queries(cache)[-1] == bytes([149, 1, 25])
+
+
+def test_default_ttl(clock):
+    """Tests the default TTL and changing the TTL of a packet id."""
+    cache = create_cache(clock, ttl=1.0)
+    cache.sensors(35)
+    cache.sensors(35)
+    assert len(queries(cache)) == 1
+    cache.set_ttl(35, 0.0)
+    cache.sensors(35)
+    assert len(queries(cache)) == 2
+    cache.set_ttl(35, None)
+    cache.sensors(35)
+    assert len(queries(cache)) == 2
+    with raises(ValueError):
+        cache.set_ttl(99, 1.0)
+
+
+def test_group_members_cached(clock):
+    """Tests that fetching a group packet refreshes its member packets."""
+    cache = create_cache(clock, ttl=5.0)
+    group = cache.sensors(3)
+    assert isinstance(group, Packet3)
+    assert 21 in cache and 26 in cache
+    assert cache.sensors(25) is group.packet_25
+    assert len(queries(cache)) == 1
+
+
+def test_invalidate(clock):
+    """Tests discarding cached packets."""
+    cache = create_cache(clock, ttl=5.0)
+    cache.query_list([7, 35])
+    assert len(cache) == 2
+    cache.invalidate([7])
+    assert 7 not in cache and 35 in cache
+    cache.query_list([7, 35])
+    assert queries(cache)[-1] == bytes([149, 1, 7])
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_unknown_id(clock):
+    """Tests querying an unknown packet id."""
+    cache = create_cache(clock)
+    with raises(ValueError):
+        cache.sensors(99)
@@ -0,0 +1,215 @@
+"""
+Tests for fleet.
+"""
+
+
+from concurrent.futures import wait
+from contextlib import ExitStack
+from threading import Event
+from time import monotonic, sleep
+from typing import List, Tuple
+from unittest.mock import MagicMock
+
+from pytest import raises
+from serial import Serial
+
+from irobot.fleet import Fleet, FleetQueryResult, FleetRoomba
+from irobot.packet import Mode, Packet15, Packet35
+from irobot.simulator import PtyBridge, SimulatedRoomba
+from irobot.transport import LoopbackTransport
+
+
+class BlockingTransport(LoopbackTransport):
+    """A loopback transport whose first write blocks until released."""
+
+    def __init__(self):
+        """Initializes a new `BlockingTransport` instance."""
+        super().__init__()
+        self.writing = Event()
+        self.released = Event()
+
+    def write(self, data: bytes) -> int:
+        """Writes the data, blocking until released."""
+        if not self.released.is_set():
+            self.writing.set()
+            self.released.wait(1.0)
+        return super().write(data)
+
+
+def create_fleet(stack: ExitStack, count: int) -> Tuple[Fleet, List[SimulatedRoomba]]:
+    """Creates a started fleet of simulated Roombas, each behind a pseudo-terminal.
+
+    Parameters
+    ----------
+    stack : ExitStack
+        The exit stack stopping the fleet and bridges and closing the serial connections.
+    count : int
+        The number of Roombas.
+
+    Returns
+    -------
+    Tuple[Fleet, List[SimulatedRoomba]]
+        The fleet and the simulated Roombas.
+    """
+    fleet = Fleet()
+    simulators = []
+    for i in range(count):
+        simulators.append(SimulatedRoomba())
+        bridge = stack.enter_context(PtyBridge(simulators[-1]))
+        serial = stack.enter_context(Serial(bridge.port, baudrate=115200))
+        fleet.add(f"roomba-{i}", serial, timeout=0.5)
+    return stack.enter_context(fleet), simulators
+
+
+def test_handles():
+    """Tests driving the Roombas of a fleet through their handles."""
+    with ExitStack() as stack:
+        fleet, _ = create_fleet(stack, 2)
+        assert len(fleet) == 2
+        roomba = fleet["roomba-1"]
+        assert isinstance(roomba, FleetRoomba)
+        roomba.start()
+        roomba.full()
+        assert roomba.sensors(35) == Packet35(Mode.FULL)
+        assert roomba.query_list([35, 35]) == [Packet35(Mode.FULL), Packet35(Mode.FULL)]
+        fleet["roomba-0"].start()
+        assert fleet["roomba-0"].sensors(35) == Packet35(Mode.PASSIVE)
+
+
+def test_broadcast():
+    """Tests fanning out commands to, and gathering responses from, all Roombas at once."""
+    with ExitStack() as stack:
+        fleet, _ = create_fleet(stack, 3)
+        wait(fleet.broadcast(bytes([128])).values())
+        wait(fleet.broadcast(bytes([131])).values())
+        futures = fleet.broadcast(bytes([142, 35]), size=1)
+        assert sorted(futures) == ["roomba-0", "roomba-1", "roomba-2"]
+        assert all(future.result() == bytes([Mode.SAFE]) for future in futures.values())
+
+
+def test_query_list():
+    """Tests querying the same packets from all Roombas at once."""
+    with ExitStack() as stack:
+        fleet, simulators = create_fleet(stack, 3)
+        fleet.broadcast(bytes([128]))
+        fleet.broadcast(bytes([132]))
+        start = monotonic()
+        result = fleet.query_list([35, 15])
+        assert monotonic() - start < 2 * 0.5  # The half second the Roombas need after START overlaps
+        assert result.ids == (35, 15)
+        assert sorted(result.packets) == ["roomba-0", "roomba-1", "roomba-2"]
+        assert len(result.errors) == 0
+        assert result["roomba-2", 35] == Packet35(Mode.FULL)
+        assert result["roomba-2", 15] == Packet15(0)
+
+
+def test_query_list_timeout():
+    """Tests that Roombas that do not respond in time are reported as errors."""
+    with ExitStack() as stack:
+        fleet, _ = create_fleet(stack, 2)
+        fleet["roomba-1"].start()
+        result = fleet.query_list([35], timeout=0.1)
+        assert result["roomba-1", 35] == Packet35(Mode.PASSIVE)
+        assert list(result.packets) == ["roomba-1"]
+        assert type(result.errors["roomba-0"]) == TimeoutError
+        with raises(KeyError):
+            result["roomba-0", 35]
+        assert FleetQueryResult((35,)).packets == {}
+
+
+def test_timeout():
+    """Tests that a Roomba that does not respond fails its operation, without holding up the others."""
+    with ExitStack() as stack:
+        fleet, _ = create_fleet(stack, 2)
+        fleet["roomba-1"].start()
+        silent = fleet["roomba-0"].submit(bytes([142, 35]), size=1)  # Ignored, as the OI is off
+        assert fleet["roomba-1"].sensors(35) == Packet35(Mode.PASSIVE)
+        with raises(TimeoutError):
+            silent.result()
+
+
+def test_priority():
+    """Tests that a mode change command is sent ahead of queued commands of normal priority."""
+    with ExitStack() as stack:
+        fleet, simulators = create_fleet(stack, 1)
+        roomba = fleet["roomba-0"]
+        futures = [roomba.submit(bytes([128])), roomba.submit(bytes([139, 0, 0, 0])), roomba.submit(bytes([131]))]
+        wait(futures)
+        deadline = monotonic() + 1.0
+        while len(simulators[0].commands) < 3 and monotonic() < deadline:
+            sleep(0.001)  # The bridge forwards the last command asynchronously
+        assert simulators[0].commands == [bytes([128]), bytes([131]), bytes([139, 0, 0, 0])]
+
+
+def test_priority_while_writing():
+    """Tests that a command of high priority queued while a command is being written is sent after it."""
+    with BlockingTransport() as transport, Fleet() as fleet:
+        roomba = fleet.add("roomba-0", transport)
+        leds = roomba.submit(bytes([139, 0, 0, 0]))
+        assert transport.writing.wait(1.0)
+        stop = roomba.submit(bytes([145, 0, 0, 0, 0]))
+        transport.released.set()
+        assert leds.result(1.0) == b""
+        assert stop.result(1.0) == b""
+        assert transport.peer.read(9) == bytes([139, 0, 0, 0, 145, 0, 0, 0, 0])
+        assert fleet.running
+
+
+def test_late_response_discarded():
+    """Tests that the late response to a query that timed out is not taken for the response to the next query."""
+    with LoopbackTransport() as transport, Fleet() as fleet:
+        roomba = fleet.add("roomba-0", transport, timeout=0.05)
+        with raises(TimeoutError):
+            roomba.submit(bytes([142, 35]), 1).result(1.0)
+        transport.peer.write(b"\x02")
+        future = roomba.submit(bytes([142, 35]), 1)
+        assert transport.peer.read(4) == bytes([142, 35, 142, 35])
+        transport.peer.write(b"\x03")
+        assert future.result(1.0) == b"\x03"
+
+
+def test_unsolicited_data_discarded():
+    """Tests that data received while no response is expected is discarded, rather than kept until the next query."""
+    logger = MagicMock()
+    logger.isEnabledFor.return_value = False  # Only log the discarded bytes
+
+    def discarded() -> int:
+        return sum(call.args[1] for call in logger.debug.call_args_list)
+
+    with LoopbackTransport() as transport, Fleet() as fleet:
+        roomba = fleet.add("roomba-0", transport, logger=logger)
+        roomba.submit(bytes([128])).result(1.0)
+        transport.peer.write(bytes(100))
+        deadline = monotonic() + 1.0
+        while discarded() < 100 and monotonic() < deadline:
+            sleep(0.001)
+        assert discarded() == 100
+        assert len(roomba._received) == 0
+
+
+def test_add_while_running():
+    """Tests adding a Roomba to a running fleet, whose I/O thread registers its serial port."""
+    with LoopbackTransport() as transport, Fleet() as fleet:
+        roomba = fleet.add("roomba-0", transport)
+        future = roomba.submit(bytes([142, 35]), 1)
+        assert transport.peer.read(2) == bytes([142, 35])
+        transport.peer.write(bytes([Mode.FULL]))
+        assert future.result(1.0) == bytes([Mode.FULL])
+        assert len(fleet._registrations) == 0
+
+
+def test_duplicate_name():
+    """Tests that Roomba names must be unique within a fleet."""
+    with ExitStack() as stack:
+        fleet, _ = create_fleet(stack, 1)
+        with raises(ValueError):
+            fleet.add("roomba-0", fleet["roomba-0"].serial)
+
+
+def test_not_running():
+    """Tests that operations cannot be queued unless the fleet is running."""
+    with ExitStack() as stack:
+        fleet, _ = create_fleet(stack, 1)
+        fleet.stop()
+        with raises(RuntimeError):
+            fleet["roomba-0"].start()
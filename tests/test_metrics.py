@@ -0,0 +1,79 @@
+"""
+Tests for metrics.
+"""
+
+
+from irobot.metrics import LATENCY_BUCKETS, Metrics, MetricsSnapshot
+from irobot.roomba import Command, Roomba
+from irobot.simulator import SimulatedRoomba
+
+
+def test_received():
+    """Tests that read latencies are counted in log2 µs buckets."""
+    metrics = Metrics()
+    metrics.received(1, 0.0000005)
+    metrics.received(2, 0.000003)
+    metrics.received(3, 0.025)
+    metrics.received(4, 1000.0)
+    snapshot = metrics.snapshot()
+    assert snapshot.reads == 4
+    assert snapshot.bytes_received == 10
+    assert snapshot.read_latency[0] == 1
+    assert snapshot.read_latency[2] == 1
+    assert snapshot.read_latency[15] == 1
+    assert snapshot.read_latency[LATENCY_BUCKETS - 1] == 1
+
+
+def test_read_latency_percentile():
+    """Tests the read latency percentiles."""
+    assert MetricsSnapshot().read_latency_percentile(50) == 0.0
+    metrics = Metrics()
+    for _ in range(9):
+        metrics.received(1, 0.000003)
+    metrics.received(1, 0.025)
+    snapshot = metrics.snapshot()
+    assert snapshot.read_latency_percentile(50) == 4 / 1e6
+    assert snapshot.read_latency_percentile(90) == 4 / 1e6
+    assert snapshot.read_latency_percentile(99) == (1 << 15) / 1e6
+
+
+def test_snapshot_is_a_copy():
+    """Tests that a snapshot does not change with the metrics, and that resetting the metrics clears them."""
+    metrics = Metrics()
+    metrics.sent(bytes([145, 0, 0, 0, 0]), 0.01)
+    metrics.locked(0.002)
+    metrics.locked(0.001)
+    snapshot = metrics.snapshot()
+    metrics.sent(bytes([145, 0, 0, 0, 0]), 0.01)
+    assert snapshot.commands == {Command.DRIVE_DIRECT: 1}
+    assert snapshot.bytes_sent == 5
+    assert snapshot.pacing_time == 0.01
+    assert snapshot.lock_waits == 2
+    assert snapshot.lock_wait_max == 0.002
+    metrics.reset()
+    assert metrics.snapshot() == MetricsSnapshot()
+
+
+def test_roomba_metrics():
+    """Tests the metrics of a `Roomba`."""
+    metrics = Metrics()
+    roomba = Roomba(SimulatedRoomba(), metrics=metrics)
+    roomba.start()
+    roomba.safe()
+    roomba.sensors(35)
+    roomba.query_list([35, 7, 22])
+    roomba.drive_direct(0, 0)
+    snapshot = metrics.snapshot()
+    assert snapshot.commands == {
+        Command.START: 1,
+        Command.SAFE: 1,
+        Command.SENSORS: 1,
+        Command.QUERY_LIST: 1,
+        Command.DRIVE_DIRECT: 1,
+    }
+    assert snapshot.bytes_sent == 1 + 1 + 2 + 5 + 5
+    assert snapshot.bytes_received == 1 + 4
+    assert snapshot.lock_waits == 5
+    assert snapshot.reads == 2
+    assert sum(snapshot.read_latency) == 2
+    assert snapshot.pacing_time > 0
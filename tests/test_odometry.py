@@ -0,0 +1,114 @@
+"""
+Tests for odometry.
+"""
+
+
+from math import pi
+
+from pytest import approx, raises
+
+from irobot.odometry import COUNTS_PER_MM, WHEEL_BASE, Odometry, Pose, count_delta
+from irobot.packet import LazyPacket101, Packet19, Packet20, Packet35, Packet43, Packet44, Packet101
+from irobot.simulator import SimulatedRoomba
+from irobot.stream import StreamDecoder
+
+
+def counts(mm: float) -> int:
+    """Returns the encoder counts for the specified distance, wrapped to 16 bits."""
+    return round(mm * COUNTS_PER_MM) % 65536
+
+
+def test_count_delta():
+    """Tests encoder count deltas, including wraparound in both directions."""
+    assert count_delta(100, 150) == 50
+    assert count_delta(150, 100) == -50
+    assert count_delta(65530, 10) == 16
+    assert count_delta(10, 65530) == -16
+    assert count_delta(0, 32767) == 32767
+    assert count_delta(0, 32768) == -32768
+
+
+def test_first_update_is_reference():
+    """Tests that the first encoder counts only establish a reference."""
+    odometry = Odometry()
+    assert odometry.update([Packet43(1000), Packet44(2000)]) == Pose()
+
+
+def test_straight():
+    """Tests driving straight, across the encoder wraparound."""
+    odometry = Odometry()
+    odometry.update_counts(65000, 65000)
+    pose = odometry.update_counts(1000, 1000)
+    assert pose.x == approx(1536 / COUNTS_PER_MM)
+    assert pose.y == approx(0)
+    assert pose.heading == approx(0)
+    assert odometry.distance == approx(1536 / COUNTS_PER_MM)
+
+
+def test_turn_in_place():
+    """Tests turning a quarter turn counterclockwise in place."""
+    odometry = Odometry()
+    odometry.update_counts(0, 0)
+    arc = pi / 2 * WHEEL_BASE / 2
+    pose = odometry.update_counts(counts(-arc), counts(arc))
+    assert pose.x == approx(0)
+    assert pose.y == approx(0)
+    assert pose.heading == approx(pi / 2, abs=0.001)
+
+
+def test_incremental_arc():
+    """Tests that a half circle driven in small steps ends up on the other side of the circle."""
+    odometry = Odometry()
+    odometry.update_counts(0, 0)
+    radius = 500
+    steps = 1000
+    left = right = 0.0
+    for _ in range(steps):
+        left += pi * (radius - WHEEL_BASE / 2) / steps
+        right += pi * (radius + WHEEL_BASE / 2) / steps
+        pose = odometry.update_counts(counts(left), counts(right))
+    assert pose.x == approx(0, abs=1)
+    assert pose.y == approx(2 * radius, abs=1)
+    assert abs(pose.heading) == approx(pi, abs=0.01)
+
+
+def test_fusion():
+    """Tests fusing the distance and angle reported by the Roomba with the encoder counts."""
+    odometry = Odometry(fusion_weight=0.5)
+    odometry.update([Packet43(0), Packet44(0)])
+    pose = odometry.update([Packet19(200), Packet20(0), Packet43(counts(100)), Packet44(counts(100))])
+    assert pose.x == approx(150, abs=0.1)
+    with raises(ValueError):
+        Odometry(fusion_weight=1.5)
+
+
+def test_group_packets():
+    """Tests updating from group packets, eager and lazy."""
+    data = bytearray(Packet101.size)
+    odometry = Odometry()
+    odometry.update([Packet101.from_bytes(bytes(data))])
+    data[0:2] = counts(100).to_bytes(2, "big")
+    data[2:4] = counts(100).to_bytes(2, "big")
+    pose = odometry.update([LazyPacket101(bytes(data))])
+    assert pose.x == approx(100, abs=0.1)
+
+
+def test_missing_counts():
+    """Tests that frames without both encoder counts leave the pose unchanged."""
+    odometry = Odometry(pose=Pose(1, 2, 3))
+    odometry.update([Packet43(0), Packet44(0)])
+    assert odometry.update([Packet35(2), Packet43(500)]) == Pose(1, 2, 3)
+
+
+def test_simulated_stream(clock):
+    """Tests tracking a simulated Roomba driving a circle from its stream."""
+    simulator = SimulatedRoomba(timeout=0, clock=clock)
+    simulator.write(bytes([128, 131, 145, 0, 150, 0, 100, 148, 2, 43, 44]))
+    decoder = StreamDecoder()
+    odometry = Odometry()
+    for _ in range(200):
+        clock.now += 0.015
+        for frame in decoder.feed(simulator.read(simulator.in_waiting)):
+            odometry.update(frame)
+    assert odometry.pose.x == approx(simulator.x, abs=5)
+    assert odometry.pose.y == approx(simulator.y, abs=5)
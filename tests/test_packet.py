@@ -3,7 +3,14 @@ Tests for Packet.
 """
 
 
+from dataclasses import fields
+from struct import Struct
+
+from pytest import raises
+
 from irobot.packet import (
+    LazyPacket,
+    LazyPacket100,
     Packet,
     Packet0,
     Packet1,
@@ -69,6 +76,7 @@ from irobot.packet import (
     Packet106,
     Packet107,
 )
+from irobot.simulator import SimulatedRoomba
 
 
 def test_registry():
@@ -136,3 +144,76 @@ def test_registry():
     assert Packet.registry[101] == Packet101
     assert Packet.registry[106] == Packet106
     assert Packet.registry[107] == Packet107
+
+
+def test_group_structs():
+    """Tests that the precompiled structs of the group packets match the packet sizes and member formats."""
+    groups = [Packet0, Packet1, Packet2, Packet3, Packet4, Packet5, Packet6, Packet100, Packet101, Packet106, Packet107]
+    for cls in groups:
+        assert cls.struct.size == cls.size
+        assert cls.struct.format == ">" + "".join(member.format for member in cls.members)
+        assert sum(member.size for member in cls.members) == cls.size
+        assert len(cls.converters) == len(cls.members)
+
+
+def test_from_value():
+    """Tests that `from_value` agrees with `from_bytes` for all non-group packets."""
+    for id, cls in Packet.registry.items():
+        if len(cls.members) > 0:
+            continue
+        data = bytes(range(0x81, 0x81 + cls.size))
+        (value,) = Struct(">" + cls.format).unpack_from(data)
+        assert cls.from_value(value) == cls.from_bytes(data), f"Packet {id}"
+
+
+def test_slots():
+    """Tests that all packets are slotted, with a slot per field and no instance `__dict__`."""
+    for id, cls in Packet.registry.items():
+        assert cls.__slots__ == tuple(field.name for field in fields(cls)), f"Packet {id}"
+        data = create_group_data(cls) if len(cls.members) > 0 else bytes(cls.size)
+        assert not hasattr(cls.from_bytes(data), "__dict__"), f"Packet {id}"
+
+
+def create_group_data(cls) -> bytes:
+    """Creates valid raw data for the specified group packet, as an idle `SimulatedRoomba` sends it."""
+    return SimulatedRoomba(clock=lambda: 0.0).encode(cls.id)
+
+
+def test_lazy_packets():
+    """Tests that the lazy group packets decode to the same members as the eager group packets."""
+    for id, cls in LazyPacket.registry.items():
+        assert cls.id == id
+        assert cls.group == Packet.registry[id]
+        assert cls.size == cls.group.size
+        data = create_group_data(cls.group)
+        packet = cls.from_bytes(data)
+        assert packet.materialize() == cls.group.from_bytes(data), f"Packet {id}"
+        assert packet == cls.group.from_bytes(data)
+
+
+def test_lazy_packet_decodes_on_access():
+    """Tests that a lazy group packet decodes a member only when it is accessed, and only once."""
+    data = b"\x00" + create_group_data(Packet100)
+    packet = LazyPacket100.from_bytes(data, 1)
+    assert "packet_22" not in vars(packet)
+    voltage = packet.packet_22
+    assert voltage == Packet100.from_bytes(data, 1).packet_22
+    assert vars(packet)["packet_22"] is voltage
+    assert packet.packet_22 is voltage
+    assert "packet_7" not in vars(packet)
+
+
+def test_lazy_packet_copies_mutable_data():
+    """Tests that a lazy group packet references immutable data and copies mutable data."""
+    data = create_group_data(Packet100)
+    assert LazyPacket100(data).data.obj is data
+    mutable = bytearray(data)
+    packet = LazyPacket100(mutable)
+    mutable[:] = bytes(len(mutable))
+    assert packet.packet_22 == Packet100.from_bytes(data).packet_22
+
+
+def test_lazy_packet_short_data():
+    """Tests that a lazy group packet requires the full packet data."""
+    with raises(ValueError):
+        LazyPacket100(bytes(Packet100.size - 1))
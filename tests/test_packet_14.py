@@ -3,6 +3,10 @@ Tests for Packet14.
 """
 
 
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
 from irobot.packet import Packet14
 
 
@@ -86,3 +90,13 @@ def test_from_bytes_all_overcurrent():
     assert packet.right_wheel is True
     assert packet.main_brush is True
     assert packet.side_brush is True
+
+
+def test_from_bytes_shared():
+    """Tests that `from_bytes` returns the shared, immutable packet for each value."""
+    packet = Packet14.from_bytes(bytes([0xFF]))
+    assert Packet14.from_bytes(bytes([0xFF])) is packet
+    assert Packet14.from_value(0xFF) is packet
+    assert len(Packet14.table) == 256
+    with raises(FrozenInstanceError):
+        packet.left_wheel = False
@@ -3,6 +3,10 @@ Tests for Packet18.
 """
 
 
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
 from irobot.packet import Packet18
 
 
@@ -62,3 +66,13 @@ def test_from_bytes_all_off():
     assert packet.dock is False
     assert packet.spot is False
     assert packet.clean is False
+
+
+def test_from_bytes_shared():
+    """Tests that `from_bytes` returns the shared, immutable packet for each value."""
+    packet = Packet18.from_bytes(bytes([0xFF]))
+    assert Packet18.from_bytes(bytes([0xFF])) is packet
+    assert Packet18.from_value(0xFF) is packet
+    assert len(Packet18.table) == 256
+    with raises(FrozenInstanceError):
+        packet.clock = False
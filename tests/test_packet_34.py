@@ -3,6 +3,10 @@ Tests for Packet34.
 """
 
 
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
 from irobot.packet import Packet34
 
 
@@ -54,3 +58,13 @@ def test_from_bytes_both():
     assert type(packet) == Packet34
     assert packet.home_base is True
     assert packet.internal_charger is True
+
+
+def test_from_bytes_shared():
+    """Tests that `from_bytes` returns the shared, immutable packet for each value."""
+    packet = Packet34.from_bytes(bytes([0xFF]))
+    assert Packet34.from_bytes(bytes([0xFF])) is packet
+    assert Packet34.from_value(0xFF) is packet
+    assert len(Packet34.table) == 256
+    with raises(FrozenInstanceError):
+        packet.home_base = False
@@ -3,6 +3,10 @@ Tests for Packet45.
 """
 
 
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
 from irobot.packet import Packet45
 
 
@@ -70,3 +74,13 @@ def test_from_bytes_all_off():
     assert packet.bumper_center_left is False
     assert packet.bumper_front_left is False
     assert packet.bumper_left is False
+
+
+def test_from_bytes_shared():
+    """Tests that `from_bytes` returns the shared, immutable packet for each value."""
+    packet = Packet45.from_bytes(bytes([0xFF]))
+    assert Packet45.from_bytes(bytes([0xFF])) is packet
+    assert Packet45.from_value(0xFF) is packet
+    assert len(Packet45.table) == 256
+    with raises(FrozenInstanceError):
+        packet.bumper_right = False
@@ -3,6 +3,10 @@ Tests for Packet58.
 """
 
 
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
 from irobot.packet import Packet58
 
 
@@ -32,3 +36,13 @@ def test_from_bytes_no_forward_progress():
     assert packet is not None
     assert type(packet) == Packet58
     assert packet.forward_progress is False
+
+
+def test_from_bytes_shared():
+    """Tests that `from_bytes` returns the shared, immutable packet for each value."""
+    packet = Packet58.from_bytes(bytes([0xFF]))
+    assert Packet58.from_bytes(bytes([0xFF])) is packet
+    assert Packet58.from_value(0xFF) is packet
+    assert len(Packet58.table) == 256
+    with raises(FrozenInstanceError):
+        packet.forward_progress = False
@@ -3,6 +3,10 @@ Tests for Packet7.
 """
 
 
+from dataclasses import FrozenInstanceError
+
+from pytest import raises
+
 from irobot.packet import Packet7
 
 
@@ -62,3 +66,13 @@ def test_from_bytes_right_on():
     assert packet.wheel_drop_right is True
     assert packet.bump_left is False
     assert packet.bump_right is True
+
+
+def test_from_bytes_shared():
+    """Tests that `from_bytes` returns the shared, immutable packet for each value."""
+    packet = Packet7.from_bytes(bytes([0xFF]))
+    assert Packet7.from_bytes(bytes([0xFF])) is packet
+    assert Packet7.from_value(0xFF) is packet
+    assert len(Packet7.table) == 256
+    with raises(FrozenInstanceError):
+        packet.wheel_drop_left = False
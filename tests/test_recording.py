@@ -0,0 +1,144 @@
+"""
+Tests for recording.
+"""
+
+
+from io import BytesIO
+
+from pytest import raises
+
+from irobot.packet import Mode, Packet35
+from irobot.recording import HEADER, RECORD, Recorder, RecordKind, Replay, iter_records
+from irobot.roomba import Roomba
+from irobot.simulator import SimulatedRoomba
+from irobot.stream import StreamDecoder
+
+
+def record_session(path: str, clock=None):
+    """Records a short session with a simulated Roomba.
+
+    Parameters
+    ----------
+    path : str
+        The path of the session log.
+    clock : ManualClock, optional
+        The recorder clock (the `clock` fixture), by default None
+    """
+    recorder = Recorder(SimulatedRoomba(), path) if clock is None else Recorder(SimulatedRoomba(), path, clock.ns)
+    with recorder:
+        roomba = Roomba(recorder)
+        roomba._pacer.sleeper = lambda duration: None
+        roomba.start()
+        roomba.full()
+        if clock is not None:
+            clock.now += 0.5
+        roomba.sensors(35)
+        roomba.query_list([35, 15])
+
+
+def test_record(tmp_path):
+    """Tests the records of a recorded session."""
+    path = str(tmp_path / "session.bin")
+    record_session(path)
+    with open(path, "rb") as file:
+        data = file.read()
+    records = list(iter_records(data))
+    assert [record.kind for record in records] == [
+        RecordKind.WRITE,
+        RecordKind.WRITE,
+        RecordKind.WRITE,
+        RecordKind.READ,
+        RecordKind.WRITE,
+        RecordKind.READ,
+    ]
+    assert records[2].data == bytes([142, 35])
+    assert records[3].data == bytes([Mode.FULL])
+    assert all(a.timestamp <= b.timestamp for a, b in zip(records, records[1:]))
+    assert len(data) == HEADER.size + sum(RECORD.size + len(record.data) for record in records)
+
+
+def test_recorder_delegates():
+    """Tests that the recorder delegates to the serial connection."""
+    simulator = SimulatedRoomba(baudrate=57600)
+    recorder = Recorder(simulator, BytesIO())
+    assert recorder.baudrate == 57600
+    recorder.timeout = 0
+    assert simulator.timeout == 0
+    assert recorder.in_waiting == 0
+    assert recorder.read(1) == b""
+
+
+def test_replay(tmp_path):
+    """Tests replaying a recorded session to a `Roomba`."""
+    path = str(tmp_path / "session.bin")
+    record_session(path)
+    with Replay(path) as replay:
+        roomba = Roomba(replay)
+        roomba._pacer.sleeper = lambda duration: None
+        roomba.start()
+        roomba.full()
+        assert roomba.sensors(35) == Packet35(Mode.FULL)
+        assert roomba.query_list([35, 15])[0] == Packet35(Mode.FULL)
+        assert replay.finished
+
+
+def test_replay_readinto(tmp_path):
+    """Tests replaying the recorded reads into a buffer."""
+    path = str(tmp_path / "session.bin")
+    record_session(path)
+    with Replay(path) as replay:
+        buffer = bytearray(4)
+        assert replay.readinto(memoryview(buffer)[:2]) == 2
+        assert buffer[0] == Mode.FULL
+        assert replay.readinto(buffer) == 1
+        assert replay.finished
+
+
+def test_replay_strict(tmp_path):
+    """Tests that a strict replay rejects writes that do not match the recording."""
+    path = str(tmp_path / "session.bin")
+    record_session(path)
+    with Replay(path) as replay:
+        roomba = Roomba(replay)
+        with raises(ValueError):
+            roomba.safe()
+    with Replay(path, strict=False) as replay:
+        roomba = Roomba(replay)
+        roomba._pacer.sleeper = lambda duration: None
+        roomba.safe()
+
+
+def test_replay_realtime(tmp_path, clock):
+    """Tests that a realtime replay returns reads no sooner than they were recorded."""
+    path = str(tmp_path / "session.bin")
+    record_session(path, clock)
+    with Replay(path, realtime=True, clock=clock, sleeper=clock.sleep) as replay:
+        replay.write(bytes([128]))
+        assert replay.in_waiting == 0
+        clock.now += 0.25
+        assert replay.in_waiting == 0
+        assert replay.read(1) == bytes([Mode.FULL])
+        assert clock.sleeps == [0.25]
+
+
+def test_replay_stream(tmp_path, clock):
+    """Tests replaying a recorded stream as fast as possible."""
+    path = str(tmp_path / "session.bin")
+    simulator = SimulatedRoomba(timeout=0, clock=clock)
+    with Recorder(simulator, path) as recorder:
+        recorder.write(bytes([128, 131, 148, 1, 35]))
+        clock.now += 0.1
+        recorder.read(recorder.in_waiting)
+    with Replay(path, strict=False) as replay:
+        frames = list(StreamDecoder().feed(replay.read(replay.in_waiting)))
+    assert len(frames) == 7
+    assert all(frame == [Packet35(Mode.SAFE)] for frame in frames)
+
+
+def test_not_a_session_log():
+    """Tests reading something that is not a session log."""
+    with raises(ValueError):
+        list(iter_records(b"not a session log"))
+    with raises(ValueError):
+        list(iter_records(HEADER.pack(b"IRBT", 1, 115200) + RECORD.pack(1, 0, 10) + b"short"))
+
@@ -4,6 +4,8 @@ Tests for Roomba.
 
 
 from datetime import datetime
+from threading import Thread
+from time import monotonic, sleep
 from typing import List, Optional
 from unittest.mock import MagicMock
 
@@ -11,7 +13,20 @@ from pytest import raises
 from serial import Serial
 
 from irobot.packet import Mode, Packet, Packet7, Packet15, Packet35
-from irobot.roomba import BaudCode, Button, Motor, Roomba, WeekDay
+from irobot.roomba import (
+    COMMAND_PROCESS_DURATION,
+    MODE_CHANGE_DURATION,
+    START_DURATION,
+    BaudCode,
+    Button,
+    Motor,
+    Priority,
+    QueryPlan,
+    Roomba,
+    WeekDay,
+    query_plan,
+)
+from irobot.util import Trace
 
 
 def create_mocked_roomba(return_value: Optional[bytes] = None) -> Roomba:
@@ -387,6 +402,25 @@ def test_query_list():
     assert packet_15.dirt_detect == 42
 
 
+def test_query_list_plan():
+    """Tests query list with a precompiled query plan."""
+    roomba = create_mocked_roomba(return_value=bytes([2, 42]))
+    plan = QueryPlan([35, 15])
+    assert plan.request == bytes([149, 2, 35, 15])
+    assert plan.size == 2
+    assert [offset for _, offset in plan.decoders] == [0, 1]
+    packets = roomba.query_list(plan)
+    roomba.serial.write.assert_called_once_with(plan.request)
+    roomba.serial.read.assert_called_once_with(2)
+    assert packets == [Packet35(Mode.SAFE), Packet15(42)]
+
+
+def test_query_plan_cached():
+    """Tests that query plans are cached per list of ids."""
+    assert query_plan((35, 15)) is query_plan((35, 15))
+    assert query_plan((35, 15)) is not query_plan((15, 35))
+
+
 def test_query_list_too_many_packets():
     """Tests query list with too many packets."""
     roomba = create_mocked_roomba()
@@ -501,3 +535,170 @@ def test_write_and_read():
     roomba.serial.write.assert_called_once_with(bytes([1, 2, 3, 4]))
     roomba.serial.read.assert_called_once_with(size=4)
     assert data == bytes([4, 3, 2, 1])
+
+
+def test_readinto():
+    """Tests reading into a buffer."""
+    roomba = create_mocked_roomba(return_value=bytes([4, 3]))
+    buffer = bytearray(4)
+    assert roomba.readinto(memoryview(buffer)[1:3]) == 2
+    assert buffer == bytes([0, 4, 3, 0])
+
+
+def test_write_and_readinto():
+    """Tests writing and reading into a buffer."""
+    roomba = create_mocked_roomba(return_value=bytes([4, 3, 2, 1]))
+    buffer = bytearray(4)
+    assert roomba.write_and_readinto(bytes([1, 2, 3, 4]), buffer) == 4
+    roomba.serial.write.assert_called_once_with(bytes([1, 2, 3, 4]))
+    roomba.serial.read.assert_called_once_with(4)
+    assert buffer == bytes([4, 3, 2, 1])
+
+
+def test_sensors_buffer():
+    """Tests querying sensors into a caller-supplied buffer."""
+    roomba = create_mocked_roomba(return_value=bytes([2, 42]))
+    buffer = bytearray(8)
+    assert roomba.query_list([35, 15], buffer=buffer) == [Packet35(Mode.SAFE), Packet15(42)]
+    assert buffer[:2] == bytes([2, 42])
+    with raises(ValueError):
+        roomba.query_list([35, 15], buffer=bytearray(1))
+
+
+def test_sensors_pooled_buffer():
+    """Tests that responses are read into a buffer pooled per thread, which lazy packets do not share."""
+    roomba = create_mocked_roomba(return_value=bytes(range(80)))
+    packet = roomba.sensors(100, lazy=True)
+    pooled = roomba._buffers.pooled
+    assert len(pooled) >= 80
+    roomba.serial.read.return_value = bytes(80)
+    roomba.sensors(100)
+    assert roomba._buffers.pooled is pooled
+    assert bytes(packet.data) == bytes(range(80))
+    roomba.serial.read.return_value = bytes(132)
+    roomba.query_list([100, 6])
+    assert len(roomba._buffers.pooled) >= 132
+
+
+def test_write_and_read_traced():
+    """Tests that write and read records the data sent and received in the trace."""
+    roomba = create_mocked_roomba(return_value=bytes([2]))
+    roomba.trace = Trace()
+    roomba.write_and_read(bytes([142, 35]), size=1)
+    entries = roomba.trace.entries()
+    assert [(entry.message, entry.data) for entry in entries] == [
+        ("Writing data:", bytes([142, 35])),
+        ("Read data:", bytes([2])),
+    ]
+
+
+def test_write_and_read_does_not_sleep():
+    """Tests that write and read reads the response right away rather than after a fixed delay."""
+    roomba = create_mocked_roomba(return_value=bytes([2]))
+    start = monotonic()
+    roomba.write_and_read(bytes([142, 35]), size=1)
+    assert monotonic() - start < COMMAND_PROCESS_DURATION
+
+
+def test_duration():
+    """Tests the command durations."""
+    assert Roomba.duration(bytes([128])) == START_DURATION
+    assert Roomba.duration(bytes([131])) == MODE_CHANGE_DURATION
+    assert Roomba.duration(bytes([145, 0, 0, 0, 0])) == COMMAND_PROCESS_DURATION
+
+
+def test_priority():
+    """Tests the command priorities."""
+    assert Roomba.priority(bytes([128])) == Priority.HIGH
+    assert Roomba.priority(bytes([131])) == Priority.HIGH
+    assert Roomba.priority(bytes([133])) == Priority.HIGH
+    assert Roomba.priority(bytes([145, 0, 0, 0, 0])) == Priority.HIGH
+    assert Roomba.priority(bytes([137, 0, 0, 1, 244])) == Priority.HIGH
+    assert Roomba.priority(bytes([145, 0, 0, 0, 1])) == Priority.NORMAL
+    assert Roomba.priority(bytes([137, 0, 100, 1, 244])) == Priority.NORMAL
+    assert Roomba.priority(bytes([140, 0, 1, 60, 32])) == Priority.NORMAL
+    assert Roomba.priority(bytes([142, 7])) == Priority.NORMAL
+
+
+def test_write_priority():
+    """Tests that a stop command waiting for the lock is sent ahead of a song definition that waited longer."""
+    roomba = create_mocked_roomba()
+    roomba._lock.acquire()
+    threads = [
+        Thread(target=roomba.song, args=(0, [(60, 32)])),
+        Thread(target=roomba.drive_direct, args=(0, 0)),
+    ]
+    for thread in threads:
+        thread.start()
+        while len(roomba._lock._waiters) < threads.index(thread) + 1:
+            sleep(0.001)
+    roomba._lock.release()
+    for thread in threads:
+        thread.join()
+    assert roomba.serial.write.call_args_list[0].args[0] == bytes([145, 0, 0, 0, 0])
+
+
+def test_write_paced():
+    """Tests that write only waits when the previous command was sent too recently."""
+    roomba = create_mocked_roomba()
+    roomba._pacer.sleeper = MagicMock()
+    roomba.safe()
+    roomba._pacer.sleeper.assert_not_called()
+    roomba.full()
+    roomba._pacer.sleeper.assert_called_once()
+    assert roomba._pacer.sleeper.call_args.args[0] <= MODE_CHANGE_DURATION
+
+
+def test_write_motion_coalesced():
+    """Tests that a motion command superseded while waiting to be sent is dropped in favor of the newest one."""
+    roomba = create_mocked_roomba()
+    roomba.coalesce = True
+    roomba.safe()
+    threads = []
+
+    def sleeper(duration: float):
+        if len(threads) == 0:
+            threads.append(Thread(target=roomba.drive_direct, args=(200, 200)))
+            threads[0].start()
+            while roomba._pending_motion.get(137) != bytes([145, 0, 200, 0, 200]):
+                sleep(0.001)
+
+    roomba._pacer.sleeper = sleeper
+    roomba.drive_direct(100, 100)
+    threads[0].join()
+    assert [call.args[0] for call in roomba.serial.write.call_args_list] == [bytes([131]), bytes([145, 0, 200, 0, 200])]
+    assert len(roomba._pending_motion) == 0
+
+
+def test_write_motion_slots():
+    """Tests that coalescing keeps the newest command for each output slot."""
+    roomba = create_mocked_roomba()
+    roomba.coalesce = True
+    roomba._pacer.sleeper = MagicMock()
+    roomba._lock.acquire()  # Hold the commands pending until all have been issued
+    threads = []
+    for command, args in [(roomba.drive_pwm, (10, 10)), (roomba.drive, (100, 500)), (roomba.motors_pwm, (1, 2, 3))]:
+        threads.append(Thread(target=command, args=args))
+        threads[-1].start()
+        while len(roomba._lock._waiters) < len(threads):
+            sleep(0.001)
+    roomba._lock.release()
+    for thread in threads:
+        thread.join()
+    assert [call.args[0] for call in roomba.serial.write.call_args_list] == [
+        bytes([137, 0, 100, 1, 244]),
+        bytes([144, 1, 2, 3]),
+    ]
+    assert len(roomba._pending_motion) == 0
+
+
+def test_write_motion_not_coalesced():
+    """Tests that motion commands are all sent when not coalescing."""
+    roomba = create_mocked_roomba()
+    roomba._pacer.sleeper = MagicMock()
+    roomba.drive_direct(100, 100)
+    roomba.drive_direct(200, 200)
+    assert [call.args[0] for call in roomba.serial.write.call_args_list] == [
+        bytes([145, 0, 100, 0, 100]),
+        bytes([145, 0, 200, 0, 200]),
+    ]
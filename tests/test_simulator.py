@@ -0,0 +1,215 @@
+"""
+Tests for simulator.
+"""
+
+
+from typing import Callable
+
+from pytest import raises
+from serial import Serial
+
+from irobot.packet import (
+    LazyPacket100,
+    Mode,
+    Packet7,
+    Packet19,
+    Packet20,
+    Packet35,
+    Packet36,
+    Packet37,
+    Packet41,
+    Packet42,
+    Packet43,
+    Packet100,
+)
+from irobot.roomba import Roomba
+from irobot.simulator import COUNTS_PER_MM, PtyBridge, SimulatedRoomba
+from irobot.stream import StreamDecoder
+
+
+def create_roomba(clock: Callable[[], float] = None) -> Roomba:
+    """Creates a `Roomba` connected to a started `SimulatedRoomba` in safe mode.
+
+    Parameters
+    ----------
+    clock : Callable[[], float], optional
+        The simulator clock (e.g. the `clock` fixture), by default None
+
+    Returns
+    -------
+    Roomba
+        The Roomba.
+    """
+    simulator = SimulatedRoomba(timeout=0.1) if clock is None else SimulatedRoomba(timeout=0, clock=clock)
+    roomba = Roomba(simulator)
+    roomba.start()
+    roomba.safe()
+    return roomba
+
+
+def test_modes():
+    """Tests that the mode commands change the simulated OI mode."""
+    simulator = SimulatedRoomba()
+    assert simulator.mode == Mode.OFF
+    roomba = Roomba(simulator)
+    roomba.safe()
+    assert simulator.mode == Mode.OFF
+    roomba.start()
+    assert simulator.mode == Mode.PASSIVE
+    roomba.full()
+    assert roomba.sensors(35) == Packet35(Mode.FULL)
+
+
+def test_drive_requires_safe_mode():
+    """Tests that drive commands are ignored in passive mode."""
+    simulator = SimulatedRoomba()
+    roomba = Roomba(simulator)
+    roomba.start()
+    roomba.drive_direct(100, 100)
+    assert simulator.left_velocity == 0
+    roomba.safe()
+    roomba.drive_direct(100, 200)
+    assert simulator.left_velocity == 100
+    assert simulator.right_velocity == 200
+
+
+def test_drive_straight(clock):
+    """Tests that driving straight updates the encoders and the distance."""
+    roomba = create_roomba(clock)
+    roomba.drive_direct(200, 200)
+    clock.now += 1.0
+    assert roomba.sensors(19) == Packet19(200)
+    assert roomba.sensors(19) == Packet19(0)
+    assert roomba.sensors(43) == Packet43(int(200 * COUNTS_PER_MM))
+    assert roomba.sensors(20) == Packet20(0)
+
+
+def test_turn_in_place(clock):
+    """Tests that turning in place updates the angle but not the distance."""
+    roomba = create_roomba(clock)
+    roomba.drive(100, 1)
+    clock.now += 1.0
+    assert roomba.serial.left_velocity == -100
+    packets = roomba.query_list([19, 20])
+    assert packets[0] == Packet19(0)
+    assert packets[1] == Packet20(48)
+
+
+def test_group_packet(clock):
+    """Tests that a group packet reflects the simulated state."""
+    roomba = create_roomba(clock)
+    roomba.drive_direct(-50, 50)
+    packet = roomba.sensors(100)
+    assert type(packet) == Packet100
+    assert packet.packet_35.mode == Mode.SAFE
+    assert packet.packet_41.requested_right_velocity == 50
+    assert packet.packet_42.requested_left_velocity == -50
+    assert packet.packet_26.battery_capacity == roomba.serial.battery_capacity
+
+
+def test_lazy_group_packet(clock):
+    """Tests requesting a lazy group packet."""
+    roomba = create_roomba(clock)
+    packet = roomba.sensors(100, lazy=True)
+    assert type(packet) == LazyPacket100
+    assert packet.packet_26.battery_capacity == roomba.serial.battery_capacity
+    assert type(roomba.sensors(7, lazy=True)) == Packet7
+
+
+def test_split_commands():
+    """Tests that a command split across writes is executed once complete."""
+    simulator = SimulatedRoomba()
+    simulator.write(bytes([128, 131, 145, 0]))
+    assert simulator.commands == [bytes([128]), bytes([131])]
+    simulator.write(bytes([100, 0, 50]))
+    assert simulator.commands[-1] == bytes([145, 0, 100, 0, 50])
+    assert simulator.right_velocity == 100
+    assert simulator.left_velocity == 50
+
+
+def test_stream(clock):
+    """Tests that streamed frames are produced every 15 ms."""
+    roomba = create_roomba(clock)
+    roomba.stream([35, 7])
+    clock.now += 0.05
+    simulator = roomba.serial
+    data = simulator.read(simulator.in_waiting)
+    frames = list(StreamDecoder().feed(data))
+    assert len(frames) == 4
+    assert all(frame[0] == Packet35(Mode.SAFE) for frame in frames)
+    roomba.pause_resume_stream(False)
+    clock.now += 0.05
+    assert simulator.in_waiting == 0
+
+
+def test_read_timeout():
+    """Tests that reading with nothing to read returns short after the timeout."""
+    simulator = SimulatedRoomba(timeout=0.01)
+    assert simulator.read(1) == b""
+
+
+def test_pty_bridge():
+    """Tests a `Roomba` talking to the simulator through a pseudo-terminal."""
+    simulator = SimulatedRoomba()
+    with PtyBridge(simulator) as bridge:
+        serial = Serial(bridge.port, baudrate=115200, timeout=1.0)
+        try:
+            roomba = Roomba(serial)
+            roomba.start()
+            roomba.full()
+            assert roomba.sensors(35) == Packet35(Mode.FULL)
+        finally:
+            serial.close()
+
+
+def test_play_song(clock):
+    """Tests that a song is reported as playing for its duration."""
+    roomba = create_roomba(clock)
+    roomba.song(1, [(60, 32), (62, 32)])
+    assert roomba.sensors(37) == Packet37(False)
+    roomba.play(1)
+    assert roomba.query_list([36, 37]) == [Packet36(1), Packet37(True)]
+    clock.now += 0.99
+    assert roomba.sensors(37) == Packet37(True)
+    clock.now += 0.01
+    assert roomba.sensors(37) == Packet37(False)
+
+
+def test_pty_bridge_stop():
+    """Tests that stopping a bridge more than once, or without starting it, does nothing."""
+    bridge = PtyBridge(SimulatedRoomba())
+    bridge.stop()
+    bridge.stop()
+    with raises(ValueError):
+        bridge.start()
+    with PtyBridge(SimulatedRoomba()) as bridge:
+        bridge.stop()
+
+
+def test_read_stopped_clock(clock):
+    """Tests that reading while streaming returns short when the injected clock does not advance."""
+    simulator = SimulatedRoomba(timeout=0.01, clock=clock)
+    roomba = Roomba(simulator)
+    roomba.start()
+    roomba.stream([35])
+    frame = simulator.read(100)
+    assert len(list(StreamDecoder().feed(frame))) == 1
+
+
+def test_baud(clock):
+    """Tests that the baud command changes the simulated baud rate."""
+    roomba = create_roomba(clock)
+    roomba.set_baud_rate(19200)
+    assert roomba.serial.baudrate == 19200
+
+
+def test_requested_velocities(clock):
+    """Tests that the requested velocities reflect the last drive command."""
+    roomba = create_roomba(clock)
+    roomba.drive_direct(100, 200)
+    assert roomba.query_list([41, 42]) == [Packet41(200), Packet42(100)]
+    roomba.drive(100, -1)
+    assert roomba.query_list([41, 42]) == [Packet41(-100), Packet42(100)]
+    roomba.drive_pwm(255, 255)
+    assert roomba.query_list([41, 42]) == [Packet41(-100), Packet42(100)]
+    assert roomba.serial.left_velocity == 500
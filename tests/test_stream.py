@@ -0,0 +1,220 @@
+"""
+Tests for stream.
+"""
+
+
+from time import sleep
+from typing import List
+from unittest.mock import MagicMock
+
+from pytest import raises
+
+from irobot.packet import Mode, Packet7, Packet19, Packet29, Packet35
+from irobot.roomba import Roomba
+from irobot.stream import StreamDecoder, StreamReader
+
+
+def create_frame(payload: List[int]) -> bytes:
+    """Creates a stream frame with a valid checksum.
+
+    Parameters
+    ----------
+    payload : List[int]
+        The packet ids and packet data.
+
+    Returns
+    -------
+    bytes
+        The frame.
+    """
+    a = [19, len(payload)] + payload
+    a.append(-sum(a) & 0xFF)
+    return bytes(a)
+
+
+def test_feed_single_frame():
+    """Tests `feed` with a single, complete frame."""
+    decoder = StreamDecoder()
+    frames = list(decoder.feed(create_frame([29, 2, 25, 13, 0])))
+    assert len(frames) == 1
+    packets = frames[0]
+    assert len(packets) == 2
+    assert type(packets[0]) == Packet29
+    assert packets[0].cliff_front_left_signal == 537
+    assert packets[1].virtual_wall is False
+
+
+def test_feed_split_frames():
+    """Tests `feed` with frames split across chunks at arbitrary boundaries."""
+    decoder = StreamDecoder()
+    data = create_frame([7, 0b00000011, 35, 2]) + create_frame([7, 0b00001000, 35, 3])
+    frames = []
+    for i in range(0, len(data), 3):
+        frames.extend(decoder.feed(data[i : i + 3]))
+    assert len(frames) == 2
+    assert frames[0][0] == Packet7(False, False, True, True)
+    assert frames[0][1] == Packet35(Mode.SAFE)
+    assert frames[1][0] == Packet7(True, False, False, False)
+    assert frames[1][1] == Packet35(Mode.FULL)
+
+
+def test_feed_leading_garbage():
+    """Tests `feed` with bytes, including a header byte, preceding the first frame."""
+    decoder = StreamDecoder()
+    assert list(decoder.feed(bytes([0, 42]) + create_frame([35, 1]))) == [[Packet35(Mode.PASSIVE)]]
+    decoder = StreamDecoder()
+    frames = list(decoder.feed(bytes([0, 42, 19]) + create_frame([35, 1]) * 5))
+    assert len(frames) == 5
+    assert frames[0][0].mode == Mode.PASSIVE
+    assert decoder.statistics.skipped_bytes == 3
+
+
+def test_feed_invalid_checksum():
+    """Tests `feed` with a frame that has an invalid checksum."""
+    decoder = StreamDecoder()
+    frame = bytearray(create_frame([35, 1]))
+    frame[-1] ^= 0xFF
+    frames = list(decoder.feed(bytes(frame) + create_frame([35, 2])))
+    assert len(frames) == 1
+    assert frames[0][0].mode == Mode.SAFE
+
+
+def test_feed_unknown_packet_id():
+    """Tests `feed` with a frame containing an unknown packet id."""
+    decoder = StreamDecoder()
+    frames = list(decoder.feed(create_frame([200, 1])))
+    assert len(frames) == 0
+
+
+def test_feed_lost_bytes():
+    """Tests that `feed` resynchronizes on the next frame when bytes are lost in the middle of a frame."""
+    decoder = StreamDecoder()
+    first = create_frame([35, 1, 22, 0x3A, 0x98])
+    data = first[:3] + first[5:] + create_frame([35, 2]) + create_frame([35, 3])
+    frames = list(decoder.feed(data))
+    assert len(frames) == 2
+    assert frames[0][0].mode == Mode.SAFE
+    assert frames[1][0].mode == Mode.FULL
+    statistics = decoder.statistics
+    assert statistics.frames == 2
+    assert statistics.resyncs == 1
+    assert statistics.skipped_bytes == len(first) - 2
+
+
+def test_feed_corrupted_length():
+    """Tests that a corrupted length byte delays `feed` until the corrupted frame would be complete, without losing the
+    frames following it."""
+    decoder = StreamDecoder()
+    assert list(decoder.feed(bytes([19, 200, 35, 1]) + create_frame([35, 2]))) == []
+    frames = list(decoder.feed(create_frame([35, 2]) * 40))
+    assert len(frames) == 41
+    assert frames[0][0].mode == Mode.SAFE
+    assert decoder.statistics.skipped_bytes == 4
+
+
+def test_feed_frame_containing_frame():
+    """Tests that a frame whose payload looks like a complete frame is not mistaken for lost bytes when fed byte by
+    byte."""
+    decoder = StreamDecoder()
+    frame = create_frame([19, 0, 237, 7, 0])
+    frames = [packets for byte in frame for packets in decoder.feed(bytes([byte]))]
+    assert frames == [[Packet19(237), Packet7(False, False, False, False)]]
+    assert frames == list(StreamDecoder().feed(frame))
+    statistics = decoder.statistics
+    assert (statistics.frames, statistics.skipped_bytes, statistics.resyncs) == (1, 0, 0)
+
+
+def test_feed_empty_frame():
+    """Tests that an empty frame is malformed."""
+    decoder = StreamDecoder()
+    assert list(decoder.feed(create_frame([]) + create_frame([35, 1]))) == [[Packet35(Mode.PASSIVE)]]
+    assert decoder.statistics.malformed_frames == 1
+
+
+def test_statistics():
+    """Tests the statistics of checksum failures and malformed frames."""
+    decoder = StreamDecoder()
+    corrupted = bytearray(create_frame([35, 1]))
+    corrupted[-1] ^= 0x01
+    data = create_frame([35, 1]) + bytes(corrupted) + create_frame([200, 1]) + create_frame([35, 2])
+    frames = list(decoder.feed(data))
+    assert len(frames) == 2
+    statistics = decoder.statistics
+    assert statistics.frames == 2
+    assert statistics.checksum_failures == 1
+    assert statistics.malformed_frames == 1
+    assert statistics.resyncs == 1
+    assert statistics.skipped_bytes == len(corrupted) + 5
+
+
+def create_streaming_roomba(chunks: List[bytes]) -> Roomba:
+    """Creates a mocked `Roomba` whose serial port returns the specified chunks and then times out.
+
+    Parameters
+    ----------
+    chunks : List[bytes]
+        The chunks to return from `read`.
+
+    Returns
+    -------
+    Roomba
+        The `Roomba`.
+    """
+    chunks = list(chunks)
+
+    def read(size: int = 1) -> bytes:
+        if len(chunks) > 0:
+            return chunks.pop(0)
+        sleep(0.001)
+        return b""
+
+    serial = MagicMock()
+    serial.baudrate = 115200
+    serial.in_waiting = 0
+    serial.read = MagicMock(side_effect=read)
+    return Roomba(serial)
+
+
+def wait_for_sequence(reader: StreamReader, sequence: int):
+    """Waits for the reader to publish the snapshot with the specified sequence number.
+
+    Parameters
+    ----------
+    reader : StreamReader
+        The reader.
+    sequence : int
+        The sequence number.
+    """
+    for _ in range(1000):
+        latest = reader.latest
+        if latest is not None and latest.sequence >= sequence:
+            return
+        sleep(0.001)
+
+
+def test_reader_latest():
+    """Tests that the reader publishes the most recent frame."""
+    data = create_frame([35, 1, 22, 0x3A, 0x98]) + create_frame([35, 2, 22, 0x3A, 0x97])
+    roomba = create_streaming_roomba([data[:5], data[5:]])
+    reader = StreamReader(roomba, [35, 22])
+    assert reader.latest is None
+    with reader:
+        wait_for_sequence(reader, 2)
+    roomba.serial.write.assert_any_call(bytes([148, 2, 35, 22]))
+    roomba.serial.write.assert_called_with(bytes([150, 0]))
+    assert reader.running is False
+    latest = reader.latest
+    assert latest.sequence == 2
+    assert latest.packets[35].mode == Mode.SAFE
+    assert latest.packets[22].voltage == 14999
+
+
+def test_reader_start_twice():
+    """Tests that starting a running reader fails."""
+    reader = StreamReader(create_streaming_roomba([]), [35])
+    reader.start()
+    try:
+        with raises(RuntimeError):
+            reader.start()
+    finally:
+        reader.stop()
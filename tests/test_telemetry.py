@@ -0,0 +1,75 @@
+"""
+Tests for telemetry.
+"""
+
+
+from pytest import raises
+
+from irobot.packet import ChargingState, Packet0, Packet7, Packet22, Packet43, Packet44
+from irobot.telemetry import TelemetryBuffer, columns
+
+
+def test_columns():
+    """Tests the columns of a non-group and a group packet."""
+    result = columns([7, 100])
+    names = [column.name for column in result]
+    assert names[:4] == ["wheel_drop_left", "wheel_drop_right", "bump_left", "bump_right"]
+    assert names.count("wheel_drop_left") == 1
+    assert "unused_byte_16" in names
+    assert "unused_byte_32" in names
+    voltage = result[names.index("voltage")]
+    assert voltage.packet == Packet22
+    assert voltage.typecode == "H"
+    assert result[names.index("bump_left")].typecode == "B"
+
+
+def test_columns_invalid_packet_id():
+    """Tests columns with an invalid packet id."""
+    with raises(ValueError):
+        columns([7, 200])
+
+
+def test_append():
+    """Tests appending frames of non-group packets."""
+    buffer = TelemetryBuffer([43, 44, 7], 4)
+    assert len(buffer) == 0
+    buffer.append([Packet43(100), Packet44(65535), Packet7(False, False, True, False)], timestamp=1.5)
+    assert len(buffer) == 1
+    assert buffer.latest("right_encoder_counts") == 100
+    assert buffer.latest("left_encoder_counts") == 65535
+    assert buffer.latest("bump_left") == 1
+    assert buffer.latest("timestamp") == 1.5
+    (view,) = buffer.column("right_encoder_counts")
+    assert view.tolist() == [100]
+
+
+def test_append_group():
+    """Tests appending frames of group packets."""
+    data = bytearray(26)
+    data[16] = ChargingState.TRICKLE_CHARGING
+    data[17:19] = bytes([0x3A, 0x98])
+    buffer = TelemetryBuffer([0], 2)
+    buffer.append([Packet0.from_bytes(data)])
+    assert buffer.latest("voltage") == 15000
+    assert buffer.latest("charging_state") == ChargingState.TRICKLE_CHARGING
+
+
+def test_ring():
+    """Tests that the oldest frames are overwritten once the buffer is full."""
+    buffer = TelemetryBuffer([22], 3)
+    for voltage in range(5):
+        buffer.append([Packet22(voltage)])
+    assert len(buffer) == 3
+    views = buffer.column("voltage")
+    assert len(views) == 2
+    assert [value for view in views for value in view.tolist()] == [2, 3, 4]
+    buffer.clear()
+    assert len(buffer) == 0
+    with raises(IndexError):
+        buffer.latest("voltage")
+
+
+def test_invalid_capacity():
+    """Tests an invalid capacity."""
+    with raises(ValueError):
+        TelemetryBuffer([22], 0)
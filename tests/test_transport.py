@@ -0,0 +1,156 @@
+"""
+Tests for transport.
+"""
+
+
+import socket
+from asyncio import run
+from contextlib import contextmanager
+from select import select
+from threading import Event, Thread
+from time import monotonic, sleep
+from typing import Iterator
+
+from pytest import raises
+from serial import Serial
+
+from irobot.async_roomba import AsyncRoomba
+from irobot.packet import Mode, Packet7, Packet35
+from irobot.roomba import Roomba
+from irobot.simulator import PtyBridge, SimulatedRoomba
+from irobot.transport import LoopbackTransport, SocketTransport, Transport
+
+
+@contextmanager
+def serve(roomba: SimulatedRoomba, transport: SocketTransport) -> Iterator[SimulatedRoomba]:
+    """Copies data between a transport and a simulated Roomba on a background thread.
+
+    Parameters
+    ----------
+    roomba : SimulatedRoomba
+        The simulated Roomba.
+    transport : SocketTransport
+        The transport playing the part of the Roomba.
+
+    Yields
+    ------
+    SimulatedRoomba
+        The simulated Roomba.
+    """
+    stopped = Event()
+
+    def run_bridge():
+        transport.timeout = 0
+        while not stopped.is_set():
+            readable, _, _ = select([transport], [], [], 0.002)
+            if readable:
+                roomba.write(transport.read(transport.in_waiting))
+            waiting = roomba.in_waiting
+            if waiting > 0:
+                transport.write(roomba.read(waiting))
+
+    thread = Thread(target=run_bridge, daemon=True)
+    thread.start()
+    try:
+        yield roomba
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def test_protocol():
+    """Tests that the transports and pyserial's `Serial` all conform to the transport protocol."""
+    with LoopbackTransport() as loopback:
+        assert isinstance(loopback, Transport)
+        assert isinstance(loopback.peer, Transport)
+    with PtyBridge(SimulatedRoomba()) as bridge:
+        with Serial(bridge.port) as serial:
+            assert isinstance(serial, Transport)
+
+
+def test_loopback():
+    """Tests reading and writing both ends of a loopback."""
+    with LoopbackTransport(timeout=0.05) as loopback:
+        assert loopback.write(b"\x80\x83") == 2
+        loopback.flush()
+        assert loopback.peer.read(2) == b"\x80\x83"
+        loopback.peer.write(b"\x01\x02\x03\x04")
+        buffer = bytearray(3)
+        assert loopback.readinto(buffer) == 3
+        assert buffer == b"\x01\x02\x03"
+        assert loopback.in_waiting == 1
+        assert loopback.read(5) == b"\x04"  # times out
+        assert loopback.in_waiting == 0
+
+
+def test_reset_input_buffer():
+    """Tests discarding the data received, but not yet read."""
+    with LoopbackTransport(timeout=0.05) as loopback:
+        loopback.peer.write(b"\x01\x02")
+        assert loopback.read(1) == b"\x01"
+        loopback.peer.write(b"\x03")
+        sleep(0.01)
+        loopback.reset_input_buffer()
+        assert loopback.in_waiting == 0
+        assert loopback.read(1) == b""
+
+
+def test_read_timeout():
+    """Tests the serial-like read timeouts."""
+    with LoopbackTransport(timeout=0.05) as loopback:
+        start = monotonic()
+        assert loopback.read(1) == b""
+        assert monotonic() - start >= 0.05
+        loopback.timeout = 0
+        start = monotonic()
+        assert loopback.read(1) == b""
+        assert monotonic() - start < 0.05
+        loopback.peer.write(b"\x2a")
+        loopback.timeout = None
+        assert loopback.read(1) == b"\x2a"
+
+
+def test_closed_by_peer():
+    """Tests reading from a transport whose peer closed the connection."""
+    with LoopbackTransport() as loopback:
+        loopback.peer.close()
+        with raises(ConnectionError):
+            loopback.read(1)
+
+
+def test_roomba_over_loopback():
+    """Tests driving a simulated Roomba over a loopback."""
+    with LoopbackTransport() as loopback, serve(SimulatedRoomba(), loopback.peer) as simulator:
+        roomba = Roomba(loopback)
+        roomba.start()
+        roomba.safe()
+        roomba.drive_direct(200, -200)
+        assert roomba.sensors(35) == Packet35(Mode.SAFE)
+        assert roomba.query_list([7, 35]) == [Packet7(False, False, False, False), Packet35(Mode.SAFE)]
+        assert (simulator.left_velocity, simulator.right_velocity) == (200, -200)
+
+
+def test_roomba_over_tcp():
+    """Tests driving a simulated Roomba over TCP, as if behind a serial-to-TCP bridge."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        host, port = server.getsockname()
+        with SocketTransport.connect(host, port) as transport:
+            assert transport.socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+            connection, _ = server.accept()
+            with SocketTransport(connection) as remote, serve(SimulatedRoomba(), remote):
+                roomba = Roomba(transport)
+                roomba.start()
+                roomba.full()
+                assert roomba.sensors(35) == Packet35(Mode.FULL)
+
+
+def test_async_roomba_over_loopback():
+    """Tests driving a simulated Roomba over a loopback with asyncio."""
+
+    async def drive(roomba: AsyncRoomba) -> Packet35:
+        await roomba.start()
+        await roomba.safe()
+        return await roomba.sensors(35)
+
+    with LoopbackTransport() as loopback, serve(SimulatedRoomba(), loopback.peer):
+        assert run(drive(AsyncRoomba(loopback))) == Packet35(Mode.SAFE)
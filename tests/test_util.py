@@ -5,8 +5,12 @@ Tests for util.
 
 from inspect import cleandoc
 from io import StringIO
+from threading import Thread, current_thread
+from time import sleep
 
-from irobot.util import hex_dump
+from pytest import raises
+
+from irobot.util import Pacer, PriorityLock, Trace, TraceEntry, hex_dump
 
 dump = """
     00000000  21 22 23 24 25 26 27 28  29 2a 2b 2c 2d 2e 2f 30  |!"#$%&'()*+,-./0|
@@ -26,3 +30,114 @@ def test_hex_dump():
     hex_dump(data, io)
     value = io.getvalue()
     assert value.rstrip() == cleandoc(dump)
+
+
+def test_hex_dump_lines():
+    """Tests that `hex_dump` emits nothing for no data and pads partial lines."""
+    io = StringIO()
+    hex_dump(b"", io)
+    assert io.getvalue() == ""
+    hex_dump(bytes([0x41] * 9), io)
+    assert io.getvalue() == "00000000  41 41 41 41 41 41 41 41  41" + " " * 23 + "|AAAAAAAAA|\n"
+
+
+def test_trace(clock):
+    """Tests that `Trace` keeps the most recent entries and formats them when read."""
+    clock.now = 100.0
+    trace = Trace(capacity=2, clock=clock)
+    trace.record("Writing data:", bytes([142, 35]))
+    clock.sleep(0.5)
+    trace.record("Read data:", bytes([2]))
+    clock.sleep(0.5)
+    trace.record("Writing data:", bytes([131]))
+    assert len(trace) == 2
+    assert trace.entries() == [
+        TraceEntry(100.5, "Read data:", bytes([2])),
+        TraceEntry(101.0, "Writing data:", bytes([131])),
+    ]
+    assert trace.format().split("\n")[:2] == ["100.500000 Read data:", "00000000  02" + " " * 48 + "|.|"]
+    trace.clear()
+    assert len(trace) == 0
+
+
+def test_trace_copies_data():
+    """Tests that `Trace` copies the data, so reusing the buffer does not change the entries."""
+    trace = Trace()
+    buffer = bytearray([2])
+    trace.record("Read data:", memoryview(buffer))
+    buffer[0] = 3
+    assert trace.entries()[0].data == bytes([2])
+
+
+def test_pacer_waits_for_gap(clock):
+    """Tests that `Pacer.wait` waits for the remainder of the gap."""
+    pacer = Pacer(clock, clock.sleep)
+    pacer.mark(0.025)
+    clock.now += 0.010
+    assert abs(pacer.wait() - 0.015) < 1e-9
+    assert len(clock.sleeps) == 1
+
+
+def test_pacer_idle(clock):
+    """Tests that `Pacer.wait` does not sleep when the gap has already passed."""
+    pacer = Pacer(clock, clock.sleep)
+    assert pacer.wait() == 0
+    pacer.mark(0.025)
+    clock.now += 0.030
+    assert pacer.wait() == 0
+    assert len(clock.sleeps) == 0
+
+
+def test_priority_lock_order():
+    """Tests that `PriorityLock` is granted by priority, and in arrival order within a priority."""
+    lock = PriorityLock()
+    order = []
+
+    def acquire(name: str, priority: int):
+        lock.acquire(priority)
+        order.append(name)
+        lock.release()
+
+    lock.acquire()
+    threads = []
+    for name, priority in [("low 1", 0), ("high 1", 1), ("low 2", 0), ("high 2", 1)]:
+        threads.append(Thread(target=acquire, args=(name, priority)))
+        threads[-1].start()
+        while len(lock._waiters) < len(threads):
+            sleep(0.001)
+    lock.release()
+    for thread in threads:
+        thread.join()
+    assert order == ["high 1", "high 2", "low 1", "low 2"]
+    assert not lock.locked()
+
+
+def test_priority_lock_interrupted():
+    """Tests that a waiter interrupted while waiting for a `PriorityLock` does not block the waiters behind it."""
+    lock = PriorityLock()
+    lock.acquire()
+    thread = Thread(target=lambda: (lock.acquire(), lock.release()), daemon=True)
+    thread.start()
+    while len(lock._waiters) < 1:
+        sleep(0.001)
+    wait = lock._condition.wait
+
+    def interrupted_wait(timeout=None):
+        if current_thread() is not thread:
+            raise KeyboardInterrupt()
+        return wait(timeout)
+
+    lock._condition.wait = interrupted_wait
+    with raises(KeyboardInterrupt):
+        lock.acquire(1)
+    assert len(lock._waiters) == 1
+    lock.release()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert not lock.locked()
+
+
+def test_priority_lock_release_unlocked():
+    """Tests that releasing an unlocked `PriorityLock` fails."""
+    with raises(RuntimeError):
+        PriorityLock().release()